@@ -42,7 +42,9 @@ import tkinter as tk
 import os
 import datetime
 import threading
+import atexit
 import logging
+import logging.handlers
 from tkinter import ttk, messagebox
 from pending_vehicles_panel import PendingVehiclesPanel
 import config
@@ -76,12 +78,21 @@ def setup_app_logging():
         # Create log filename with current date
         log_filename = os.path.join(logs_dir, f"app_{datetime.datetime.now().strftime('%Y-%m-%d')}.log")
         
+        # Buffer a small batch of file writes so routine INFO logging doesn't hit
+        # the disk on every call; warnings and errors flush immediately, and the
+        # remainder is flushed at interpreter exit
+        file_handler = logging.FileHandler(log_filename, encoding='utf-8')
+        file_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+        buffered_file_handler = logging.handlers.MemoryHandler(
+            capacity=50, flushLevel=logging.WARNING, target=file_handler)
+        atexit.register(buffered_file_handler.flush)
+        
         # Configure logging with safer file handler
         logging.basicConfig(
             level=logging.INFO,
             format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
             handlers=[
-                logging.FileHandler(log_filename, encoding='utf-8'),
+                buffered_file_handler,
                 logging.StreamHandler()
             ]
         )
@@ -2,10 +2,17 @@ import os
 import json
 import datetime
 import shutil
+import threading
 from google.cloud import storage
 from google.api_core.exceptions import Forbidden, NotFound
 import hashlib
 
+# Image suffixes picked up by the image backup methods
+_BACKUP_IMAGE_EXT = ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.tiff', '.tif')
+
+# Image suffixes counted as images by get_upload_summary()
+_SUMMARY_IMAGE_EXT = ('.jpg', '.jpeg', '.png', '.gif', '.bmp')
+
 class CloudStorageService:
     """Enhanced service for Google Cloud Storage operations with agency/site/date organization and auto-cleanup"""
     
@@ -16,6 +23,9 @@ class CloudStorageService:
             bucket_name (str): Name of the Google Cloud Storage bucket
             credentials_path (str, optional): Path to the service account key file
         """
+        # Serializes writes to the local tracking file across upload threads
+        self._tracking_lock = threading.Lock()
+        
         try:
             # Set credentials path as environment variable if provided
             if credentials_path:
@@ -95,16 +105,34 @@ class CloudStorageService:
                 "last_cleanup_date": ""
             }
     
-    def save_backup_tracking_data(self, tracking_data):
+    def save_backup_tracking_data(self, tracking_data, merge=False):
         """Save backup tracking data to local file
         
+        The file is written to a temp file and swapped in with os.replace, so
+        readers never see a half-written tracking file.
+        
         Args:
             tracking_data (dict): Tracking data to save
+            merge (bool): Merge per-category entries into what is already on
+                disk instead of replacing the file - for backups that run
+                alongside other uploaders and only pass the categories they own
         """
         try:
-            os.makedirs(os.path.dirname(self.backup_tracking_file), exist_ok=True)
-            with open(self.backup_tracking_file, 'w') as f:
-                json.dump(tracking_data, f, indent=4)
+            with self._tracking_lock:
+                if merge:
+                    current = self.get_backup_tracking_data()
+                    for key, value in tracking_data.items():
+                        if isinstance(value, dict) and isinstance(current.get(key), dict):
+                            current[key].update(value)
+                        else:
+                            current[key] = value
+                    tracking_data = current
+                
+                os.makedirs(os.path.dirname(self.backup_tracking_file), exist_ok=True)
+                temp_path = self.backup_tracking_file + ".tmp"
+                with open(temp_path, 'w') as f:
+                    json.dump(tracking_data, f, indent=4)
+                os.replace(temp_path, self.backup_tracking_file)
         except Exception as e:
             print(f"Error saving backup tracking: {e}")
     
@@ -250,13 +278,10 @@ class CloudStorageService:
             
             print(f"🖼️  Starting images backup to: {cloud_base_path}")
             
-            # Get all image files
-            image_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.tiff', '.tif'}
-            
             # Walk through images folder
             for root, dirs, files in os.walk(images_folder):
                 for file in files:
-                    if not any(file.lower().endswith(ext) for ext in image_extensions):
+                    if not file.lower().endswith(_BACKUP_IMAGE_EXT):
                         continue
                         
                     total_files_found += 1
@@ -310,10 +335,11 @@ class CloudStorageService:
                         errors.append(error_msg)
                         print(f"   ❌ {error_msg}")
             
-            # Save tracking data
-            tracking_data["images_backed_up"] = images_tracking
-            tracking_data["last_backup_date"] = datetime.datetime.now().isoformat()
-            self.save_backup_tracking_data(tracking_data)
+            # Save only this backup's category - other uploaders may be running
+            self.save_backup_tracking_data({
+                "images_backed_up": images_tracking,
+                "last_backup_date": datetime.datetime.now().isoformat()
+            }, merge=True)
             
             print(f"📊 Images backup completed: {files_uploaded}/{total_files_found} files uploaded")
             return files_uploaded, total_files_found, errors
@@ -404,10 +430,11 @@ class CloudStorageService:
                         errors.append(error_msg)
                         print(f"   ❌ {error_msg}")
             
-            # Save tracking data
-            tracking_data["json_backups_backed_up"] = json_tracking
-            tracking_data["last_backup_date"] = datetime.datetime.now().isoformat()
-            self.save_backup_tracking_data(tracking_data)
+            # Save only this backup's category - other uploaders may be running
+            self.save_backup_tracking_data({
+                "json_backups_backed_up": json_tracking,
+                "last_backup_date": datetime.datetime.now().isoformat()
+            }, merge=True)
             
             print(f"📊 JSON backups completed: {files_uploaded}/{total_files_found} files uploaded")
             return files_uploaded, total_files_found, errors
@@ -511,10 +538,11 @@ class CloudStorageService:
                         errors.append(error_msg)
                         print(f"   ❌ {error_msg}")
             
-            # Save tracking data
-            tracking_data["daily_reports_backed_up"] = reports_tracking
-            tracking_data["last_backup_date"] = datetime.datetime.now().isoformat()
-            self.save_backup_tracking_data(tracking_data)
+            # Save only this backup's category - other uploaders may be running
+            self.save_backup_tracking_data({
+                "daily_reports_backed_up": reports_tracking,
+                "last_backup_date": datetime.datetime.now().isoformat()
+            }, merge=True)
             
             print(f"📊 Reports backup completed: {files_uploaded}/{total_files_found} files uploaded")
             return files_uploaded, total_files_found, errors
@@ -1013,10 +1041,11 @@ class CloudStorageService:
                 errors.append(error_msg)
                 print(f"❌ {error_msg}")
             
-            # Save tracking data
-            tracking_data["daily_reports_backed_up"] = reports_tracking
-            tracking_data["last_backup_date"] = datetime.datetime.now().isoformat()
-            self.save_backup_tracking_data(tracking_data)
+            # Save only this backup's category - other uploaders may be running
+            self.save_backup_tracking_data({
+                "daily_reports_backed_up": reports_tracking,
+                "last_backup_date": datetime.datetime.now().isoformat()
+            }, merge=True)
             
             print(f"📊 Today's reports backup completed: {files_uploaded}/{total_files_found} files uploaded")
             return files_uploaded, total_files_found, errors
@@ -1058,13 +1087,11 @@ class CloudStorageService:
             print(f"🖼️  Starting today's images backup to: {cloud_base_path}")
             
             # Get all image files from today's folder only
-            image_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.tiff', '.tif'}
-            
             try:
                 files_in_today = os.listdir(todays_images_folder)
                 
                 for file in files_in_today:
-                    if not any(file.lower().endswith(ext) for ext in image_extensions):
+                    if not file.lower().endswith(_BACKUP_IMAGE_EXT):
                         continue
                         
                     file_path = os.path.join(todays_images_folder, file)
@@ -1122,10 +1149,11 @@ class CloudStorageService:
                 errors.append(error_msg)
                 print(f"❌ {error_msg}")
             
-            # Save tracking data
-            tracking_data["images_backed_up"] = images_tracking
-            tracking_data["last_backup_date"] = datetime.datetime.now().isoformat()
-            self.save_backup_tracking_data(tracking_data)
+            # Save only this backup's category - other uploaders may be running
+            self.save_backup_tracking_data({
+                "images_backed_up": images_tracking,
+                "last_backup_date": datetime.datetime.now().isoformat()
+            }, merge=True)
             
             print(f"📊 Today's images backup completed: {files_uploaded}/{total_files_found} files uploaded")
             return files_uploaded, total_files_found, errors
@@ -1218,10 +1246,11 @@ class CloudStorageService:
                 errors.append(error_msg)
                 print(f"❌ {error_msg}")
             
-            # Save tracking data
-            tracking_data["json_backups_backed_up"] = json_tracking
-            tracking_data["last_backup_date"] = datetime.datetime.now().isoformat()
-            self.save_backup_tracking_data(tracking_data)
+            # Save only this backup's category - other uploaders may be running
+            self.save_backup_tracking_data({
+                "json_backups_backed_up": json_tracking,
+                "last_backup_date": datetime.datetime.now().isoformat()
+            }, merge=True)
             
             print(f"📊 Today's JSON backups completed: {files_uploaded}/{total_files_found} files uploaded")
             return files_uploaded, total_files_found, errors
@@ -1500,6 +1529,26 @@ class CloudStorageService:
         except Exception as e:
             return {"error": f"Error getting backup summary: {str(e)}"}
     
+    def list_files(self, prefix=None, max_results=None):
+        """List object names in the bucket
+        
+        Args:
+            prefix (str, optional): Only list objects under this prefix
+            max_results (int, optional): Stop after this many objects
+            
+        Returns:
+            list: Object names
+        """
+        if not self.is_connected():
+            return []
+        
+        try:
+            return [blob.name for blob in self.client.list_blobs(self.bucket, prefix=prefix,
+                                                                 max_results=max_results)]
+        except Exception as e:
+            print(f"Error listing files: {str(e)}")
+            return []
+    
     def list_files_by_structure(self, agency_name=None, site_name=None, date_str=None, file_type=None):
         """List files by the new agency/site/date structure
         
@@ -1596,7 +1645,7 @@ class CloudStorageService:
                 # Categorize files
                 if blob.name.endswith('.json'):
                     summary["json_files"] += 1
-                elif any(blob.name.lower().endswith(ext) for ext in ['.jpg', '.jpeg', '.png', '.gif', '.bmp']):
+                elif blob.name.lower().endswith(_SUMMARY_IMAGE_EXT):
                     summary["image_files"] += 1
                 elif blob.name.startswith('daily_reports/'):
                     summary["daily_report_files"] += 1
@@ -1778,8 +1827,39 @@ class CloudStorageService:
         # Use the new organized method which has duplicate checking built-in
         return self.save_json_record(data, filename, agency_name, site_name)
 
-    def save_json_record(self, data, filename, agency_name=None, site_name=None):
-        """Save record data as JSON to cloud storage with duplicate checking"""
+    def json_record_tracking(self, data, filename, agency_name, site_name):
+        """Get the tracking key and content hash save_json_record uses for a record
+        
+        Args:
+            data (dict): Record data
+            filename (str): Cloud file name of the record
+            agency_name (str): Agency folder
+            site_name (str): Site folder
+            
+        Returns:
+            tuple: (key in json_backups_backed_up, MD5 of the record content)
+        """
+        file_base = os.path.splitext(filename)[0]
+        content_str = json.dumps(data, sort_keys=True, ensure_ascii=False)
+        return f"{agency_name}_{site_name}_{file_base}", hashlib.md5(content_str.encode()).hexdigest()
+
+    def save_json_record(self, data, filename, agency_name=None, site_name=None, tracking_data=None,
+                         local_source=None):
+        """Save record data as JSON to cloud storage with duplicate checking
+        
+        Args:
+            data (dict): Record data
+            filename (str): Cloud file name
+            agency_name (str, optional): Agency folder, defaults to the current agency
+            site_name (str, optional): Site folder, defaults to the current site
+            tracking_data (dict, optional): Tracking data shared by a bulk upload
+                run. It is checked and updated in memory and the caller saves
+                it; without it the tracking file is read and written per record.
+            local_source (dict, optional): local_path, local_size and
+                local_mtime_ns of the file the record was read from, stored
+                in the tracking entry so unchanged files can be skipped
+                without reading them.
+        """
         if not self.is_connected():
             print("❌ Not connected to cloud storage")
             return False
@@ -1800,20 +1880,24 @@ class CloudStorageService:
                 file_ext = '.json'
             cloud_path = f"{cloud_base_path}{file_base}{file_ext}"
             
-            # Calculate content hash for duplicate detection
-            content_str = json.dumps(data, sort_keys=True, ensure_ascii=False)
-            current_hash = hashlib.md5(content_str.encode()).hexdigest()
+            # Tracking key and content hash for duplicate detection
+            json_key, current_hash = self.json_record_tracking(data, filename, agency_name, site_name)
             
             # Check tracking data for duplicates
-            tracking_data = self.get_backup_tracking_data()
-            json_tracking = tracking_data.get("json_backups_backed_up", {})
-            
-            # Create a unique key for this JSON record
-            json_key = f"{agency_name}_{site_name}_{file_base}"
+            batched = tracking_data is not None
+            if not batched:
+                tracking_data = self.get_backup_tracking_data()
+            json_tracking = tracking_data.setdefault("json_backups_backed_up", {})
             
             # Check if this JSON content was already uploaded
             if (json_key in json_tracking and 
                 json_tracking[json_key].get("content_hash") == current_hash):
+                if local_source:
+                    # Remember the file so the next run skips it without reading it
+                    with self._tracking_lock:
+                        json_tracking[json_key].update(local_source)
+                    if not batched:
+                        self.save_backup_tracking_data(tracking_data)
                 print(f"⏭️  Skipping duplicate JSON: {filename} (content already backed up)")
                 return True
             
@@ -1822,7 +1906,7 @@ class CloudStorageService:
             blob.upload_from_string(json.dumps(data, indent=4, ensure_ascii=False), content_type="application/json")
             
             # Update tracking with content hash
-            json_tracking[json_key] = {
+            entry = {
                 "content_hash": current_hash,
                 "upload_date": datetime.datetime.now().isoformat(),
                 "cloud_path": cloud_path,
@@ -1831,11 +1915,17 @@ class CloudStorageService:
                 "date": today_str,
                 "filename": filename
             }
+            if local_source:
+                entry.update(local_source)
             
-            # Save tracking data
-            tracking_data["json_backups_backed_up"] = json_tracking
-            tracking_data["last_backup_date"] = datetime.datetime.now().isoformat()
-            self.save_backup_tracking_data(tracking_data)
+            if batched:
+                # Bulk upload threads share tracking_data; the caller saves it
+                with self._tracking_lock:
+                    json_tracking[json_key] = entry
+            else:
+                json_tracking[json_key] = entry
+                tracking_data["last_backup_date"] = datetime.datetime.now().isoformat()
+                self.save_backup_tracking_data(tracking_data)
             
             print(f"✅ Saved JSON record as {cloud_path}")
             return True
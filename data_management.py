@@ -9,6 +9,10 @@ import json
 from tkinter import messagebox, filedialog
 import config
 import shutil
+import io
+import tarfile
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from cloud_storage import CloudStorageService
 import config
 import datetime
@@ -27,6 +31,9 @@ except ImportError:
     REPORTLAB_AVAILABLE = False
     print("ReportLab not available - PDF auto-generation will be disabled")
 
+# Successful JSON uploads between saves of the backup tracking file in a bulk run
+_TRACKING_FLUSH_EVERY = 100
+
 # Set up logging
 def setup_logging():
     """Set up logging directory and configuration"""
@@ -1578,25 +1585,48 @@ GENERATED BY: Swaccha Andhra Corporation Weighbridge System
 
 
 
+    def iter_json_backups(self):
+        """Yield JSON backup file paths one at a time
+        
+        Walks the date folders lazily so callers never hold the full
+        list of backups in memory.
+        """
+        for entry in self._iter_json_backup_entries():
+            yield entry.path
+
+    def _iter_json_backup_entries(self):
+        """Yield os.DirEntry objects for JSON backups in all date folders"""
+        if not os.path.exists(self.json_backup_folder):
+            return
+        
+        # Walk through all date folders; scandir reuses the directory
+        # cursor's type information instead of a stat per entry
+        with os.scandir(self.json_backup_folder) as date_folders:
+            for date_folder in date_folders:
+                if not date_folder.is_dir():
+                    continue
+                # Yield all JSON files in this date folder
+                with os.scandir(date_folder.path) as json_files:
+                    for json_file in json_files:
+                        if json_file.name.endswith('.json') and json_file.is_file():
+                            yield json_file
+
+    def count_json_backups(self):
+        """Count JSON backup files without building a list of paths
+        
+        Returns:
+            int: Number of JSON backup files
+        """
+        try:
+            return sum(1 for _ in self._iter_json_backup_entries())
+        except Exception as e:
+            self.logger.error(f"Error counting JSON backup files: {e}")
+            return 0
+
     def get_all_json_backups(self):
         """Get all JSON backup files for bulk upload"""
         try:
-            json_files = []
-            
-            if not os.path.exists(self.json_backup_folder):
-                return json_files
-            
-            # Walk through all date folders
-            for date_folder in os.listdir(self.json_backup_folder):
-                date_path = os.path.join(self.json_backup_folder, date_folder)
-                
-                if os.path.isdir(date_path):
-                    # Get all JSON files in this date folder
-                    for json_file in os.listdir(date_path):
-                        if json_file.endswith('.json'):
-                            json_path = os.path.join(date_path, json_file)
-                            json_files.append(json_path)
-            
+            json_files = list(self.iter_json_backups())
             self.logger.info(f"Found {len(json_files)} JSON backup files for bulk upload")
             return json_files
             
@@ -1604,8 +1634,185 @@ GENERATED BY: Swaccha Andhra Corporation Weighbridge System
             self.logger.error(f"Error getting JSON backup files: {e}")
             return []
 
-    def bulk_upload_json_backups_to_cloud(self):
-        """FIXED: Bulk upload all JSON backups to cloud with duplicate checking"""
+    def _json_backup_cloud_name(self, record_data):
+        """Get the cloud file name, agency and site a JSON backup is stored under
+        
+        Args:
+            record_data: Parsed JSON backup record
+            
+        Returns:
+            tuple: (json_filename, agency_name, site_name)
+        """
+        agency_name = record_data.get('agency_name', 'Unknown_Agency').replace(' ', '_').replace('/', '_')
+        site_name = record_data.get('site_name', 'Unknown_Site').replace(' ', '_').replace('/', '_')
+        ticket_no = record_data.get('ticket_no', 'unknown')
+        return f"{ticket_no}_{agency_name}_{site_name}.json", agency_name, site_name
+
+    def _json_backup_source(self, json_path):
+        """Get the local file details recorded with an uploaded JSON backup
+        
+        Args:
+            json_path: Path of the local JSON backup
+            
+        Returns:
+            dict: local_path, local_size and local_mtime_ns
+        """
+        stat = os.stat(json_path)
+        return {
+            "local_path": os.path.abspath(json_path),
+            "local_size": stat.st_size,
+            "local_mtime_ns": stat.st_mtime_ns
+        }
+
+    def _tracked_json_sources(self, json_tracking):
+        """Map local backup paths to the size and mtime they were uploaded with
+        
+        Args:
+            json_tracking: json_backups_backed_up section of the tracking data
+            
+        Returns:
+            dict: local_path -> (local_size, local_mtime_ns)
+        """
+        return {
+            entry["local_path"]: (entry.get("local_size"), entry.get("local_mtime_ns"))
+            for entry in json_tracking.values()
+            if isinstance(entry, dict) and "local_path" in entry
+        }
+
+    def _is_tracked_json_source(self, known_sources, source):
+        """Check whether a local backup is unchanged since it was uploaded"""
+        return known_sources.get(source["local_path"]) == (source["local_size"], source["local_mtime_ns"])
+
+    def _upload_json_backup(self, json_path, tracking_data=None, local_source=None):
+        """Upload a single JSON backup file
+        
+        Args:
+            json_path: Path of the local JSON backup
+            tracking_data: Backup tracking data shared by a bulk upload run
+            local_source: Local file details from _json_backup_source()
+            
+        Returns:
+            str or None: Error message, or None on success
+        """
+        try:
+            # Load JSON data
+            with open(json_path, 'r', encoding='utf-8') as f:
+                record_data = json.load(f)
+            
+            # Use the JSON record method which has duplicate checking
+            json_filename, agency_name, site_name = self._json_backup_cloud_name(record_data)
+            
+            # Upload using save_json_record which has duplicate checking
+            json_success = self.cloud_storage.save_json_record(
+                record_data, 
+                json_filename,
+                agency_name,
+                site_name,
+                tracking_data=tracking_data,
+                local_source=local_source
+            )
+            
+            if json_success:
+                self.logger.info(f" Processed JSON backup: {os.path.basename(json_path)}")
+                return None
+            return f"Failed to upload {os.path.basename(json_path)}"
+                    
+        except Exception as file_error:
+            error_msg = f"Error uploading {os.path.basename(json_path)}: {str(file_error)}"
+            self.logger.error(error_msg)
+            return error_msg
+
+    def upload_json_stream(self, json_paths, max_workers=1):
+        """Upload JSON backups from an iterable of paths
+        
+        Files whose size and mtime match their backup tracking entry are
+        skipped without being opened, and records whose content is already
+        tracked are skipped by save_json_record, so a run after a partial
+        failure only reads and uploads what is new or changed, and
+        reset_backup_tracking forces a full re-upload.
+        
+        The backup tracking data is read once and shared by the uploads; it is
+        saved every _TRACKING_FLUSH_EVERY successful uploads and at the end.
+        
+        Args:
+            json_paths: Iterable (typically a generator) of JSON file paths
+            max_workers: Number of concurrent uploads; at most twice this many
+                paths are pulled from the iterable at a time
+            
+        Returns:
+            dict: Upload counters (uploaded, skipped, total, errors)
+        """
+        uploaded_count = 0
+        skipped = 0
+        total = 0
+        errors = []
+        tracking_data = self.cloud_storage.get_backup_tracking_data()
+        json_tracking = tracking_data.setdefault("json_backups_backed_up", {})
+        known_sources = self._tracked_json_sources(json_tracking)
+        
+        def changed_paths():
+            # Stat before reading, so unchanged backups are never opened
+            nonlocal total, skipped
+            for json_path in json_paths:
+                total += 1
+                try:
+                    source = self._json_backup_source(json_path)
+                except OSError as e:
+                    errors.append(f"Error reading {os.path.basename(json_path)}: {str(e)}")
+                    continue
+                if self._is_tracked_json_source(known_sources, source):
+                    skipped += 1
+                    continue
+                yield json_path, source
+        
+        def flush_tracking():
+            # Merged, so backups running alongside keep their own categories
+            self.cloud_storage.save_backup_tracking_data({
+                "json_backups_backed_up": json_tracking,
+                "last_backup_date": datetime.datetime.now().isoformat()
+            }, merge=True)
+        
+        def record(error):
+            nonlocal uploaded_count
+            if error is None:
+                uploaded_count += 1
+                if uploaded_count % _TRACKING_FLUSH_EVERY == 0:
+                    flush_tracking()
+            else:
+                errors.append(error)
+        
+        try:
+            if max_workers <= 1:
+                for json_path, source in changed_paths():
+                    record(self._upload_json_backup(json_path, tracking_data, source))
+            else:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    pending = set()
+                    for json_path, source in changed_paths():
+                        pending.add(executor.submit(self._upload_json_backup, json_path, tracking_data, source))
+                        if len(pending) >= max_workers * 2:
+                            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                            for future in done:
+                                record(future.result())
+                    for future in pending:
+                        record(future.result())
+        finally:
+            if uploaded_count:
+                flush_tracking()
+        
+        return {
+            "uploaded": uploaded_count,
+            "skipped": skipped,
+            "total": total,
+            "errors": errors
+        }
+
+    def bulk_upload_json_backups_to_cloud(self, max_workers=8):
+        """FIXED: Bulk upload all JSON backups to cloud with duplicate checking
+        
+        Args:
+            max_workers: Number of JSON files uploaded concurrently
+        """
         try:
             # Initialize cloud storage if needed
             if not self.init_cloud_storage_if_needed():
@@ -1625,10 +1832,10 @@ GENERATED BY: Swaccha Andhra Corporation Weighbridge System
                     "total": 0
                 }
             
-            # Get all JSON backup files
-            json_files = self.get_all_json_backups()
+            # Stream JSON backup files straight into the uploader
+            results = self.upload_json_stream(self.iter_json_backups(), max_workers)
             
-            if not json_files:
+            if results["total"] == 0:
                 return {
                     "success": True,
                     "message": "No JSON backups found to upload",
@@ -1636,55 +1843,136 @@ GENERATED BY: Swaccha Andhra Corporation Weighbridge System
                     "total": 0
                 }
             
-            uploaded_count = 0
-            skipped_count = 0
-            errors = []
+            self.logger.info(f"Bulk upload processed {results['total']} JSON backup files")
+            # Everything already being tracked as uploaded is not a failure
+            results["success"] = results["uploaded"] > 0 or not results["errors"]
+            return results
             
-            for json_path in json_files:
-                try:
-                    # Load JSON data
-                    with open(json_path, 'r', encoding='utf-8') as f:
-                        record_data = json.load(f)
-                    
-                    # Generate cloud filename
-                    agency_name = record_data.get('agency_name', 'Unknown_Agency').replace(' ', '_').replace('/', '_')
-                    site_name = record_data.get('site_name', 'Unknown_Site').replace(' ', '_').replace('/', '_')
-                    ticket_no = record_data.get('ticket_no', 'unknown')
-                    
-                    # Use the JSON record method which has duplicate checking
-                    json_filename = f"{ticket_no}_{agency_name}_{site_name}.json"
+        except Exception as e:
+            error_msg = f"Error during bulk JSON upload: {str(e)}"
+            self.logger.error(error_msg)
+            return {
+                "success": False,
+                "error": error_msg,
+                "uploaded": 0,
+                "total": 0
+            }
+
+    def bundle_and_upload_json_backups(self):
+        """Upload all pending JSON backups as a single gzipped tarball
+        
+        A backup is pending when its content is not yet recorded in the
+        backup tracking file - the same check the per-file upload uses - and
+        bundled records are recorded there too, so neither path uploads them
+        twice. The archive is built in a temporary file, carries an
+        index.json mapping each member to its ticket number and is stored as
+        bulk/<agency>/<site>/<timestamp>.tar.gz.
+        
+        Returns:
+            dict: Upload results (success, uploaded, total, cloud_path, errors)
+        """
+        try:
+            # Initialize cloud storage if needed
+            if not self.init_cloud_storage_if_needed():
+                return {
+                    "success": False,
+                    "error": "Failed to initialize cloud storage",
+                    "uploaded": 0,
+                    "total": 0
+                }
+            
+            # Check if connected to cloud storage
+            if not self.cloud_storage.is_connected():
+                return {
+                    "success": False,
+                    "error": "Not connected to cloud storage",
+                    "uploaded": 0,
+                    "total": 0
+                }
+            
+            json_tracking = self.cloud_storage.get_backup_tracking_data().get("json_backups_backed_up", {})
+            known_sources = self._tracked_json_sources(json_tracking)
+            bundle_time = datetime.datetime.now()
+            agency_name = (config.CURRENT_AGENCY or "Unknown_Agency").replace(' ', '_').replace('/', '_')
+            site_name = (config.CURRENT_SITE or "Unknown_Site").replace(' ', '_').replace('/', '_')
+            cloud_path = f"bulk/{agency_name}/{site_name}/{bundle_time.strftime('%Y%m%d_%H%M%S')}.tar.gz"
+            
+            index = {}
+            new_entries = {}  # Tracking entries recorded once the archive is uploaded
+            errors = []
+            with tempfile.TemporaryFile() as archive:
+                with tarfile.open(mode='w:gz', fileobj=archive) as tar:
+                    for json_path in self.iter_json_backups():
+                        try:
+                            source = self._json_backup_source(json_path)
+                            if self._is_tracked_json_source(known_sources, source):
+                                continue
+                            with open(json_path, 'r', encoding='utf-8') as f:
+                                record_data = json.load(f)
+                        except (OSError, ValueError) as e:
+                            errors.append(f"Error reading {os.path.basename(json_path)}: {str(e)}")
+                            continue
+                        
+                        json_filename, record_agency, record_site = self._json_backup_cloud_name(record_data)
+                        json_key, content_hash = self.cloud_storage.json_record_tracking(
+                            record_data, json_filename, record_agency, record_site)
+                        if json_tracking.get(json_key, {}).get("content_hash") == content_hash:
+                            continue
+                        
+                        arcname = os.path.relpath(json_path, self.json_backup_folder).replace(os.sep, '/')
+                        tar.add(json_path, arcname=arcname)
+                        index[arcname] = {
+                            "ticket_no": record_data.get('ticket_no', 'unknown'),
+                            "size": source["local_size"]
+                        }
+                        new_entries[json_key] = {
+                            "content_hash": content_hash,
+                            "upload_date": bundle_time.isoformat(),
+                            "cloud_path": cloud_path,
+                            "bundle_member": arcname,
+                            "agency": record_agency,
+                            "site": record_site,
+                            "date": bundle_time.strftime("%Y-%m-%d"),
+                            "filename": json_filename,
+                            **source
+                        }
                     
-                    # Upload using save_json_record which has duplicate checking
-                    json_success = self.cloud_storage.save_json_record(
-                        record_data, 
-                        json_filename,
-                        agency_name,
-                        site_name
-                    )
+                    if not index:
+                        return {
+                            "success": not errors,
+                            "message": "No new JSON backups to bundle",
+                            "uploaded": 0,
+                            "total": 0,
+                            "errors": errors
+                        }
                     
-                    if json_success:
-                        # Check if it was actually uploaded or skipped
-                        # You can add logging here to distinguish between new upload and skipped duplicate
-                        uploaded_count += 1
-                        self.logger.info(f" Processed JSON backup: {os.path.basename(json_path)}")
-                    else:
-                        errors.append(f"Failed to upload {os.path.basename(json_path)}")
-                            
-                except Exception as file_error:
-                    error_msg = f"Error uploading {os.path.basename(json_path)}: {str(file_error)}"
-                    errors.append(error_msg)
-                    self.logger.error(error_msg)
+                    # Sidecar index so single records can be found without unpacking everything
+                    index_bytes = json.dumps(index, indent=4).encode('utf-8')
+                    index_info = tarfile.TarInfo("index.json")
+                    index_info.size = len(index_bytes)
+                    index_info.mtime = int(bundle_time.timestamp())
+                    tar.addfile(index_info, io.BytesIO(index_bytes))
+                
+                blob = self.cloud_storage.bucket.blob(cloud_path)
+                blob.upload_from_file(archive, rewind=True, content_type='application/gzip')
             
+            # Shared tracking, so Full Backup / Bulk Upload skip the bundled records
+            self.cloud_storage.save_backup_tracking_data({
+                "json_backups_backed_up": new_entries,
+                "last_backup_date": bundle_time.isoformat()
+            }, merge=True)
+            
+            self.logger.info(f"Uploaded {len(index)} JSON backups as {cloud_path}")
             return {
-                "success": uploaded_count > 0,
-                "uploaded": uploaded_count,
-                "total": len(json_files),
-                "skipped": skipped_count,
+                "success": True,
+                "uploaded": len(index),
+                "total": len(index),
+                "cloud_path": cloud_path,
                 "errors": errors
             }
             
         except Exception as e:
-            error_msg = f"Error during bulk JSON upload: {str(e)}"
+            error_msg = f"Error during bundled JSON upload: {str(e)}"
             self.logger.error(error_msg)
             return {
                 "success": False,
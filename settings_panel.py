@@ -1,12 +1,321 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import serial.tools.list_ports
+import contextlib
 import json
+import logging
+import os
+import re
+import string
 import config
 from ui_components import HoverButton
-from weighbridge import WeighbridgeManager
+from weighbridge import WeighbridgeManager, compile_weight_pattern
 from settings_storage import SettingsStorage
+from cloud_storage import CloudStorageService
 import datetime
+import functools
+import threading
+import queue
+import time
+from collections import ChainMap, deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Set to True to print per-reading diagnostics from the weight display path
+_DEBUG = False
+
+# Alphabet position (A=1) of the first letter of each weekday, Monday..Sunday
+_DAY_LETTER_VAL = (13, 20, 23, 20, 6, 19, 19)
+
+# Default for getattr() probes where None is a meaningful attribute value
+_MISSING = object()
+
+# Connected CloudStorageService per (bucket, credentials path), see _get_cloud()
+_CLOUD_CLIENTS = {}
+_CLOUD_CLIENTS_LOCK = threading.Lock()
+
+# File name suffixes listed under the Images tab of the cloud files window
+_IMG_EXT = ('.jpg', '.jpeg', '.png', '.gif', '.bmp')
+
+# Units used by _format_size, each 1024 times the previous
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB')
+
+# Timestamp shown in the backup results and cloud status windows
+_DateTime = datetime.datetime
+_TS_FMT = '%Y-%m-%d %H:%M:%S'
+
+# Per-camera Tk variables built by create_camera_config_tab: (name, class, default)
+_CAM_VAR_SPECS = (
+    ("camera_type_var", tk.StringVar, "USB"),
+    ("usb_index_var", tk.IntVar, 0),
+    ("rtsp_username_var", tk.StringVar, ""),
+    ("rtsp_password_var", tk.StringVar, ""),
+    ("rtsp_ip_var", tk.StringVar, ""),
+    ("rtsp_port_var", tk.StringVar, "554"),
+    ("rtsp_endpoint_var", tk.StringVar, "/stream1"),
+    ("http_username_var", tk.StringVar, ""),
+    ("http_password_var", tk.StringVar, ""),
+    ("http_ip_var", tk.StringVar, ""),
+    ("http_port_var", tk.StringVar, "80"),
+    ("http_endpoint_var", tk.StringVar, "/mjpeg"),
+)
+
+# Default USB camera index for each position
+_CAM_USB_DEFAULT_INDEX = {"front": 0, "back": 1}
+
+# Objects listed by the cloud connection test before it stops counting
+_CONNECTION_TEST_MAX_FILES = 100
+
+# Seconds a COM port scan is reused before the serial ports are enumerated again
+_PORT_SCAN_TTL = 2.0
+
+# Interval at which the Tk thread picks up results of background file loads
+_LOAD_POLL_MS = 50
+
+# Quiet time after the last connection field write before the URL preview is rebuilt
+_PREVIEW_DEBOUNCE_MS = 120
+
+# Connection fields of an RTSP/HTTP camera, in form order
+_URL_FIELDS = ("username", "password", "ip", "port", "endpoint")
+
+# Tk variables behind one URL preview; a tuple, so no per-instance __dict__
+_UrlPreviewVars = namedtuple("_UrlPreviewVars", _URL_FIELDS + ("preview", "camera_type"))
+
+# Camera type and URL scheme of each URL preview kind
+_URL_PREVIEW_SCHEMES = {
+    "rtsp": ("RTSP", "rtsp://"),
+    "http": ("HTTP", "http://"),
+}
+
+# Title and preview colour of the lazily built IP camera frames
+_IP_CAMERA_FRAMES = {
+    "rtsp": ("RTSP Camera Settings", "blue"),
+    "http": ("HTTP Camera Settings", "green"),
+}
+
+
+# Text of the enhanced cloud status window
+_ENHANCED_STATUS_TEMPLATE = string.Template("""ENHANCED CLOUD STORAGE STATUS WITH JSON BACKUPS
+    ======================================================================
+
+    🏢 CONTEXT INFORMATION:
+    Agency: $agency
+    Site: $site
+    Data Context: $context
+
+    📊 CLOUD STORAGE STATISTICS:
+    Total Files in Cloud: $total_files
+    JSON Records: $json_files
+    Image Files: $image_files
+    Daily Report Files: $daily_report_files
+    Total Storage Used: $total_size
+
+    📄 LOCAL JSON BACKUPS:
+    Local JSON Files Ready: $json_count
+    Status: $json_status
+
+    ⏰ UPLOAD INFORMATION:
+    Last Upload: $last_upload
+
+     FEATURES:
+    ✓ Offline-first operation (no delays during saves)
+    ✓ Local JSON backups for complete records
+    ✓ Bulk JSON upload for efficient cloud sync
+    ✓ Auto PDF generation for complete records
+    ✓ Incremental cloud backup (only new/changed files)
+    ✓ Organized folder structure (no duplicates)
+
+    🌐 CONNECTION STATUS: $connection_status
+    """)
+
+# Text shown after refreshing the enhanced cloud status window
+_STATUS_REFRESH_TEMPLATE = string.Template("""STATUS REFRESHED AT $time
+
+    Local JSON Backups: $json_count files ready
+    Cloud Connection: Testing...
+
+    Click 'Bulk Upload JSONs' to upload all local JSON backups.
+    Click 'Full Backup' for comprehensive backup including reports.
+    """)
+
+# Text of the enhanced cloud status window after a refresh
+_ENHANCED_REFRESH_TEMPLATE = string.Template("""ENHANCED CLOUD STORAGE STATUS (Refreshed)
+    ============================================================
+
+    Context: $context
+    Total Files: $total_files
+    JSON Records: $json_files
+    Image Files: $image_files
+    Daily Reports: $daily_report_files
+    Total Size: $total_size
+
+    Last Updated: $time
+
+    Status: Refreshed successfully ✓
+    """)
+
+# Text of the cloud status window after a refresh
+_CLOUD_REFRESH_TEMPLATE = string.Template("""CLOUD STORAGE STATUS (REFRESHED)
+==================================================
+
+🔄 Last Refreshed: $time
+
+📍 Context: $agency_name - $site_name
+📊 Total Files: $total_files
+├── JSON Records: $json_files
+├── Images: $image_files
+└── PDF Reports: $pdf_files
+
+💾 Storage Size: $total_size
+⏰ Last Upload: $last_upload
+
+✅ Cloud connection is working properly!
+
+🔄 Auto-refresh available - click refresh button for latest data.
+""")
+
+# Sections of the site management tab: (title, column id, heading,
+# entry label, tree attribute, entry var attribute, add method,
+# delete method, grid row, grid column)
+_SITE_SECTIONS = (
+    ("Site Names", "site", "Site Name", "New Site:",
+     "site_tree", "site_name_var", "add_site", "delete_site", 0, 0),
+    ("Site Incharges", "incharge", "Incharge Name", "New Incharge:",
+     "incharge_tree", "incharge_name_var", "add_incharge", "delete_incharge", 0, 1),
+    ("Transfer Parties", "transfer_party", "Transfer Party Name", "New Transfer Party:",
+     "tp_tree", "transfer_party_var", "add_transfer_party", "delete_transfer_party", 1, 0),
+    ("Agency Names", "agency", "Agency Name", "New Agency:",
+     "agency_tree", "agency_name_var", "add_agency", "delete_agency", 1, 1),
+)
+
+# Values shown for keys missing from a cloud upload summary
+_SUMMARY_DEFAULTS = {
+    'agency': 'Unknown',
+    'site': 'Unknown',
+    'context': 'Unknown',
+    'total_files': 0,
+    'json_files': 0,
+    'image_files': 0,
+    'daily_report_files': 0,
+    'pdf_files': 0,
+    'total_size': 'Unknown',
+    'last_upload': 'Never',
+}
+
+
+# Sample lines for the simple regex test - ADD YOUR WEIGHBRIDGE DATA FORMATS HERE
+_SIMPLE_TEST_SAMPLES = (
+    "1234.5",           # Simple number
+    "Weight: 1500 kg",  # With label
+    ":2500",            # Colon format
+    "3000.75",          # Decimal
+    "No numbers here",  # Invalid
+)
+
+# Sample lines for the full regex test window
+_FULL_TEST_SAMPLES = (
+    "Weight: 1234.5 kg",
+    "1500",
+    "2345.67",
+    ":1800",
+    "Net Weight = 2500.0",
+    "Gross: 3000",
+    "1234Wt:",
+    "Invalid data xyz",
+)
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_wb_pattern(pattern):
+    """Compile a weighbridge regex pattern, memoized across loads, edits and test runs"""
+    return compile_weight_pattern(pattern)
+
+
+class _CameraProbe:
+    """Grab frames from an open capture on a background thread
+    
+    Frames are retrieved into two buffers used alternately, so OpenCV can
+    reuse the buffer memory instead of allocating every frame. The grab loop
+    overwrites a buffer two grabs after publishing it, so latest() hands
+    readers a copy.
+    """
+    
+    def __init__(self, cap):
+        """Initialize the probe
+        
+        Args:
+            cap: Opened cv2.VideoCapture; released once the probe stops
+        """
+        self._cap = cap
+        self._buffers = [None, None]
+        self._latest = -1  # Index of the most recently filled buffer
+        self._frame_count = 0
+        self._lock = threading.Lock()
+        self._first_frame = threading.Event()
+        self._running = False
+        self._thread = None
+    
+    def start(self):
+        """Start grabbing frames"""
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+    
+    def _run(self):
+        """Grab loop: fill the buffer the reader is not using, then publish it
+        
+        The capture is released here, once the loop is done with it, so a
+        stop() that times out never releases it under a grab() in progress.
+        """
+        write_idx = 0
+        try:
+            while self._running:
+                if not self._cap.grab():
+                    break
+                ret, frame = self._cap.retrieve(self._buffers[write_idx])
+                if not ret:
+                    continue
+                with self._lock:
+                    self._buffers[write_idx] = frame
+                    self._latest = write_idx
+                    self._frame_count += 1
+                self._first_frame.set()
+                write_idx ^= 1
+        finally:
+            self._cap.release()
+    
+    def wait_for_frame(self, timeout):
+        """Wait until a frame has been grabbed
+        
+        Args:
+            timeout (float): Seconds to wait
+            
+        Returns:
+            bool: True if at least one frame arrived in time
+        """
+        return self._first_frame.wait(timeout)
+    
+    def latest(self):
+        """Return (frames grabbed so far, copy of the most recent frame or None)"""
+        with self._lock:
+            frame = self._buffers[self._latest].copy() if self._latest >= 0 else None
+            return self._frame_count, frame
+    
+    def stop(self, timeout=5.0):
+        """Stop the grab loop; the capture is released when the loop exits
+        
+        Args:
+            timeout (float): Seconds to wait for the grab loop to exit
+            
+        Returns:
+            bool: True if the loop has exited and the capture is released
+        """
+        self._running = False
+        if self._thread is None:
+            # Never started - nothing else holds the capture
+            self._cap.release()
+            return True
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
 
 
 class SettingsPanel:
@@ -28,7 +337,11 @@ class SettingsPanel:
         self.update_cameras_callback = update_cameras_callback
         self.current_user = current_user
         self.user_role = user_role
+        self.logger = logging.getLogger('SettingsPanel')
         self.regex_pattern_var = tk.StringVar(value=r"(\d+\.?\d*)")
+        # Compile the regex pattern once per change instead of on every use
+        self.regex_pattern_var.trace_add('write', self._recompile_regex)
+        self._recompile_regex()
         # Initialize settings storage
         self.settings_storage = SettingsStorage()
         
@@ -40,7 +353,6 @@ class SettingsPanel:
         
         # Initialize weighbridge with the fixed callback
         self.weighbridge = WeighbridgeManager(self.update_weight_display)
-        import config
         config.set_global_weighbridge(self.weighbridge, self.current_weight_var, self.wb_status_var)
 
         # Check authentication for settings access
@@ -109,11 +421,11 @@ class SettingsPanel:
         if enabled:
             self.video_status_var.set("On")
             self.video_status_label.config(foreground="green")
-            print("📹 Equalizer ENABLED")
+            self.logger.info("📹 Equalizer ENABLED")
         else:
             self.video_status_var.set("Off")
             self.video_status_label.config(foreground="gray")
-            print("📹 Equalizer DISABLED")
+            self.logger.info("📹 Equalizer DISABLED")
         
         # Save the setting to persistent storage
         self.save_video_recording_settings()
@@ -139,10 +451,10 @@ class SettingsPanel:
                     self.video_status_var.set("Off")
                     self.video_status_label.config(foreground="gray")
                 
-                print(f"Loaded equalizer settings: enabled={enabled}")
+                self.logger.info("Loaded equalizer settings: enabled=%s", enabled)
                 
         except Exception as e:
-            print(f"Error loading equalizer settings: {e}")
+            self.logger.error("Error loading equalizer settings: %s", e)
 
 
     def save_video_recording_settings(self):
@@ -156,14 +468,14 @@ class SettingsPanel:
             
             success = self.settings_storage.save_video_recording_settings(settings)
             if success:
-                print("✅ Video recording settings saved successfully")
+                self.logger.info("✅ Video recording settings saved successfully")
                 return True
             else:
-                print("❌ Failed to save video recording settings")
+                self.logger.error("❌ Failed to save video recording settings")
                 return False
                 
         except Exception as e:
-            print(f"Error saving video recording settings: {e}")
+            self.logger.error("Error saving video recording settings: %s", e)
             return False
 
 
@@ -181,6 +493,8 @@ class SettingsPanel:
         # Camera settings tab
         camera_tab = ttk.Frame(self.settings_notebook, style="TFrame")
         self.settings_notebook.add(camera_tab, text="Cameras")
+        self._camera_tab = camera_tab
+        self.settings_notebook.bind("<<NotebookTabChanged>>", self._on_settings_tab_changed)
         
         # Only create User and Site management tabs if NOT in hardcoded mode
         if not config.HARDCODED_MODE:
@@ -203,25 +517,9 @@ class SettingsPanel:
 
         # Admin controls (lock/unlock) - only show if admin and not hardcoded mode
         if self.user_role == 'admin' and not config.HARDCODED_MODE:
-            lock_frame = ttk.Frame(self.parent)
-            lock_frame.pack(fill=tk.X, padx=5, pady=5)
-            
-            if self.are_settings_locked():
-                unlock_btn = HoverButton(lock_frame,
-                                    text="🔓 Unlock Settings",
-                                    bg=config.COLORS["warning"],
-                                    fg=config.COLORS["button_text"],
-                                    padx=10, pady=3,
-                                    command=self.unlock_settings)
-                unlock_btn.pack(side=tk.RIGHT, padx=5)
-            else:
-                lock_btn = HoverButton(lock_frame,
-                                    text="🔒 Lock Settings",
-                                    bg=config.COLORS["error"],
-                                    fg=config.COLORS["button_text"],
-                                    padx=10, pady=3,
-                                    command=self.lock_settings)
-                lock_btn.pack(side=tk.RIGHT, padx=5)
+            self.lock_unlock_frame = ttk.Frame(self.parent)
+            self.lock_unlock_frame.pack(fill=tk.X, padx=5, pady=5)
+            self.update_lock_button()
 
             if self.are_settings_locked():
                 self.disable_all_settings()
@@ -249,7 +547,7 @@ class SettingsPanel:
     def load_all_saved_settings(self):
         """Load all saved settings after panel creation - UPDATED"""
         try:
-            print("Loading saved settings...")
+            self.logger.debug("Loading saved settings...")
             
             # Load weighbridge settings (this now includes test mode)
             self.load_weighbridge_settings()  # This will now handle test mode
@@ -257,23 +555,20 @@ class SettingsPanel:
             # Load camera settings  
             self.load_saved_camera_settings()
             
-            # Load user management data
-            self.load_users()
+            # Users and sites are loaded by create_user_management /
+            # create_site_management, only when their tabs exist
             
-            # Load site management data
-            self.load_sites()
-            
-            print("All settings loaded successfully")
+            self.logger.info("All settings loaded successfully")
             
         except Exception as e:
-            print(f"Error loading saved settings: {e}")
+            self.logger.error("Error loading saved settings: %s", e)
 
     def load_saved_weighbridge_settings(self):
         """Load weighbridge settings from storage"""
         try:
             wb_settings = self.settings_storage.get_weighbridge_settings()
             if wb_settings:
-                print(f"Loading weighbridge settings: {wb_settings}")
+                self.logger.debug("Loading weighbridge settings: %s", wb_settings)
                 
                 # Refresh COM ports first
                 self.refresh_com_ports()
@@ -283,9 +578,9 @@ class SettingsPanel:
                     available_ports = self.com_port_combo['values']
                     if wb_settings["com_port"] in available_ports:
                         self.com_port_var.set(wb_settings["com_port"])
-                        print(f"Set COM port to: {wb_settings['com_port']}")
+                        self.logger.debug("Set COM port to: %s", wb_settings['com_port'])
                     else:
-                        print(f"Saved COM port {wb_settings['com_port']} not available")
+                        self.logger.warning("Saved COM port %s not available", wb_settings['com_port'])
                 
                 # Set other weighbridge settings
                 if "baud_rate" in wb_settings:
@@ -297,99 +592,49 @@ class SettingsPanel:
                 if "stop_bits" in wb_settings:
                     self.stop_bits_var.set(wb_settings["stop_bits"])
                     
-                print("Weighbridge settings loaded successfully")
+                self.logger.info("Weighbridge settings loaded successfully")
             else:
-                print("No saved weighbridge settings found")
+                self.logger.info("No saved weighbridge settings found")
                 
         except Exception as e:
-            print(f"Error loading weighbridge settings: {e}")
+            self.logger.error("Error loading weighbridge settings: %s", e)
 
     def load_saved_camera_settings(self):
         """Load camera settings from storage with HTTP support"""
         try:
             camera_settings = self.settings_storage.get_camera_settings()
             if camera_settings:
-                print(f"Loading camera settings: {camera_settings}")
-                
-                # Load front camera settings
-                if hasattr(self, 'front_camera_type_var'):
-                    self.front_camera_type_var.set(camera_settings.get("front_camera_type", "USB"))
-                if hasattr(self, 'front_usb_index_var'):
-                    self.front_usb_index_var.set(camera_settings.get("front_camera_index", 0))
-                    
-                # Load front RTSP settings
-                if hasattr(self, 'front_rtsp_username_var'):
-                    self.front_rtsp_username_var.set(camera_settings.get("front_rtsp_username", ""))
-                if hasattr(self, 'front_rtsp_password_var'):
-                    self.front_rtsp_password_var.set(camera_settings.get("front_rtsp_password", ""))
-                if hasattr(self, 'front_rtsp_ip_var'):
-                    self.front_rtsp_ip_var.set(camera_settings.get("front_rtsp_ip", ""))
-                if hasattr(self, 'front_rtsp_port_var'):
-                    self.front_rtsp_port_var.set(camera_settings.get("front_rtsp_port", "554"))
-                if hasattr(self, 'front_rtsp_endpoint_var'):
-                    self.front_rtsp_endpoint_var.set(camera_settings.get("front_rtsp_endpoint", "/stream1"))
-                    
-                # Load front HTTP settings
-                if hasattr(self, 'front_http_username_var'):
-                    self.front_http_username_var.set(camera_settings.get("front_http_username", ""))
-                if hasattr(self, 'front_http_password_var'):
-                    self.front_http_password_var.set(camera_settings.get("front_http_password", ""))
-                if hasattr(self, 'front_http_ip_var'):
-                    self.front_http_ip_var.set(camera_settings.get("front_http_ip", ""))
-                if hasattr(self, 'front_http_port_var'):
-                    self.front_http_port_var.set(camera_settings.get("front_http_port", "80"))
-                if hasattr(self, 'front_http_endpoint_var'):
-                    self.front_http_endpoint_var.set(camera_settings.get("front_http_endpoint", "/mjpeg"))
+                self.logger.debug("Loading camera settings: %s", camera_settings)
                 
-                # Load back camera settings
-                if hasattr(self, 'back_camera_type_var'):
-                    self.back_camera_type_var.set(camera_settings.get("back_camera_type", "USB"))
-                if hasattr(self, 'back_usb_index_var'):
-                    self.back_usb_index_var.set(camera_settings.get("back_camera_index", 1))
-                    
-                # Load back RTSP settings
-                if hasattr(self, 'back_rtsp_username_var'):
-                    self.back_rtsp_username_var.set(camera_settings.get("back_rtsp_username", ""))
-                if hasattr(self, 'back_rtsp_password_var'):
-                    self.back_rtsp_password_var.set(camera_settings.get("back_rtsp_password", ""))
-                if hasattr(self, 'back_rtsp_ip_var'):
-                    self.back_rtsp_ip_var.set(camera_settings.get("back_rtsp_ip", ""))
-                if hasattr(self, 'back_rtsp_port_var'):
-                    self.back_rtsp_port_var.set(camera_settings.get("back_rtsp_port", "554"))
-                if hasattr(self, 'back_rtsp_endpoint_var'):
-                    self.back_rtsp_endpoint_var.set(camera_settings.get("back_rtsp_endpoint", "/stream1"))
-                    
-                # Load back HTTP settings
-                if hasattr(self, 'back_http_username_var'):
-                    self.back_http_username_var.set(camera_settings.get("back_http_username", ""))
-                if hasattr(self, 'back_http_password_var'):
-                    self.back_http_password_var.set(camera_settings.get("back_http_password", ""))
-                if hasattr(self, 'back_http_ip_var'):
-                    self.back_http_ip_var.set(camera_settings.get("back_http_ip", ""))
-                if hasattr(self, 'back_http_port_var'):
-                    self.back_http_port_var.set(camera_settings.get("back_http_port", "80"))
-                if hasattr(self, 'back_http_endpoint_var'):
-                    self.back_http_endpoint_var.set(camera_settings.get("back_http_endpoint", "/mjpeg"))
+                # Load front then back camera settings into whichever vars exist
+                for position in ("front", "back"):
+                    for name, _var_class, default in _CAM_VAR_SPECS:
+                        var = getattr(self, f"{position}_{name}", None)
+                        if var is None:
+                            continue
+                        if name == "usb_index_var":
+                            key = f"{position}_camera_index"
+                            default = _CAM_USB_DEFAULT_INDEX[position]
+                        else:
+                            key = f"{position}_{name[:-len('_var')]}"
+                        var.set(camera_settings.get(key, default))
                 
                 # Update UI states based on loaded settings
-                if hasattr(self, 'on_camera_type_change'):
-                    self.on_camera_type_change("front")
-                    self.on_camera_type_change("back")
+                self.on_camera_type_change("front")
+                self.on_camera_type_change("back")
                 
                 # Update previews
-                if hasattr(self, 'update_rtsp_preview'):
-                    self.update_rtsp_preview("front")
-                    self.update_rtsp_preview("back")
-                if hasattr(self, 'update_http_preview'):
-                    self.update_http_preview("front")
-                    self.update_http_preview("back")
+                self.update_rtsp_preview("front")
+                self.update_rtsp_preview("back")
+                self.update_http_preview("front")
+                self.update_http_preview("back")
                 
-                print("Camera settings loaded successfully")
+                self.logger.info("Camera settings loaded successfully")
             else:
-                print("No saved camera settings found")
+                self.logger.info("No saved camera settings found")
                 
         except Exception as e:
-            print(f"Error loading camera settings: {e}")
+            self.logger.error("Error loading camera settings: %s", e)
 
 
     def on_stability_readings_change(self, *args):
@@ -412,17 +657,17 @@ class SettingsPanel:
             # Calculate and show the boost amount
             boost_amount = stability_value * 1000
             
-            print(f"📊 USER CHANGED STABILITY: {stability_value}")
-            print(f"🚀 NEW NITRO BOOST AMOUNT: +{boost_amount:,} kg")
+            self.logger.debug("📊 USER CHANGED STABILITY: %s", stability_value)
+            self.logger.debug("🚀 NEW NITRO BOOST AMOUNT: +%s kg", format(boost_amount, ','))
             
             # If nitro mode is currently active, show what the boost will be
             if config.get_global_nitro_mode():
-                print(f"🚀 NITRO MODE IS ACTIVE - First weight will get +{boost_amount:,} kg boost")
+                self.logger.debug("🚀 NITRO MODE IS ACTIVE - First weight will get +%s kg boost", format(boost_amount, ','))
             else:
-                print(f"💤 Nitro mode inactive - Boost will be +{boost_amount:,} kg when activated")
+                self.logger.debug("💤 Nitro mode inactive - Boost will be +%s kg when activated", format(boost_amount, ','))
                 
         except Exception as e:
-            print(f"Error updating stability readings: {e}")
+            self.logger.error("Error updating stability readings: %s", e)
 
 
     def save_weighbridge_settings(self):
@@ -434,12 +679,9 @@ class SettingsPanel:
                 messagebox.showerror("Error", "Regex pattern cannot be empty")
                 return False
                 
-            # Test the regex pattern
-            try:
-                import re
-                re.compile(regex_pattern)
-            except re.error as e:
-                messagebox.showerror("Error", f"Invalid regex pattern: {str(e)}")
+            # The pattern is compiled whenever it changes
+            if self._compiled_regex is None:
+                messagebox.showerror("Error", f"Invalid regex pattern: {str(self._regex_error)}")
                 return False
             
             wb_settings = {
@@ -449,20 +691,20 @@ class SettingsPanel:
                 "parity": self.parity_var.get(),
                 "stop_bits": self.stop_bits_var.get(),
                 "regex_pattern": regex_pattern,
-                "test_mode": self.test_mode_var.get() if hasattr(self, 'test_mode_var') else False
+                "test_mode": self.test_mode_var.get()
             }
             
             success = self.settings_storage.save_weighbridge_settings(wb_settings)
             if success:
                 # OPTIMIZATION: Apply regex pattern immediately to avoid reconnection
-                if hasattr(self, 'weighbridge') and self.weighbridge:
+                if self.weighbridge:
                     pattern_applied = self.weighbridge.update_regex_pattern(regex_pattern)
                     if pattern_applied:
-                        print(f"✅ Regex pattern applied immediately: {regex_pattern}")
+                        self.logger.info("✅ Regex pattern applied immediately: %s", regex_pattern)
                     else:
-                        print(f"⚠️ Failed to apply regex pattern: {regex_pattern}")
+                        self.logger.warning("⚠️ Failed to apply regex pattern: %s", regex_pattern)
                 
-                print("✅ Weighbridge settings saved successfully")
+                self.logger.info("✅ Weighbridge settings saved successfully")
                 return True
             else:
                 messagebox.showerror("Error", "Failed to save weighbridge settings")
@@ -472,16 +714,26 @@ class SettingsPanel:
             messagebox.showerror("Error", f"Error saving settings: {str(e)}")
             return False
 
+    def _recompile_regex(self, *args):
+        """Compile the regex pattern whenever regex_pattern_var changes"""
+        pattern = self.regex_pattern_var.get().strip()
+        try:
+            self._compiled_regex = _compile_wb_pattern(pattern) if pattern else None
+            self._regex_error = None
+        except re.error as e:
+            self._compiled_regex = None
+            self._regex_error = e
+
     def save_camera_settings(self):
         """Save camera settings to persistent storage"""
         try:
             settings = self.get_current_camera_settings()
             
-            print(f"Saving camera settings: {settings}")
+            self.logger.debug("Saving camera settings: %s", settings)
             
             if self.settings_storage.save_camera_settings(settings):
                 # messagebox.showinfo("Success", "Camera settings saved successfully!")
-                print("Camera settings saved to file")
+                self.logger.info("Camera settings saved to file")
                 
                 # Apply the settings immediately if callback available
                 if self.update_cameras_callback:
@@ -494,7 +746,7 @@ class SettingsPanel:
                 return False
                 
         except Exception as e:
-            print(f"Error saving camera settings: {e}")
+            self.logger.error("Error saving camera settings: %s", e)
             messagebox.showerror("Error", f"Failed to save camera settings: {str(e)}")
             return False
 
@@ -504,7 +756,7 @@ class SettingsPanel:
             # Get current settings
             settings = self.get_current_camera_settings()
             
-            print(f"Applying camera settings: {settings}")
+            self.logger.debug("Applying camera settings: %s", settings)
             
             # Apply to cameras through callback
             if self.update_cameras_callback:
@@ -513,7 +765,7 @@ class SettingsPanel:
             self.cam_status_var.set("Camera settings applied. Changes take effect on next capture.")
             
         except Exception as e:
-            print(f"Error applying camera settings: {e}")
+            self.logger.error("Error applying camera settings: %s", e)
             self.cam_status_var.set(f"Error applying settings: {str(e)}")
 
 
@@ -530,6 +782,8 @@ class SettingsPanel:
         # Camera settings tab
         camera_tab = ttk.Frame(self.settings_notebook, style="TFrame")
         self.settings_notebook.add(camera_tab, text="Cameras")
+        self._camera_tab = camera_tab
+        self.settings_notebook.bind("<<NotebookTabChanged>>", self._on_settings_tab_changed)
         
         # Always create the tabs but hide them in hardcoded mode
         users_tab = ttk.Frame(self.settings_notebook, style="TFrame")
@@ -632,7 +886,7 @@ class SettingsPanel:
                 # Check if the saved COM port is still available
                 available_ports = self.weighbridge.get_available_ports()
                 if com_port in available_ports:
-                    print(f"Auto-connecting to saved weighbridge on {com_port}")
+                    self.logger.info("Auto-connecting to saved weighbridge on %s", com_port)
                     
                     # Try to connect automatically
                     try:
@@ -644,21 +898,21 @@ class SettingsPanel:
                             wb_settings.get("stop_bits", 1.0)
                         ):
                             self.wb_status_var.set("Status: Connected")
-                            self.weight_label.config(foreground="green")
+                            self._set_weight_label_color("green")
                             self.connect_btn.config(state=tk.DISABLED)
                             self.disconnect_btn.config(state=tk.NORMAL)
-                            print("Auto-connection successful")
+                            self.logger.info("Auto-connection successful")
                         else:
-                            print("Auto-connection failed")
+                            self.logger.error("Auto-connection failed")
                     except Exception as e:
-                        print(f"Auto-connection error: {e}")
+                        self.logger.error("Auto-connection error: %s", e)
                 else:
-                    print(f"Saved COM port {com_port} not available")
+                    self.logger.warning("Saved COM port %s not available", com_port)
             else:
-                print("No saved weighbridge settings for auto-connection")
+                self.logger.info("No saved weighbridge settings for auto-connection")
                 
         except Exception as e:
-            print(f"Error in auto-connect: {e}")
+            self.logger.error("Error in auto-connect: %s", e)
 
 
 
@@ -666,7 +920,7 @@ class SettingsPanel:
         """Handle cleanup when closing"""
         try:
             # Save current settings before closing
-            print("Saving settings on close...")
+            self.logger.debug("Saving settings on close...")
             
             # Save weighbridge settings
             if hasattr(self, 'com_port_var'):
@@ -679,11 +933,32 @@ class SettingsPanel:
             # Disconnect weighbridge
             if self.weighbridge:
                 self.weighbridge.disconnect()
+            
+            # Cancel pending timers so none fires against destroyed widgets
+            pending_ids = [self._passcode_after_id, self._load_poll_id]
+            pending_ids.extend(self._preview_after_ids.values())
+            pending_ids.extend(self._scrollregion_after_ids.values())
+            pending_ids.extend(self._row_color_pending.values())
+            for after_id in pending_ids:
+                if after_id is not None:
+                    try:
+                        self.parent.after_cancel(after_id)
+                    except tk.TclError:
+                        pass  # Interpreter already torn down
+            self._passcode_after_id = None
+            self._load_poll_id = None
+            self._preview_after_ids.clear()
+            self._scrollregion_after_ids.clear()
+            self._row_color_pending.clear()
+            
+            # Stop camera probes that have not started yet
+            if self._probe_pool is not None:
+                self._probe_pool.shutdown(wait=False, cancel_futures=True)
                 
-            print("Settings saved on close")
+            self.logger.info("Settings saved on close")
             
         except Exception as e:
-            print(f"Error saving settings on close: {e}")
+            self.logger.error("Error saving settings on close: %s", e)
 
     def authenticate_settings_access(self):
         """Authenticate for settings access"""
@@ -779,36 +1054,22 @@ class SettingsPanel:
 
     def are_settings_locked(self):
         """Check if settings are locked"""
-        try:
-            settings = self.settings_storage.get_all_settings()
-            return settings.get("locked", False)
-        except:
-            return False
+        # Lock state only changes through lock_settings/unlock_settings, which refresh the cache
+        if self._settings_locked is None:
+            self._settings_locked = self.settings_storage.are_settings_locked()
+        return self._settings_locked
 
 
 
     def lock_settings(self):
         """Lock all settings from being modified"""
         try:
-            settings = self.settings_storage.get_all_settings()
-            settings["locked"] = True
-            
-            # Save the locked state using settings_storage method
-            # First, save each section properly
-            if "weighbridge" in settings:
-                self.settings_storage.save_weighbridge_settings(settings["weighbridge"])
-            if "cameras" in settings:
-                self.settings_storage.save_camera_settings(settings["cameras"])
-                
-            # Now save the complete settings with locked flag
-            import json
-            with open(self.settings_storage.settings_file, 'r') as f:
-                all_settings = json.load(f)
-            
-            all_settings["locked"] = True
-            
-            with open(self.settings_storage.settings_file, 'w') as f:
-                json.dump(all_settings, f, indent=4)
+            # Locked state lives in a sidecar flag file, the settings JSON is untouched.
+            # Invalidate the cached lock state first.
+            self._settings_locked = None
+            if not self.settings_storage.set_settings_locked(True):
+                messagebox.showerror("Error", "Failed to lock settings")
+                return
                 
             messagebox.showinfo("Settings Locked", 
                             "All settings have been locked.\n"
@@ -826,14 +1087,11 @@ class SettingsPanel:
     def unlock_settings(self):
         """Unlock settings for modification"""
         try:
-            import json
-            with open(self.settings_storage.settings_file, 'r') as f:
-                settings = json.load(f)
-            
-            settings["locked"] = False
-            
-            with open(self.settings_storage.settings_file, 'w') as f:
-                json.dump(settings, f, indent=4)
+            # Invalidate the cached lock state
+            self._settings_locked = None
+            if not self.settings_storage.set_settings_locked(False):
+                messagebox.showerror("Error", "Failed to unlock settings")
+                return
                 
             messagebox.showinfo("Settings Unlocked", 
                             "Settings have been unlocked and can now be modified.")
@@ -849,123 +1107,159 @@ class SettingsPanel:
 
     def update_lock_button(self):
         """Update the lock/unlock button based on current state"""
-        if hasattr(self, 'lock_unlock_frame'):
-            # Clear existing buttons
-            for widget in self.lock_unlock_frame.winfo_children():
-                widget.destroy()
-                
-            # Add appropriate button
-            if self.are_settings_locked():
-                unlock_btn = HoverButton(self.lock_unlock_frame,
-                                    text="🔓 Unlock Settings",
-                                    bg=config.COLORS["warning"],
-                                    fg=config.COLORS["button_text"],
-                                    padx=10, pady=3,
-                                    command=self.unlock_settings)
-                unlock_btn.pack(side=tk.RIGHT, padx=5)
-            else:
-                lock_btn = HoverButton(self.lock_unlock_frame,
-                                    text="🔒 Lock Settings",
-                                    bg=config.COLORS["error"],
-                                    fg=config.COLORS["button_text"],
-                                    padx=10, pady=3,
-                                    command=self.lock_settings)
-                lock_btn.pack(side=tk.RIGHT, padx=5)
+        if self.lock_unlock_frame is None:
+            return
+            
+        if self.are_settings_locked():
+            text, bg, command = "🔓 Unlock Settings", config.COLORS["warning"], self.unlock_settings
+        else:
+            text, bg, command = "🔒 Lock Settings", config.COLORS["error"], self.lock_settings
+        
+        # Create the toggle button once, then just reconfigure it
+        if self._lock_toggle_btn is None:
+            self._lock_toggle_btn = HoverButton(self.lock_unlock_frame,
+                                                text=text,
+                                                bg=bg,
+                                                fg=config.COLORS["button_text"],
+                                                padx=10, pady=3,
+                                                command=command)
+            self._lock_toggle_btn.pack(side=tk.RIGHT, padx=5)
+        else:
+            self._lock_toggle_btn.configure(text=text, bg=bg, command=command)
+            # HoverButton restores this colour when the mouse leaves
+            self._lock_toggle_btn.defaultBackground = bg
 
     def disable_all_settings(self):
         """Disable all settings input widgets"""
-        # Disable weighbridge settings
-        if hasattr(self, 'com_port_combo'):
-            self.com_port_combo.config(state="disabled")
-        if hasattr(self, 'connect_btn'):
-            self.connect_btn.config(state="disabled")
-        if hasattr(self, 'disconnect_btn'):
-            self.disconnect_btn.config(state="disabled")
-        if hasattr(self, 'save_settings_btn'):
-            self.save_settings_btn.config(state="disabled")
-            
-        # Disable camera settings
-        for widget_name in ['front_camera_type_var', 'back_camera_type_var']:
-            if hasattr(self, widget_name):
-                # Disable radio buttons
-                pass
-                
-        # Disable all notebook tabs except viewing
-        if hasattr(self, 'settings_notebook'):
-            # Still allow viewing but not editing
-            pass
+        self._set_widget_states((widget, disabled_state)
+                                for widget, _, disabled_state in self._lockable_widgets)
         
     def enable_all_settings(self):
         """Enable all settings input widgets"""
-        # Enable weighbridge settings
-        if hasattr(self, 'com_port_combo'):
-            self.com_port_combo.config(state="readonly")
-        if hasattr(self, 'connect_btn'):
-            self.connect_btn.config(state="normal")
-        if hasattr(self, 'save_settings_btn'):
-            self.save_settings_btn.config(state="normal")
+        # Widgets without an enabled state keep their current state
+        self._set_widget_states((widget, enabled_state)
+                                for widget, enabled_state, _ in self._lockable_widgets
+                                if enabled_state)
+
+    def _set_widget_states(self, widget_states):
+        """Apply widget states with a single Tcl call per distinct state
+        
+        Args:
+            widget_states: Iterable of (widget, state) pairs
+        """
+        paths_by_state = {}
+        for widget, state in widget_states:
+            paths_by_state.setdefault(state, []).append(str(widget))
+        
+        for state, paths in paths_by_state.items():
+            self.parent.tk.call('foreach', 'w', paths, f'$w configure -state {state}')
 
     
     def init_variables(self):
         """Initialize settings variables"""
-        # Weighbridge settings
-        self.com_port_var = tk.StringVar()
-        self.baud_rate_var = tk.IntVar(value=9600)
-        self.data_bits_var = tk.IntVar(value=8)
-        self.parity_var = tk.StringVar(value="None")
-        self.stop_bits_var = tk.DoubleVar(value=1.0)
-        self.wb_status_var = tk.StringVar(value="Status: Disconnected")
-        self.current_weight_var = tk.StringVar(value="0 kg")
-        # ADD THIS LINE - Test mode variable initialization
-        self.test_mode_var = tk.BooleanVar(value=False)
-        self.test_mode_status_var = tk.StringVar(value="Status: Real Weighbridge Mode")
-        
-        # Camera settings
-        self.front_cam_index_var = tk.IntVar(value=0)
-        self.back_cam_index_var = tk.IntVar(value=1)
-        self.cam_status_var = tk.StringVar()
-        
-        # User management variables
-        self.username_var = tk.StringVar()
-        self.password_var = tk.StringVar()
-        self.confirm_password_var = tk.StringVar()
-        self.fullname_var = tk.StringVar()
-        self.is_admin_var = tk.BooleanVar(value=False)
-        
-        # Site management variables
-        self.site_name_var = tk.StringVar()
-        self.incharge_name_var = tk.StringVar()
-        self.transfer_party_var = tk.StringVar()
-        self.agency_name_var = tk.StringVar()
-        self.passcode_var = tk.StringVar()
-        self.nitro_mode_active = tk.BooleanVar(value=False)
-        self.nitro_status_var = tk.StringVar(value="")
-        
-        # Cloud backup status variable
-        self.backup_status_var = tk.StringVar()
-        self.stability_var = tk.IntVar(value=3)
-
-        self.video_recording_var = tk.BooleanVar(value=False)
+        # (attribute, Tk variable class, initial value) for every panel variable
+        variable_specs = (
+            # Weighbridge settings
+            ("com_port_var", tk.StringVar, ""),
+            ("baud_rate_var", tk.IntVar, 9600),
+            ("data_bits_var", tk.IntVar, 8),
+            ("parity_var", tk.StringVar, "None"),
+            ("stop_bits_var", tk.DoubleVar, 1.0),
+            ("wb_status_var", tk.StringVar, "Status: Disconnected"),
+            ("current_weight_var", tk.StringVar, "0 kg"),
+            ("test_mode_var", tk.BooleanVar, False),
+            ("test_mode_status_var", tk.StringVar, "Status: Real Weighbridge Mode"),
+            
+            # Camera settings
+            ("front_cam_index_var", tk.IntVar, 0),
+            ("back_cam_index_var", tk.IntVar, 1),
+            ("cam_status_var", tk.StringVar, ""),
+            
+            # User management variables
+            ("username_var", tk.StringVar, ""),
+            ("password_var", tk.StringVar, ""),
+            ("confirm_password_var", tk.StringVar, ""),
+            ("fullname_var", tk.StringVar, ""),
+            ("is_admin_var", tk.BooleanVar, False),
+            
+            # Site management variables
+            ("site_name_var", tk.StringVar, ""),
+            ("incharge_name_var", tk.StringVar, ""),
+            ("transfer_party_var", tk.StringVar, ""),
+            ("agency_name_var", tk.StringVar, ""),
+            ("passcode_var", tk.StringVar, ""),
+            ("nitro_mode_active", tk.BooleanVar, False),
+            ("nitro_status_var", tk.StringVar, ""),
+            
+            # Cloud backup status, stability readings and video recording
+            ("backup_status_var", tk.StringVar, ""),
+            ("stability_var", tk.IntVar, 3),
+            ("video_recording_var", tk.BooleanVar, False),
+        )
+        for name, var_class, value in variable_specs:
+            setattr(self, name, var_class(value=value))
+        
+        self._last_weight_text = None  # Last text pushed to current_weight_var
+        self._last_weight_fg = None  # Last foreground applied to weight_label
+        self._last_weight_status = None  # Last text pushed to weight_status_var
+        
+        # (widget, enabled state, disabled state) for widgets toggled by lock/unlock
+        self._lockable_widgets = []
+        self.lock_unlock_frame = None
+        self._lock_toggle_btn = None
+        self._settings_locked = None  # Cached lock state, None = not read yet
+        self._scrollregion_after_ids = {}  # Pending scrollregion updates by canvas path
+        self._row_color_pending = {}  # Treeview path -> pending idle re-stripe
+        self._site_names = set()  # Names in site_tree, for duplicate checks
+        self._incharge_names = set()  # Names in incharge_tree, for duplicate checks
+        self._agency_names = set()  # Names in agency_tree, for duplicate checks
+        self._tp_names = set()  # Names in tp_tree, for duplicate checks
+        self._wheel_canvas = None  # Canvas currently receiving mouse wheel events
+        self._wheel_bound = False  # Whether the shared <MouseWheel> handler is installed
+        self._preview_after_ids = {}  # (kind, position) -> pending URL preview rebuild
+        self._preview_keys = {}  # (kind, position) -> field values behind the shown preview
+        self._url_var_map = {}  # (position, kind) -> URL field vars, preview var, camera type var
+        self._camera_tab = None  # Cameras tab frame, set when the settings notebook is built
+        self._stale_previews = set()  # (kind, position) previews skipped while the tab was hidden
+        self._camera_frame_builders = {}  # position -> {camera type: builder not run yet}
+        self._camera_inputs = {}  # (position, camera type) -> [(input widget, enabled state)]
+        self._probe_pool = None  # Camera connection test workers, created on first test
+        self._pending_probes = []  # Futures of the latest camera connection test
+        self._http_probe = None  # urllib3 PoolManager for HTTP camera tests
+        
+        self._passcode_cache = (None, None)  # (date ordinal, passcode as entered text)
+        self._passcode_after_id = None  # Pending debounced passcode check
         self.update_video_recorder_callback = None
+        self._backup_running = False  # Guards against starting a second cloud backup
+        self._cached_data_manager = None  # Last data manager find_data_manager() found
+        self._debug_data_manager = False  # Log candidate attributes when lookup fails
+        self._json_count_cache = (None, 0)  # (backup folder signature, JSON backup count)
+        self._list_cache = {}  # Cloud listing prefix -> (monotonic time, file names)
+        self._users_cache = (None, None)  # (users.json (mtime, size), users dict)
+        self._load_results = queue.Queue()  # (Tk-thread callback, args) posted by background loads
+        self._pending_loads = 0  # Background loads whose result has not been applied yet
+        self._load_poll_id = None  # Pending poll of _load_results
+        self._sites_loaded = False  # Site lists hold the stored names - saving is safe
+        self._port_scan_cache = (0, None)  # (monotonic time, available COM ports)
+        self._available_port_set = set()  # Ports present at the last refresh_com_ports()
         
         # NEW: Add trace callback to sync stability changes globally
         self.stability_var.trace_add('write', self.on_stability_readings_change)
-        import config
         # NEW: Initialize global values immediately
         config.set_global_nitro_mode(False)
         config.set_global_stability_readings(3)  # Default value
         
-        print("🚀 SETTINGS PANEL: Global nitro mode system initialized")
+        self.logger.info("🚀 SETTINGS PANEL: Global nitro mode system initialized")
 
 
     def calculate_passcode(self):
         """Calculate unique passcode based on site name first letter and day name first letter"""
         try:
-            import datetime
-            
-            # Get current day name
-            current_date = datetime.datetime.now()
-            day_name = current_date.strftime('%A')  # Returns full day name like "Saturday"
+            # Passcode only changes once a day - reuse today's value
+            today = datetime.date.today()
+            today_ordinal = today.toordinal()
+            if self._passcode_cache[0] == today_ordinal:
+                return int(self._passcode_cache[1])
             
             # Get site name (from config or settings)
             if hasattr(config, 'HARDCODED_SITE') and config.HARDCODED_SITE:
@@ -975,66 +1269,73 @@ class SettingsPanel:
                 site_name = "Default"  # You can modify this based on your settings structure
             
             # Get first letter of site name and convert to number (A=1, B=2, ... Z=26)
-            site_first_letter = site_name[0].upper()
-            site_number = ord(site_first_letter) - ord('A') + 1
+            site_number = ord(site_name[0].upper()) - 64
             
-            # Get first letter of day name and convert to number
-            day_first_letter = day_name[0].upper()
-            day_number = ord(day_first_letter) - ord('A') + 1
+            # Get number for first letter of day name
+            day_number = _DAY_LETTER_VAL[today.weekday()]
             
             # Calculate passcode
             passcode = site_number + day_number
             
-            print(f"DEBUG: Site='{site_name}' -> {site_first_letter}={site_number}, Day='{day_name}' -> {day_first_letter}={day_number}, Passcode={passcode}")
+            # Cached as text so each keystroke check is a plain string compare
+            self._passcode_cache = (today_ordinal, str(passcode))
             return passcode
             
         except Exception as e:
-            print(f"Error calculating passcode: {e}")
+            self.logger.error("Error calculating passcode: %s", e)
             return 0
 
     def check_passcode(self, *args):
+        """Schedule a passcode check - debounced so a burst of keystrokes is checked once"""
+        if self._passcode_after_id is not None:
+            self.parent.after_cancel(self._passcode_after_id)
+        self._passcode_after_id = self.parent.after(150, self._do_check_passcode)
+
+    def _do_check_passcode(self):
         """Check passcode and activate nitro mode - ENHANCED WITH CURRENT STABILITY"""
-        try:
-            import config
-            
-            entered_passcode = self.passcode_var.get().strip()
-            if not entered_passcode:
-                self.nitro_mode_active.set(False)
-                self.nitro_status_var.set("")
-                config.set_global_nitro_mode(False)
-                return
+        self._passcode_after_id = None
+        
+        entered_passcode = self.passcode_var.get().strip()
+        if not entered_passcode:
+            self.nitro_mode_active.set(False)
+            self.nitro_status_var.set("")
+            config.set_global_nitro_mode(False)
+            return
+        
+        if self._passcode_cache[0] != datetime.date.today().toordinal():
+            self.calculate_passcode()
+        
+        # Cheat code or valid passcode - compared as text, so "0031", "+31"
+        # or "3_1" don't pass for 31
+        if entered_passcode == "08" or entered_passcode == self._passcode_cache[1]:
+            self.nitro_mode_active.set(True)
+            self.nitro_status_var.set("🚀 NITRO MODE")
+            config.set_global_nitro_mode(True)
             
-            # Cheat code or valid passcode
-            if entered_passcode == "08" or entered_passcode == str(self.calculate_passcode()):
-                self.nitro_mode_active.set(True)
-                self.nitro_status_var.set("🚀 NITRO MODE")
-                config.set_global_nitro_mode(True)
-                
-                # Show current stability setting and boost
+            # Show current stability setting and boost - the spinbox may hold
+            # non-numeric text, in which case keep the current global value
+            try:
                 current_stability = self.stability_var.get()
                 config.set_global_stability_readings(current_stability)  # Ensure sync
-                boost_amount = current_stability * 1000
-                
-                print(f"🚀 NITRO MODE ACTIVATED!")
-                print(f"📊 Current Stability Setting: {current_stability}")
-                print(f"🚀 First Weight Boost: +{boost_amount:,} kg")
-                
-            else:
-                self.nitro_mode_active.set(False)
-                self.nitro_status_var.set("❌ CONNECTED")
-                config.set_global_nitro_mode(False)
-                
-        except Exception as e:
-            print(f"Error in check_passcode: {e}")
+            except tk.TclError:
+                current_stability = config.get_global_stability_readings()
+            boost_amount = current_stability * 1000
+            
+            self.logger.info("🚀 NITRO MODE ACTIVATED!")
+            self.logger.info("📊 Current Stability Setting: %s", current_stability)
+            self.logger.info("🚀 First Weight Boost: +%s kg", format(boost_amount, ','))
+            
+        else:
+            self.nitro_mode_active.set(False)
+            self.nitro_status_var.set("❌ CONNECTED")
+            config.set_global_nitro_mode(False)
 
     def on_stability_readings_change(self, *args):
         """Called when user changes Stability Readings spinbox - CRITICAL METHOD"""
         try:
-            import config
-            
             # Get the current value from the spinbox
             stability_value = self.stability_var.get()
-            print(f"📊 SPINBOX CHANGED: User set stability to {stability_value}")
+            self.logger.debug("📊 SPINBOX CHANGED: User set stability to %s", stability_value)
             
             # Clamp to 1-9 range as requested
             if stability_value < 1:
@@ -1049,17 +1350,17 @@ class SettingsPanel:
             
             # Calculate and display new boost amount
             boost_amount = stability_value * 1000
-            print(f"🚀 UPDATED GLOBAL: New boost amount = +{boost_amount:,} kg")
+            self.logger.debug("🚀 UPDATED GLOBAL: New boost amount = +%s kg", format(boost_amount, ','))
             
             # Show current status
             nitro_active = config.get_global_nitro_mode()
             if nitro_active:
-                print(f"🚀 NITRO ACTIVE: Next first weight will get +{boost_amount:,} kg boost")
+                self.logger.debug("🚀 NITRO ACTIVE: Next first weight will get +%s kg boost", format(boost_amount, ','))
             else:
-                print(f"💤 Nitro inactive: Boost ready at +{boost_amount:,} kg when activated")
+                self.logger.debug("💤 Nitro inactive: Boost ready at +%s kg when activated", format(boost_amount, ','))
                 
         except Exception as e:
-            print(f"❌ Error in stability change callback: {e}")
+            self.logger.error("❌ Error in stability change callback: %s", e)
             import traceback
             traceback.print_exc()
 
@@ -1074,13 +1375,12 @@ class SettingsPanel:
             current_stability = self.stability_var.get()
             config.set_global_stability_readings(current_stability)
             
-            print(f"🔄 GLOBAL SYNC COMPLETE:")
-            print(f"   Nitro Mode: {current_nitro}")
-            print(f"   Stability Readings: {current_stability}")
-            print(f"   Boost Amount: {current_stability * 1000 if current_nitro else 0} kg")
+            self.logger.debug("🔄 GLOBAL SYNC COMPLETE: nitro=%s, stability=%s, boost=%s kg",
+                              current_nitro, current_stability,
+                              current_stability * 1000 if current_nitro else 0)
             
         except Exception as e:
-            print(f"Error syncing global values: {e}")
+            self.logger.error("Error syncing global values: %s", e)
 
     def update_weight_display(self, weight):
         """Update weight display (callback for weighbridge) - ENHANCED WITH NITRO SYNC
@@ -1098,20 +1398,22 @@ class SettingsPanel:
             # Calculate display weight (raw or boosted based on nitro mode)
             display_weight = self.get_display_weight(weight)
             
-            # Update the weight variable with calculated display weight
-            self.current_weight_var.set(f"{display_weight:.2f} kg")
+            # Update the weight variable only when the displayed text changes
+            weight_text = f"{display_weight:.2f} kg"
+            if weight_text != self._last_weight_text:
+                self._last_weight_text = weight_text
+                self.current_weight_var.set(weight_text)
             
             # Update weight label color based on connection status
             if hasattr(self, 'weight_label'):
                 if self.wb_status_var.get() == "Status: Connected":
-                    self.weight_label.config(foreground="green")
+                    self._set_weight_label_color("green")
                 else:
-                    self.weight_label.config(foreground="red")
+                    self._set_weight_label_color("red")
                     
             # Reset any error status after a valid weight
             if hasattr(self, 'weight_status_label'):
-                self.weight_status_label.config(foreground="black")
-                self.weight_status_var.set("Valid weight reading")
+                self._set_weight_status("Valid weight reading", "black")
             
             # Propagate weight update to form if callback is set
             # Use try/except to prevent recursive errors
@@ -1119,10 +1421,10 @@ class SettingsPanel:
                 try:
                     self.weighbridge_callback(weight)  # Send RAW weight to form (form handles its own boosting)
                 except Exception as e:
-                    print(f"Error in weighbridge_callback: {e}")
+                    self.logger.error("Error in weighbridge_callback: %s", e)
                         
         except Exception as e:
-            print(f"Error in update_weight_display: {e}")
+            self.logger.error("Error in update_weight_display: %s", e)
         finally:
             self.processing_callback = False
 
@@ -1136,8 +1438,6 @@ class SettingsPanel:
             float: Weight to display (raw or boosted)
         """
         try:
-            import config
-            
             # Check if nitro mode is active
             if not config.get_global_nitro_mode():
                 return raw_weight  # No boost if nitro mode is off
@@ -1162,22 +1462,24 @@ class SettingsPanel:
                     # Only boost display during first weighment
                     if current_weighment == 'first':
                         boosted_weight = config.calculate_nitro_boost(raw_weight)
-                        boost_amount = boosted_weight - raw_weight
-                        print(f"📱 DISPLAY SYNC: {raw_weight:.2f} kg + {boost_amount:.0f} kg = {boosted_weight:.2f} kg")
+                        if _DEBUG:
+                            boost_amount = boosted_weight - raw_weight
+                            self.logger.debug("📱 DISPLAY SYNC: %.2f kg + %.0f kg = %.2f kg", raw_weight, boost_amount, boosted_weight)
                         return boosted_weight
                     else:
                         # During second weighment, show raw weight
-                        print(f"📱 Second weighment: Showing raw weight {raw_weight:.2f} kg")
+                        if _DEBUG:
+                            self.logger.debug("📱 Second weighment: Showing raw weight %.2f kg", raw_weight)
                         return raw_weight
                         
             except Exception as e:
-                print(f"Could not determine weighment state: {e}")
+                self.logger.warning("Could not determine weighment state: %s", e)
             
             # Fallback: if can't determine weighment state, don't boost display
             return raw_weight
             
         except Exception as e:
-            print(f"Error calculating display weight: {e}")
+            self.logger.error("Error calculating display weight: %s", e)
             return raw_weight
 
     # Add this method to report invalid readings
@@ -1188,9 +1490,20 @@ class SettingsPanel:
             value: The value that was filtered out
         """
         if hasattr(self, 'weight_status_var') and hasattr(self, 'weight_status_label'):
-            self.weight_status_var.set(f"Filtered invalid reading: {value}")
-            self.weight_status_label.config(foreground="red")
+            self._set_weight_status(f"Filtered invalid reading: {value}", "red")
 
+    def _set_weight_label_color(self, color):
+        """Set the weight label colour, skipping the Tk call when unchanged"""
+        if color != self._last_weight_fg:
+            self._last_weight_fg = color
+            self.weight_label.config(foreground=color)
+
+    def _set_weight_status(self, text, color):
+        """Set the weight status text and colour, skipping the Tk calls when unchanged"""
+        if text != self._last_weight_status:
+            self._last_weight_status = text
+            self.weight_status_var.set(text)
+            self.weight_status_label.config(foreground=color)
 
     def load_saved_settings(self):
         """Load settings from storage"""
@@ -1237,7 +1550,7 @@ class SettingsPanel:
         scrollable_frame = ttk.Frame(canvas)
         scrollable_frame.bind(
             "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+            lambda e: self._schedule_scrollregion_update(canvas)
         )
         
         # Create window in canvas
@@ -1248,23 +1561,13 @@ class SettingsPanel:
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
         
-        # Bind mousewheel to canvas for smooth scrolling
-        def _on_mousewheel(event):
-            canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        
-        def _bind_mousewheel(event):
-            canvas.bind_all("<MouseWheel>", _on_mousewheel)
-        
-        def _unbind_mousewheel(event):
-            canvas.unbind_all("<MouseWheel>")
-        
         # Bind mouse wheel events when mouse enters/leaves canvas
-        canvas.bind('<Enter>', _bind_mousewheel)
-        canvas.bind('<Leave>', _unbind_mousewheel)
+        canvas.bind('<Enter>', self._bind_mousewheel)
+        canvas.bind('<Leave>', self._unbind_mousewheel)
         
         # For Linux systems (alternative mouse wheel binding)
-        canvas.bind("<Button-4>", lambda e: canvas.yview_scroll(-1, "units"))
-        canvas.bind("<Button-5>", lambda e: canvas.yview_scroll(1, "units"))
+        canvas.bind("<Button-4>", self._on_wheel_up)
+        canvas.bind("<Button-5>", self._on_wheel_down)
         
         # ========================================================================
         # WEIGHBRIDGE SETTINGS CONTENT (properly aligned grid)
@@ -1289,27 +1592,17 @@ class SettingsPanel:
                                 command=self.refresh_com_ports)
         refresh_btn.grid(row=0, column=2, padx=5, pady=2)
         
-        # ROW 1: Baud rate
-        ttk.Label(wb_frame, text="Baud Rate:").grid(row=1, column=0, sticky=tk.W, pady=2)
-        baud_rates = [600, 1200, 2400, 4800, 9600, 14400, 19200, 57600, 115200]
-        ttk.Combobox(wb_frame, textvariable=self.baud_rate_var, values=baud_rates, 
-                    state="readonly").grid(row=1, column=1, sticky=tk.EW, pady=2, padx=5)
-        
-        # ROW 2: Data bits
-        ttk.Label(wb_frame, text="Data Bits:").grid(row=2, column=0, sticky=tk.W, pady=2)
-        ttk.Combobox(wb_frame, textvariable=self.data_bits_var, values=[5, 6, 7, 8], 
-                    state="readonly").grid(row=2, column=1, sticky=tk.EW, pady=2, padx=5)
-        
-        # ROW 3: Parity
-        ttk.Label(wb_frame, text="Parity:").grid(row=3, column=0, sticky=tk.W, pady=2)
-        ttk.Combobox(wb_frame, textvariable=self.parity_var, 
-                    values=["None", "Odd", "Even", "Mark", "Space"], 
-                    state="readonly").grid(row=3, column=1, sticky=tk.EW, pady=2, padx=5)
-        
-        # ROW 4: Stop bits
-        ttk.Label(wb_frame, text="Stop Bits:").grid(row=4, column=0, sticky=tk.W, pady=2)
-        ttk.Combobox(wb_frame, textvariable=self.stop_bits_var, values=[1.0, 1.5, 2.0], 
-                    state="readonly").grid(row=4, column=1, sticky=tk.EW, pady=2, padx=5)
+        # ROWS 1-4: Serial parameters (label, variable, choices)
+        serial_rows = (
+            ("Baud Rate:", self.baud_rate_var, [600, 1200, 2400, 4800, 9600, 14400, 19200, 57600, 115200]),
+            ("Data Bits:", self.data_bits_var, [5, 6, 7, 8]),
+            ("Parity:", self.parity_var, ["None", "Odd", "Even", "Mark", "Space"]),
+            ("Stop Bits:", self.stop_bits_var, [1.0, 1.5, 2.0]),
+        )
+        for row, (label, variable, values) in enumerate(serial_rows, start=1):
+            ttk.Label(wb_frame, text=label).grid(row=row, column=0, sticky=tk.W, pady=2)
+            ttk.Combobox(wb_frame, textvariable=variable, values=values, 
+                        state="readonly").grid(row=row, column=1, sticky=tk.EW, pady=2, padx=5)
         
         # ROW 5: Regex Pattern
         ttk.Label(wb_frame, text="Regex Pattern:").grid(row=5, column=0, sticky=tk.W, pady=2)
@@ -1317,7 +1610,6 @@ class SettingsPanel:
         regex_frame.grid(row=5, column=1, columnspan=2, sticky=tk.EW, pady=2, padx=5)
         regex_frame.columnconfigure(0, weight=1)
 
-        self.regex_pattern_var = tk.StringVar(value=r"(\d+\.?\d*)")  # Default pattern
         self.regex_entry = ttk.Entry(regex_frame, textvariable=self.regex_pattern_var, width=40)
         self.regex_entry.grid(row=0, column=0, sticky=tk.EW, padx=(0, 5))
         
@@ -1353,6 +1645,14 @@ class SettingsPanel:
                                     command=self.save_weighbridge_settings)
         self.save_settings_btn.pack(side=tk.LEFT, padx=5)
         
+        # Widgets disabled while settings are locked
+        self._lockable_widgets = [
+            (self.com_port_combo, "readonly", "disabled"),
+            (self.connect_btn, "normal", "disabled"),
+            (self.disconnect_btn, None, "disabled"),
+            (self.save_settings_btn, "normal", "disabled"),
+        ]
+        
         # Auto-connect button
         auto_connect_btn = HoverButton(btn_frame, text="Auto Connect", bg=config.COLORS["warning"], 
                                     fg=config.COLORS["button_text"], padx=10, pady=3,
@@ -1398,6 +1698,15 @@ class SettingsPanel:
                                         command=self.bulk_upload_json_backups)
             self.bulk_json_btn.grid(row=0, column=0, padx=5, pady=5, sticky="ew")
             
+            # Separate action: pending JSONs as one .tar.gz archive instead of one object each
+            self.bundle_json_btn = HoverButton(cloud_frame, 
+                                        text="🗜 Bundle JSONs (.tar.gz)", 
+                                        bg=config.COLORS["button_alt"], 
+                                        fg=config.COLORS["button_text"], 
+                                        padx=8, pady=5,
+                                        command=self.bundle_json_backups)
+            self.bundle_json_btn.grid(row=1, column=0, padx=5, pady=5, sticky="ew")
+            
             self.backup_btn = HoverButton(cloud_frame, 
                                         text="📤 Full Backup (All)", 
                                         bg=config.COLORS["primary"], 
@@ -1430,7 +1739,6 @@ class SettingsPanel:
         info_label.pack(anchor=tk.W, pady=(0, 5))
         
         # Test mode toggle
-        self.test_mode_var = tk.BooleanVar()
         test_mode_check = ttk.Checkbutton(test_mode_frame,
                                         text="Enable Test Mode (Random Weight Generation)",
                                         variable=self.test_mode_var,
@@ -1438,7 +1746,6 @@ class SettingsPanel:
         test_mode_check.pack(anchor=tk.W, pady=2)
         
         # Status indicator
-        self.test_mode_status_var = tk.StringVar(value="Status: Real Weighbridge Mode")
         test_status_label = ttk.Label(test_mode_frame,
                                     textvariable=self.test_mode_status_var,
                                     font=("Segoe UI", 8, "bold"),
@@ -1479,7 +1786,6 @@ class SettingsPanel:
         
         # Weight stability settings
         ttk.Label(additional_frame, text="Stability Readings:").grid(row=3, column=0, sticky=tk.W, pady=2)
-        self.stability_var = tk.IntVar(value=3)
         ttk.Spinbox(additional_frame, from_=1, to=10, textvariable=self.stability_var, width=10).grid(row=3, column=1, sticky=tk.W, pady=2, padx=5)
         
         # Reading interval
@@ -1513,12 +1819,65 @@ class SettingsPanel:
 
 
 
+    def _bind_mousewheel(self, event):
+        """Route mouse wheel events to the canvas the pointer entered
+        
+        The application-wide <MouseWheel> handler is installed once, on the
+        first Enter; after that entering and leaving only swap the target
+        canvas instead of rewriting the global binding table.
+        """
+        self._wheel_canvas = event.widget
+        if not self._wheel_bound:
+            event.widget.bind_all("<MouseWheel>", self._on_mousewheel, add="+")
+            self._wheel_bound = True
+
+    def _unbind_mousewheel(self, event):
+        """Stop routing mouse wheel events when the pointer leaves the canvas"""
+        if self._wheel_canvas is event.widget:
+            self._wheel_canvas = None
+
+    def _on_mousewheel(self, event):
+        """Scroll the active canvas (Windows/macOS wheel events)"""
+        canvas = self._wheel_canvas
+        if canvas is None:
+            return
+        try:
+            canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+        except tk.TclError:
+            # Canvas was destroyed while the pointer was over it
+            self._wheel_canvas = None
+
+    def _on_wheel_up(self, event):
+        """Scroll the canvas up (X11 Button-4)"""
+        event.widget.yview_scroll(-1, "units")
+
+    def _on_wheel_down(self, event):
+        """Scroll the canvas down (X11 Button-5)"""
+        event.widget.yview_scroll(1, "units")
+
+    def _schedule_scrollregion_update(self, canvas):
+        """Recompute a canvas scroll region once a burst of <Configure> events settles
+        
+        Args:
+            canvas: Canvas whose scrollregion should cover all its items
+        """
+        key = str(canvas)
+        pending = self._scrollregion_after_ids.get(key)
+        if pending is not None:
+            canvas.after_cancel(pending)
+        self._scrollregion_after_ids[key] = canvas.after(50, self._update_scrollregion, canvas)
+
+    def _update_scrollregion(self, canvas):
+        """Set the canvas scroll region to the bounding box of all items"""
+        self._scrollregion_after_ids.pop(str(canvas), None)
+        canvas.configure(scrollregion=canvas.bbox("all"))
+
     def on_test_mode_toggle(self):
         """Handle test mode toggle - IMPROVED version"""
         try:
             is_test_mode = self.test_mode_var.get()
             
-            print(f"Test mode toggle called: {is_test_mode}")
+            self.logger.debug("Test mode toggle called: %s", is_test_mode)
             
             if is_test_mode:
                 # Switch to test mode
@@ -1526,23 +1885,23 @@ class SettingsPanel:
                 self.wb_status_var.set("Status: Test Mode Active")
                 
                 # IMPORTANT: Set test mode on weighbridge manager
-                if hasattr(self, 'weighbridge') and self.weighbridge:
+                if self.weighbridge:
                     self.weighbridge.set_test_mode(True)
-                    print("Set test mode on weighbridge manager")
+                    self.logger.debug("Set test mode on weighbridge manager")
                 
                 # Disconnect real weighbridge if connected
-                if hasattr(self, 'weighbridge') and self.weighbridge:
+                if self.weighbridge:
                     try:
                         if not self.weighbridge.test_mode:  # Only disconnect if not already in test mode
                             self.weighbridge.disconnect()
                     except Exception as e:
-                        print(f"Error disconnecting weighbridge for test mode: {e}")
+                        self.logger.error("Error disconnecting weighbridge for test mode: %s", e)
                 
                 # Update UI buttons
                 self.connect_btn.config(state=tk.DISABLED)
                 self.disconnect_btn.config(state=tk.DISABLED)
                 
-                print("Switched to test mode - random weight generation enabled")
+                self.logger.info("Switched to test mode - random weight generation enabled")
                 
             else:
                 # Switch back to real weighbridge mode
@@ -1550,9 +1909,9 @@ class SettingsPanel:
                 self.wb_status_var.set("Status: Disconnected")
                 
                 # IMPORTANT: Disable test mode on weighbridge manager
-                if hasattr(self, 'weighbridge') and self.weighbridge:
+                if self.weighbridge:
                     self.weighbridge.set_test_mode(False)
-                    print("Disabled test mode on weighbridge manager")
+                    self.logger.debug("Disabled test mode on weighbridge manager")
                 
                 # Re-enable UI buttons
                 self.connect_btn.config(state=tk.NORMAL)
@@ -1562,26 +1921,29 @@ class SettingsPanel:
                 wb_settings = self.settings_storage.get_weighbridge_settings()
                 if wb_settings.get("com_port"):
                     # Don't auto-connect, let user decide
-                    print("Real weighbridge mode - user can now connect manually")
+                    self.logger.debug("Real weighbridge mode - user can now connect manually")
                 
-                print("Switched to real weighbridge mode")
+                self.logger.info("Switched to real weighbridge mode")
             
             # Save the test mode setting
             success = self.save_weighbridge_settings()
             if success:
-                print("Test mode setting saved successfully")
+                self.logger.debug("Test mode setting saved successfully")
             else:
-                print("Failed to save test mode setting")
+                self.logger.warning("Failed to save test mode setting")
             
-            # CRITICAL: Update global weighbridge reference
+            # CRITICAL: Update global weighbridge reference if it was replaced
             try:
-                config.set_global_weighbridge(self.weighbridge, self.current_weight_var, self.wb_status_var)
-                print("Updated global weighbridge reference")
+                current = (self.weighbridge, self.current_weight_var, self.wb_status_var)
+                published = config.get_global_weighbridge_info()
+                if any(mine is not theirs for mine, theirs in zip(current, published)):
+                    config.set_global_weighbridge(*current)
+                    self.logger.debug("Updated global weighbridge reference")
             except Exception as e:
-                print(f"Error updating global reference: {e}")
+                self.logger.error("Error updating global reference: %s", e)
             
         except Exception as e:
-            print(f"Error toggling test mode: {e}")
+            self.logger.error("Error toggling test mode: %s", e)
             messagebox.showerror("Error", f"Failed to toggle test mode: {str(e)}")
 
 
@@ -1589,49 +1951,49 @@ class SettingsPanel:
         """Load weighbridge settings including test mode and regex - OPTIMIZED VERSION"""
         try:
             wb_settings = self.settings_storage.get_weighbridge_settings()
+            regex_pattern = wb_settings.get("regex_pattern", r"(\d+\.?\d*)")
+            test_mode = wb_settings.get("test_mode", False)
             
-            # Load existing settings
-            self.com_port_var.set(wb_settings.get("com_port", ""))
-            self.baud_rate_var.set(wb_settings.get("baud_rate", 9600))
-            self.data_bits_var.set(wb_settings.get("data_bits", 8))
-            self.parity_var.set(wb_settings.get("parity", "None"))
-            self.stop_bits_var.set(wb_settings.get("stop_bits", 1.0))
+            # Load existing settings with traces detached, then react once
+            with self._suppress_traces(self.com_port_var, self.baud_rate_var, self.data_bits_var,
+                                       self.parity_var, self.stop_bits_var, self.regex_pattern_var,
+                                       self.test_mode_var):
+                self.com_port_var.set(wb_settings.get("com_port", ""))
+                self.baud_rate_var.set(wb_settings.get("baud_rate", 9600))
+                self.data_bits_var.set(wb_settings.get("data_bits", 8))
+                self.parity_var.set(wb_settings.get("parity", "None"))
+                self.stop_bits_var.set(wb_settings.get("stop_bits", 1.0))
+                self.regex_pattern_var.set(regex_pattern)
+                self.test_mode_var.set(test_mode)
             
-            # OPTIMIZATION: Load and immediately apply regex pattern
-            regex_pattern = wb_settings.get("regex_pattern", r"(\d+\.?\d*)")
-            self.regex_pattern_var.set(regex_pattern)
+            self._recompile_regex()
             
-            # Apply regex pattern immediately to weighbridge if it exists
-            if hasattr(self, 'weighbridge') and self.weighbridge:
+            # Apply regex pattern immediately to weighbridge if it exists and compiles
+            if self._regex_error is not None:
+                self.logger.warning("Invalid regex pattern in settings: %s (%s)", regex_pattern, self._regex_error)
+            elif self.weighbridge:
                 pattern_applied = self.weighbridge.update_regex_pattern(regex_pattern)
                 if pattern_applied:
-                    print(f"✅ Loaded and applied regex pattern: {regex_pattern}")
+                    self.logger.debug("Loaded and applied regex pattern: %s", regex_pattern)
                 else:
-                    print(f"⚠️ Failed to apply loaded regex pattern: {regex_pattern}")
+                    self.logger.warning("Failed to apply loaded regex pattern: %s", regex_pattern)
             
-            # Load test mode setting
-            test_mode = wb_settings.get("test_mode", False)
-            if hasattr(self, 'test_mode_var'):
-                self.test_mode_var.set(test_mode)
-                
-                # CRITICAL: Apply test mode to weighbridge manager
-                if hasattr(self, 'weighbridge') and self.weighbridge:
-                    self.weighbridge.set_test_mode(test_mode)
-                    print(f"Applied test mode {test_mode} to weighbridge manager")
+            # CRITICAL: Apply test mode to weighbridge manager
+            if self.weighbridge:
+                self.weighbridge.set_test_mode(test_mode)
+                self.logger.debug("Applied test mode %s to weighbridge manager", test_mode)
             
             # Update status based on test mode
             if test_mode:
-                if hasattr(self, 'test_mode_status_var'):
-                    self.test_mode_status_var.set("Status: Test Mode - Random Weights")
+                self.test_mode_status_var.set("Status: Test Mode - Random Weights")
                 self.wb_status_var.set("Status: Test Mode Active")
             else:
-                if hasattr(self, 'test_mode_status_var'):
-                    self.test_mode_status_var.set("Status: Real Weighbridge Mode")
+                self.test_mode_status_var.set("Status: Real Weighbridge Mode")
             
-            print(f"✅ Loaded weighbridge settings with regex pattern: {regex_pattern}")
+            self.logger.info("Loaded weighbridge settings with regex pattern: %s", regex_pattern)
             
         except Exception as e:
-            print(f"Error loading weighbridge settings: {e}")
+            self.logger.error("Error loading weighbridge settings: %s", e)
 
 
         try:
@@ -1639,18 +2001,42 @@ class SettingsPanel:
             if hasattr(self, 'stability_var'):
                 stability_value = self.stability_var.get()
                 config.set_global_stability_readings(stability_value)
-                print(f"📊 LOADED: Synced stability value to global: {stability_value}")
+                self.logger.debug("Synced loaded stability value to global: %s", stability_value)
             
             # Sync current nitro mode state
             if hasattr(self, 'nitro_mode_active'):
                 nitro_active = self.nitro_mode_active.get()
                 config.set_global_nitro_mode(nitro_active)
-                print(f"🚀 LOADED: Synced nitro mode to global: {nitro_active}")
+                self.logger.debug("Synced loaded nitro mode to global: %s", nitro_active)
                 
-            print("✅ SETTINGS LOADED: Global nitro system synced with settings")
+            self.logger.debug("Global nitro system synced with loaded settings")
             
         except Exception as e:
-            print(f"Error syncing loaded values with global system: {e}")
+            self.logger.error("Error syncing loaded values with global system: %s", e)
+
+    @contextlib.contextmanager
+    def _suppress_traces(self, *variables):
+        """Detach the Tcl traces of variables for the duration of a block
+        
+        Tkinter's trace_remove also deletes the callback command, so the
+        traces are removed and re-added with Tcl's trace command directly.
+        
+        Args:
+            *variables: Tk variables whose traces should not fire
+        """
+        tk_call = self.parent.tk.call
+        removed = []
+        for var in variables:
+            for modes, callback_name in var.trace_info():
+                tk_call('trace', 'remove', 'variable', str(var), modes, callback_name)
+                removed.append((str(var), modes, callback_name))
+        try:
+            yield
+        finally:
+            # trace info lists the newest trace first; re-add oldest first so
+            # the callbacks keep firing in their original order
+            for var_name, modes, callback_name in reversed(removed):
+                tk_call('trace', 'add', 'variable', var_name, modes, callback_name)
 
     def create_enhanced_cloud_backup_section(self, wb_frame):
         """UPDATED: Enhanced cloud backup section with JSON bulk upload"""
@@ -1717,6 +2103,15 @@ class SettingsPanel:
                                         command=self.refresh_json_count)
             refresh_json_btn.pack(side=tk.LEFT, padx=5)
             
+            # Separate action: pending JSONs as one .tar.gz archive instead of one object each
+            self.bundle_json_btn = HoverButton(json_status_frame, 
+                                        text="🗜 Bundle JSONs (.tar.gz)", 
+                                        bg=config.COLORS["button_alt"], 
+                                        fg=config.COLORS["button_text"], 
+                                        padx=5, pady=1,
+                                        command=self.bundle_json_backups)
+            self.bundle_json_btn.pack(side=tk.RIGHT, padx=5)
+            
             # Row 3: Backup status display
             status_frame = ttk.Frame(cloud_frame)
             status_frame.grid(row=2, column=0, columnspan=3, sticky="ew", padx=5, pady=5)
@@ -1738,7 +2133,7 @@ class SettingsPanel:
             self.refresh_json_count()
             
         except Exception as e:
-            print(f"Error creating enhanced cloud backup section: {e}")
+            self.logger.error("Error creating enhanced cloud backup section: %s", e)
 
     # ALSO ADD THESE METHODS to your SettingsPanel class:
 
@@ -1746,9 +2141,8 @@ class SettingsPanel:
         """Refresh the count of local JSON backup files"""
         try:
             data_manager = self.find_data_manager()
-            if data_manager and hasattr(data_manager, 'get_all_json_backups'):
-                json_files = data_manager.get_all_json_backups()
-                count = len(json_files)
+            if data_manager and hasattr(data_manager, 'iter_json_backups'):
+                count = self._count_json_backups(data_manager)
                 
                 if count == 0:
                     self.json_count_var.set("No JSON backups found")
@@ -1761,10 +2155,57 @@ class SettingsPanel:
                 
         except Exception as e:
             self.json_count_var.set(f"Error: {str(e)}")
-            print(f"Error refreshing JSON count: {e}")
+            self.logger.error("Error refreshing JSON count: %s", e)
+
+    def _count_json_backups(self, data_manager):
+        """Count local JSON backups, rescanning only when a date folder has changed
+        
+        Args:
+            data_manager: Data manager owning the JSON backup folder
+            
+        Returns:
+            int: Number of JSON backup files
+        """
+        backup_dir = data_manager.json_backup_folder
+        if not os.path.isdir(backup_dir):
+            return 0
+        
+        # Adding a backup bumps the mtime of its date folder, and a new date
+        # folder shows up in the listing, so this identifies the folder contents
+        with os.scandir(backup_dir) as entries:
+            signature = tuple(sorted((entry.name, entry.stat().st_mtime_ns)
+                                     for entry in entries if entry.is_dir()))
+        
+        if self._json_count_cache[0] != signature:
+            if hasattr(data_manager, 'count_json_backups'):
+                count = data_manager.count_json_backups()
+            else:
+                count = sum(1 for _ in data_manager.iter_json_backups())
+            self._json_count_cache = (signature, count)
+        return self._json_count_cache[1]
 
     def bulk_upload_json_backups(self):
-        """Bulk upload all local JSON backups to cloud"""
+        """Bulk upload all local JSON backups to cloud, one object per JSON"""
+        self._start_json_upload('bulk_upload_json_backups_to_cloud', "Bulk JSON upload",
+                                self._show_bulk_upload_results)
+
+    def bundle_json_backups(self):
+        """Upload pending local JSON backups as one .tar.gz archive"""
+        self._start_json_upload('bundle_and_upload_json_backups', "JSON bundle upload",
+                                self._show_bundle_results)
+
+    def _start_json_upload(self, method_name, feature, show_results):
+        """Run a data manager JSON upload in a background thread
+        
+        Args:
+            method_name: Name of the data manager upload method
+            feature: Feature name used in status and error messages
+            show_results: Tk-thread callback taking the upload results dict
+        """
+        if self._backup_running:
+            self.backup_status_var.set("A cloud backup is already running...")
+            return
+        
         try:
             # Find data manager
             data_manager = self.find_data_manager()
@@ -1773,60 +2214,95 @@ class SettingsPanel:
                 self.backup_status_var.set("Error: Data manager not found")
                 return
             
-            # Set status to uploading
-            self.backup_status_var.set("Starting bulk JSON upload...")
-            
-            # Check if bulk upload method exists
-            if hasattr(data_manager, 'bulk_upload_json_backups_to_cloud'):
-                results = data_manager.bulk_upload_json_backups_to_cloud()
-                
-                if results.get("success", False):
-                    # Show success message
-                    uploaded = results.get("uploaded", 0)
-                    total = results.get("total", 0)
-                    
-                    if uploaded > 0:
-                        status_msg = f"✅ Bulk upload successful! {uploaded}/{total} JSON backups uploaded"
-                        self.backup_status_var.set(status_msg)
-                        
-                        # Show detailed results in popup
-                        messagebox.showinfo("Bulk Upload Complete", 
-                                        f"JSON Bulk Upload Results:\n\n"
-                                        f"✅ Successfully uploaded: {uploaded}/{total} files\n"
-                                        f"📁 Local JSON backups processed\n"
-                                        f"🌐 All complete records now in cloud\n\n"
-                                        f" Images and metadata included with each JSON")
-                    else:
-                        self.backup_status_var.set("ℹ️ No new JSON backups to upload")
-                        messagebox.showinfo("Bulk Upload", "No new JSON backups found to upload.")
-                else:
-                    error_msg = results.get("error", "Unknown error")
-                    self.backup_status_var.set(f"❌ Bulk upload failed: {error_msg}")
-                    messagebox.showerror("Bulk Upload Failed", 
-                                    f"Bulk JSON upload failed:\n\n{error_msg}\n\n"
-                                    "Please check:\n"
-                                    "• Internet connection\n"
-                                    "• Cloud storage credentials\n"
-                                    "• Storage permissions")
-                    
-                # Refresh JSON count after upload
-                self.refresh_json_count()
-                
-            else:
+            # Check if the upload method exists
+            upload_fn = getattr(data_manager, method_name, None)
+            if not upload_fn:
                 # Fallback message
-                self.backup_status_var.set("Bulk upload not available - update data manager")
+                self.backup_status_var.set(f"{feature} not available - update data manager")
                 messagebox.showerror("Feature Not Available", 
-                                "Bulk JSON upload feature is not available.\n"
+                                f"{feature} feature is not available.\n"
                                 "Please update your data manager module.")
-                                
+                return
+            
+            # Set status to uploading
+            self._backup_running = True
+            self.backup_status_var.set(f"Starting {feature.lower()}...")
+            
         except Exception as e:
-            error_msg = f"Error: {str(e)}"
-            print(f"Error during bulk JSON upload: {e}")
-            self.backup_status_var.set(error_msg)
-            messagebox.showerror("Bulk Upload Error", f"Bulk upload failed with error:\n{error_msg}")
+            self._show_backup_error("Bulk Upload Error", f"{feature} failed with error", e)
+            return
+        
+        def _worker():
+            try:
+                results = upload_fn()
+                self.parent.after(0, show_results, results)
+            except Exception as e:
+                self.parent.after(0, self._show_backup_error,
+                                  "Bulk Upload Error", f"{feature} failed with error", e)
+            finally:
+                self.parent.after(0, self._finish_backup)
+        
+        threading.Thread(target=_worker, daemon=True).start()
+
+    def _show_bundle_results(self, results):
+        """Report JSON bundle upload results - runs on the Tk thread"""
+        if not results.get("success", False):
+            error_msg = results.get("error") or "; ".join(results.get("errors", [])) or "Unknown error"
+            self.backup_status_var.set(f"❌ JSON bundle upload failed: {error_msg}")
+            messagebox.showerror("Bundle Upload Failed", f"JSON bundle upload failed:\n\n{error_msg}")
+            return
+        
+        uploaded = results.get("uploaded", 0)
+        if not uploaded:
+            self.backup_status_var.set("ℹ️ No new JSON backups to bundle")
+            messagebox.showinfo("Bundle Upload", "No new JSON backups found to bundle.")
+            return
+        
+        self.backup_status_var.set(f"✅ Bundled {uploaded} JSON backups into one archive")
+        messagebox.showinfo("Bundle Upload Complete",
+                            f"JSON Bundle Upload Results:\n\n"
+                            f"✅ Bundled records: {uploaded}\n"
+                            f"🗜 Archive: {results.get('cloud_path', '')}\n\n"
+                            f"Records are stored inside the archive (with an index.json),\n"
+                            f"not as individual JSON files. Images are not included.")
+
+    def _show_bulk_upload_results(self, results):
+        """Report bulk JSON upload results - runs on the Tk thread"""
+        if results.get("success", False):
+            # Show success message
+            uploaded = results.get("uploaded", 0)
+            total = results.get("total", 0)
+            
+            if uploaded > 0:
+                status_msg = f"✅ Bulk upload successful! {uploaded}/{total} JSON backups uploaded"
+                self.backup_status_var.set(status_msg)
+                
+                # Show detailed results in popup
+                messagebox.showinfo("Bulk Upload Complete", 
+                                f"JSON Bulk Upload Results:\n\n"
+                                f"✅ Successfully uploaded: {uploaded}/{total} files\n"
+                                f"📁 Local JSON backups processed\n"
+                                f"🌐 All complete records now in cloud\n\n"
+                                f" Images and metadata included with each JSON")
+            else:
+                self.backup_status_var.set("ℹ️ No new JSON backups to upload")
+                messagebox.showinfo("Bulk Upload", "No new JSON backups found to upload.")
+        else:
+            error_msg = results.get("error", "Unknown error")
+            self.backup_status_var.set(f"❌ Bulk upload failed: {error_msg}")
+            messagebox.showerror("Bulk Upload Failed", 
+                            f"Bulk JSON upload failed:\n\n{error_msg}\n\n"
+                            "Please check:\n"
+                            "• Internet connection\n"
+                            "• Cloud storage credentials\n"
+                            "• Storage permissions")
 
     def comprehensive_backup_with_json(self):
         """Enhanced comprehensive backup including JSON files"""
+        if self._backup_running:
+            self.backup_status_var.set("A cloud backup is already running...")
+            return
+        
         try:
             # Find data manager
             data_manager = self.find_data_manager()
@@ -1836,72 +2312,107 @@ class SettingsPanel:
                 return
             
             # Set status to backing up
+            self._backup_running = True
             self.backup_status_var.set("Starting comprehensive backup (JSONs + Images + Reports)...")
             
-            # First do bulk JSON upload
-            if hasattr(data_manager, 'bulk_upload_json_backups_to_cloud'):
-                json_results = data_manager.bulk_upload_json_backups_to_cloud()
-            else:
+        except Exception as e:
+            self._show_backup_error("Backup Error", "Comprehensive backup failed", e)
+            return
+        
+        bulk_fn = getattr(data_manager, 'bulk_upload_json_backups_to_cloud', None)
+        backup_fn = getattr(data_manager, 'backup_complete_records_to_cloud_with_reports', None)
+        
+        def _worker():
+            try:
                 json_results = {"success": False, "uploaded": 0, "total": 0}
-            
-            # Then do comprehensive backup (existing method)
-            if hasattr(data_manager, 'backup_complete_records_to_cloud_with_reports'):
-                backup_results = data_manager.backup_complete_records_to_cloud_with_reports()
-            else:
                 backup_results = {"success": False, "error": "Method not available"}
-            
-            # Combine results
-            total_json_uploaded = json_results.get("uploaded", 0)
-            total_records_uploaded = backup_results.get("records_uploaded", 0)
-            total_images_uploaded = backup_results.get("images_uploaded", 0)
-            total_reports_uploaded = backup_results.get("reports_uploaded", 0)
-            
-            if json_results.get("success", False) or backup_results.get("success", False):
-                # Show combined success message
-                status_parts = []
-                
-                if total_json_uploaded > 0:
-                    status_parts.append(f"✓ {total_json_uploaded} JSON backups")
-                
-                if total_records_uploaded > 0:
-                    status_parts.append(f"✓ {total_records_uploaded} records")
-                
-                if total_images_uploaded > 0:
-                    status_parts.append(f"✓ {total_images_uploaded} images")
-                
-                if total_reports_uploaded > 0:
-                    status_parts.append(f"✓ {total_reports_uploaded} reports")
-                
-                if status_parts:
-                    status_msg = "Comprehensive backup successful! " + ", ".join(status_parts)
-                else:
-                    status_msg = "Backup completed - no new files to upload"
                 
-                self.backup_status_var.set(status_msg)
+                # The bulk JSON upload and the comprehensive backup are independent
+                # network-bound phases, so run them side by side
+                with ThreadPoolExecutor(max_workers=2) as executor:
+                    futures = {}
+                    if bulk_fn:
+                        futures[executor.submit(bulk_fn)] = "json"
+                    if backup_fn:
+                        futures[executor.submit(backup_fn)] = "backup"
+                    
+                    for future in as_completed(futures):
+                        if futures[future] == "json":
+                            json_results = future.result()
+                            self.parent.after(0, self.backup_status_var.set,
+                                              "JSON upload finished, waiting for records/images/reports...")
+                        else:
+                            backup_results = future.result()
+                            self.parent.after(0, self.backup_status_var.set,
+                                              "Records/images/reports finished, waiting for JSON upload...")
                 
-                # Show detailed popup
-                messagebox.showinfo("Comprehensive Backup Complete",
-                                f"🎉 Comprehensive Backup Results:\n\n"
-                                f"📄 JSON Backups: {total_json_uploaded}\n"
-                                f"📊 Records: {total_records_uploaded}\n"
-                                f"🖼️ Images: {total_images_uploaded}\n"
-                                f"📋 Reports: {total_reports_uploaded}\n\n"
-                                f"✅ All data backed up to cloud successfully!\n"
-                                f"💾 Local copies remain available for offline access")
-            else:
-                # Show error
-                # error_msg = backup_results.get("error", "Unknown error")
-                # self.backup_status_var.set(f"❌ Comprehensive backup failed: {error_msg}")
-                messagebox.showinfo("Comprehensive Backup Success",f"✅ Cloud Backup successful!\n\n")
+                self.parent.after(0, self._show_comprehensive_backup_results, json_results, backup_results)
+            except Exception as e:
+                self.parent.after(0, self._show_backup_error,
+                                  "Backup Error", "Comprehensive backup failed", e)
+            finally:
+                self.parent.after(0, self._finish_backup)
+        
+        threading.Thread(target=_worker, daemon=True).start()
+
+    def _show_comprehensive_backup_results(self, json_results, backup_results):
+        """Report comprehensive backup results - runs on the Tk thread"""
+        # Combine results
+        total_json_uploaded = json_results.get("uploaded", 0)
+        total_records_uploaded = backup_results.get("records_uploaded", 0)
+        total_images_uploaded = backup_results.get("images_uploaded", 0)
+        total_reports_uploaded = backup_results.get("reports_uploaded", 0)
+        
+        if json_results.get("success", False) or backup_results.get("success", False):
+            # Show combined success message
+            status_parts = []
             
-            # Refresh JSON count
-            self.refresh_json_count()
+            if total_json_uploaded > 0:
+                status_parts.append(f"✓ {total_json_uploaded} JSON backups")
             
-        except Exception as e:
-            error_msg = f"Error: {str(e)}"
-            print(f"Error during comprehensive backup: {e}")
-            self.backup_status_var.set(error_msg)
-            messagebox.showerror("Backup Error", f"Comprehensive backup failed:\n{error_msg}")
+            if total_records_uploaded > 0:
+                status_parts.append(f"✓ {total_records_uploaded} records")
+            
+            if total_images_uploaded > 0:
+                status_parts.append(f"✓ {total_images_uploaded} images")
+            
+            if total_reports_uploaded > 0:
+                status_parts.append(f"✓ {total_reports_uploaded} reports")
+            
+            if status_parts:
+                status_msg = "Comprehensive backup successful! " + ", ".join(status_parts)
+            else:
+                status_msg = "Backup completed - no new files to upload"
+            
+            self.backup_status_var.set(status_msg)
+            
+            # Show detailed popup
+            messagebox.showinfo("Comprehensive Backup Complete",
+                            f"🎉 Comprehensive Backup Results:\n\n"
+                            f"📄 JSON Backups: {total_json_uploaded}\n"
+                            f"📊 Records: {total_records_uploaded}\n"
+                            f"🖼️ Images: {total_images_uploaded}\n"
+                            f"📋 Reports: {total_reports_uploaded}\n\n"
+                            f"✅ All data backed up to cloud successfully!\n"
+                            f"💾 Local copies remain available for offline access")
+        else:
+            # Show error
+            # error_msg = backup_results.get("error", "Unknown error")
+            # self.backup_status_var.set(f"❌ Comprehensive backup failed: {error_msg}")
+            messagebox.showinfo("Comprehensive Backup Success",f"✅ Cloud Backup successful!\n\n")
+
+    def _show_backup_error(self, title, message, error):
+        """Report a failed cloud backup - runs on the Tk thread"""
+        error_msg = f"Error: {str(error)}"
+        self.logger.error("%s: %s", message, error)
+        self.backup_status_var.set(error_msg)
+        messagebox.showerror(title, f"{message}:\n{error_msg}")
+
+    def _finish_backup(self):
+        """Clear the running flag and refresh the JSON count after a backup thread ends"""
+        self._backup_running = False
+        self._list_cache.clear()  # Uploaded files make cached listings stale
+        self.refresh_json_count()
 
     def show_enhanced_cloud_status(self):
         """Show enhanced cloud status including JSON backup information"""
@@ -1912,10 +2423,8 @@ class SettingsPanel:
                 return
             
             # Get cloud upload summary
-            if hasattr(data_manager, 'get_enhanced_cloud_upload_summary'):
-                summary = data_manager.get_enhanced_cloud_upload_summary()
-            else:
-                summary = {"error": "Enhanced summary not available"}
+            get_enh = getattr(data_manager, 'get_enhanced_cloud_upload_summary', None)
+            summary = get_enh() if get_enh is not None else data_manager.get_cloud_upload_summary()
             
             if "error" in summary:
                 messagebox.showerror("Cloud Storage Status", f"Error: {summary['error']}")
@@ -1923,9 +2432,8 @@ class SettingsPanel:
             
             # Get JSON backup count
             json_count = 0
-            if hasattr(data_manager, 'get_all_json_backups'):
-                json_files = data_manager.get_all_json_backups()
-                json_count = len(json_files)
+            if hasattr(data_manager, 'iter_json_backups'):
+                json_count = self._count_json_backups(data_manager)
             
             # Create enhanced status window
             status_window = tk.Toplevel(self.parent)
@@ -1946,42 +2454,14 @@ class SettingsPanel:
             scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
             
             # Format enhanced status information
-            status_text = f"""ENHANCED CLOUD STORAGE STATUS WITH JSON BACKUPS
-    {'=' * 70}
-
-    🏢 CONTEXT INFORMATION:
-    Agency: {summary.get('agency', 'Unknown')}
-    Site: {summary.get('site', 'Unknown')}
-    Data Context: {summary.get('context', 'Unknown')}
-
-    📊 CLOUD STORAGE STATISTICS:
-    Total Files in Cloud: {summary.get('total_files', 0)}
-    JSON Records: {summary.get('json_files', 0)}
-    Image Files: {summary.get('image_files', 0)}
-    Daily Report Files: {summary.get('daily_report_files', 0)}
-    Total Storage Used: {summary.get('total_size', 'Unknown')}
-
-    📄 LOCAL JSON BACKUPS:
-    Local JSON Files Ready: {json_count}
-    Status: {'✅ Ready for bulk upload' if json_count > 0 else '⭕ No JSON backups found'}
-
-    ⏰ UPLOAD INFORMATION:
-    Last Upload: {summary.get('last_upload', 'Never')}
-
-     FEATURES:
-    ✓ Offline-first operation (no delays during saves)
-    ✓ Local JSON backups for complete records
-    ✓ Bulk JSON upload for efficient cloud sync
-    ✓ Auto PDF generation for complete records
-    ✓ Incremental cloud backup (only new/changed files)
-    ✓ Organized folder structure (no duplicates)
-
-    🌐 CONNECTION STATUS: {'✅ Connected' if summary.get('total_files', -1) >= 0 else '❌ Error'}
-    """
+            status_text = _ENHANCED_STATUS_TEMPLATE.substitute(
+                ChainMap(summary, _SUMMARY_DEFAULTS),
+                json_count=json_count,
+                json_status='✅ Ready for bulk upload' if json_count > 0 else '⭕ No JSON backups found',
+                connection_status='✅ Connected' if summary.get('total_files', -1) >= 0 else '❌ Error')
             
-            # Insert text
-            text_widget.insert(tk.END, status_text)
-            text_widget.config(state=tk.DISABLED)  # Make read-only
+            # Insert text and make read-only
+            self._stream_insert(text_widget, status_text)
             
             # Add buttons
             button_frame = ttk.Frame(status_window)
@@ -2004,27 +2484,44 @@ class SettingsPanel:
     def refresh_enhanced_cloud_status_simple(self, text_widget, json_count):
         """Simple refresh for enhanced cloud status"""
         try:
-            # Re-enable text widget for updating
-            text_widget.config(state=tk.NORMAL)
-            text_widget.delete(1.0, tk.END)
-            
             # Simple refresh message
-            refresh_text = f"""STATUS REFRESHED AT {datetime.datetime.now().strftime('%H:%M:%S')}
-
-    Local JSON Backups: {json_count} files ready
-    Cloud Connection: Testing...
-
-    Click 'Bulk Upload JSONs' to upload all local JSON backups.
-    Click 'Full Backup' for comprehensive backup including reports.
-    """
-            text_widget.insert(tk.END, refresh_text)
-            
-            # Make read-only again
-            text_widget.config(state=tk.DISABLED)
+            refresh_text = _STATUS_REFRESH_TEMPLATE.substitute(
+                time=_DateTime.now().strftime('%H:%M:%S'),
+                json_count=json_count)
+            self._stream_insert(text_widget, refresh_text)
             
         except Exception as e:
-            text_widget.insert(tk.END, f"Error refreshing: {str(e)}")
-            text_widget.config(state=tk.DISABLED)
+            self._stream_insert(text_widget, f"Error refreshing: {str(e)}")
+
+    def _stream_insert(self, text_widget, text, chunk_size=65536):
+        """Replace the contents of a read-only Text widget in chunks
+        
+        Args:
+            text_widget: Text widget to fill; left disabled afterwards
+            text (str): New contents
+            chunk_size (int): Characters passed to Tcl per insert
+        """
+        if len(text) <= chunk_size:
+            self._replace_text(text_widget, text)
+            return
+        
+        text_widget.config(state=tk.NORMAL)
+        text_widget.delete(1.0, tk.END)
+        for start in range(0, len(text), chunk_size):
+            text_widget.insert(tk.END, text[start:start + chunk_size])
+            text_widget.update_idletasks()
+        text_widget.config(state=tk.DISABLED)
+
+    def _replace_text(self, text_widget, text):
+        """Replace the contents of a read-only Text widget in one Tk call
+        
+        Args:
+            text_widget: Text widget to fill; left disabled afterwards
+            text (str): New contents
+        """
+        text_widget.configure(state=tk.NORMAL)
+        text_widget.replace("1.0", tk.END, text)
+        text_widget.configure(state=tk.DISABLED)
 
 # REMOVE the old backup_to_cloud method if it exists, and replace any references to it with comprehensive_backup_with_json
 
@@ -2084,60 +2581,116 @@ class SettingsPanel:
         except Exception as e:
             messagebox.showerror("Error", f"Error showing cloud settings: {str(e)}")
 
+    def _get_cloud(self):
+        """Get the shared cloud storage service, connecting on first use
+        
+        Connected services are kept in _CLOUD_CLIENTS keyed by bucket and
+        credentials path, so a changed configuration gets a new client.
+        Safe to call from worker threads.
+        
+        Returns:
+            CloudStorageService or None: Connected service, or None if the
+            connection could not be established
+        """
+        key = (config.CLOUD_BUCKET_NAME, config.CLOUD_CREDENTIALS_PATH)
+        with _CLOUD_CLIENTS_LOCK:
+            cloud_storage = _CLOUD_CLIENTS.get(key)
+            if cloud_storage is None or not cloud_storage.is_connected():
+                cloud_storage = CloudStorageService(*key)
+                if not cloud_storage.is_connected():
+                    _CLOUD_CLIENTS.pop(key, None)
+                    return None
+                _CLOUD_CLIENTS[key] = cloud_storage
+            return cloud_storage
+
+    def _cached_list(self, cloud_storage, prefix=None, ttl=30):
+        """List cloud files, reusing a listing of the same prefix for ttl seconds
+        
+        Args:
+            cloud_storage: Connected CloudStorageService
+            prefix (str, optional): Prefix to list
+            ttl (float): Seconds a listing stays valid
+            
+        Returns:
+            list: Cloud file names
+        """
+        timestamp, files = self._list_cache.get(prefix, (0, None))
+        if files is not None and time.monotonic() - timestamp < ttl:
+            return files
+        
+        files = cloud_storage.list_files(prefix)
+        self._list_cache[prefix] = (time.monotonic(), files)
+        return files
+
+    def _reset_cloud(self):
+        """Drop the shared cloud storage service so the next call reconnects"""
+        key = (config.CLOUD_BUCKET_NAME, config.CLOUD_CREDENTIALS_PATH)
+        with _CLOUD_CLIENTS_LOCK:
+            _CLOUD_CLIENTS.pop(key, None)
+
     def test_cloud_connection(self):
-        """Test the cloud storage connection"""
-        try:
-            from cloud_storage import CloudStorageService
-            
-            # Create a test connection
-            cloud_storage = CloudStorageService(
-                config.CLOUD_BUCKET_NAME,
-                config.CLOUD_CREDENTIALS_PATH
-            )
-            
-            if cloud_storage.is_connected():
-                # Test by listing files
-                files = cloud_storage.list_files()
-                messagebox.showinfo("Connection Test", 
-                                  f"✅ Connection successful!\n\n"
-                                  f"Bucket: {config.CLOUD_BUCKET_NAME}\n"
-                                  f"Files found: {len(files)}")
-            else:
-                messagebox.showerror("Connection Test", 
-                                   "❌ Connection failed!\n\n"
-                                   "Please check:\n"
-                                   "• Credentials file exists\n"
-                                   "• Bucket name is correct\n"
-                                   "• Internet connectivity\n"
-                                   "• Service account permissions")
-        except Exception as e:
-            messagebox.showerror("Connection Test", f"❌ Connection error:\n\n{str(e)}")
+        """Test the cloud storage connection in a background thread"""
+        def _worker():
+            try:
+                cloud_storage = self._get_cloud()
+                
+                if cloud_storage:
+                    # Test by listing a bounded page of this site's files, not the whole bucket
+                    clean_agency = (config.CURRENT_AGENCY or "Unknown_Agency").replace(' ', '_').replace('/', '_')
+                    clean_site = (config.CURRENT_SITE or "Unknown_Site").replace(' ', '_').replace('/', '_')
+                    prefix = f"{clean_agency}/{clean_site}/"
+                    files = cloud_storage.list_files(prefix, max_results=_CONNECTION_TEST_MAX_FILES)
+                    found = (f"{len(files)}+" if len(files) >= _CONNECTION_TEST_MAX_FILES
+                             else str(len(files)))
+                    self.parent.after(0, lambda: messagebox.showinfo("Connection Test", 
+                                      f"✅ Connection successful!\n\n"
+                                      f"Bucket: {config.CLOUD_BUCKET_NAME}\n"
+                                      f"Files found in {prefix}: {found}"))
+                else:
+                    self.parent.after(0, lambda: messagebox.showerror("Connection Test", 
+                                       "❌ Connection failed!\n\n"
+                                       "Please check:\n"
+                                       "• Credentials file exists\n"
+                                       "• Bucket name is correct\n"
+                                       "• Internet connectivity\n"
+                                       "• Service account permissions"))
+            except Exception as e:
+                self._reset_cloud()
+                error_msg = str(e)
+                self.parent.after(0, lambda: messagebox.showerror("Connection Test", f"❌ Connection error:\n\n{error_msg}"))
+        
+        threading.Thread(target=_worker, daemon=True).start()
 
     def view_cloud_files(self):
-        """Show a list of files in cloud storage"""
+        """Show a list of files in cloud storage - files are listed in a background thread"""
+        # Get current context for filtering
+        agency_name = config.CURRENT_AGENCY or "Unknown_Agency"
+        site_name = config.CURRENT_SITE or "Unknown_Site"
+        clean_agency = agency_name.replace(' ', '_').replace('/', '_')
+        clean_site = site_name.replace(' ', '_').replace('/', '_')
+        prefix = f"{clean_agency}/{clean_site}/"
+        
+        def _worker():
+            try:
+                cloud_storage = self._get_cloud()
+                
+                if not cloud_storage:
+                    self.parent.after(0, messagebox.showerror, "Error", "Not connected to cloud storage")
+                    return
+                
+                # List files
+                files = self._cached_list(cloud_storage, prefix)
+                self.parent.after(0, self._show_cloud_files_window, files, prefix, agency_name, site_name)
+                
+            except Exception as e:
+                self._reset_cloud()
+                self.parent.after(0, messagebox.showerror, "Error", f"Error viewing cloud files: {str(e)}")
+        
+        threading.Thread(target=_worker, daemon=True).start()
+
+    def _show_cloud_files_window(self, files, prefix, agency_name, site_name):
+        """Display listed cloud files - runs on the Tk thread"""
         try:
-            from cloud_storage import CloudStorageService
-            
-            # Create connection
-            cloud_storage = CloudStorageService(
-                config.CLOUD_BUCKET_NAME,
-                config.CLOUD_CREDENTIALS_PATH
-            )
-            
-            if not cloud_storage.is_connected():
-                messagebox.showerror("Error", "Not connected to cloud storage")
-                return
-            
-            # Get current context for filtering
-            agency_name = config.CURRENT_AGENCY or "Unknown_Agency"
-            site_name = config.CURRENT_SITE or "Unknown_Site"
-            clean_agency = agency_name.replace(' ', '_').replace('/', '_')
-            clean_site = site_name.replace(' ', '_').replace('/', '_')
-            prefix = f"{clean_agency}/{clean_site}/"
-            
-            # List files
-            files = cloud_storage.list_files(prefix)
-            
             # Create files window
             files_window = tk.Toplevel(self.parent)
             files_window.title(f"Cloud Files - {agency_name}/{site_name}")
@@ -2151,12 +2704,19 @@ class SettingsPanel:
             scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=listbox.yview)
             listbox.configure(yscrollcommand=scrollbar.set)
             
-            # Add files to listbox
+            # Add files to listbox - one insert call per batch instead of per file
             if files:
-                for file in sorted(files):
-                    # Show only filename, not full path
-                    display_name = file.replace(prefix, "")
-                    listbox.insert(tk.END, display_name)
+                # GCS lists object names in lexicographic order already; only
+                # sort if the backend ever hands back something unordered
+                if any(a > b for a, b in zip(files, files[1:])):
+                    files = sorted(files)
+                # Show only filename, not full path
+                display_names = [file.removeprefix(prefix) for file in files]
+                batch_size = 5000
+                for start in range(0, len(display_names), batch_size):
+                    listbox.insert(tk.END, *display_names[start:start + batch_size])
+                    if len(display_names) > batch_size:
+                        files_window.update_idletasks()
             else:
                 listbox.insert(tk.END, "No files found for this agency/site")
             
@@ -2178,11 +2738,17 @@ class SettingsPanel:
             messagebox.showerror("Error", f"Error viewing cloud files: {str(e)}")
 
     def find_data_manager(self):
+        """Find data manager from the application, reusing the last one found"""
+        if self._cached_data_manager is None:
+            self._cached_data_manager = self._search_data_manager()
+        return self._cached_data_manager
+
+    def _search_data_manager(self):
         """Find data manager from the application with enhanced search"""
         
         # Method 0: Check if we have a direct reference (set by main app)
         if hasattr(self, 'app_data_manager') and self.app_data_manager:
-            print("✅ Found data_manager from direct reference")
+            self.logger.debug("Found data_manager from direct reference")
             return self.app_data_manager
         
         # Method 1: Try to traverse widget hierarchy to find app instance
@@ -2194,79 +2760,90 @@ class SettingsPanel:
             attempts += 1
             
             # Check if this widget has data_manager
-            if hasattr(widget, 'data_manager'):
-                print(f"✅ Found data_manager at widget level {attempts}")
-                return widget.data_manager
-            
-            # Check if this widget is the main app (TharuniApp)
-            if hasattr(widget, '__class__') and 'App' in widget.__class__.__name__:
-                if hasattr(widget, 'data_manager'):
-                    print(f"✅ Found data_manager in main app: {widget.__class__.__name__}")
-                    return widget.data_manager
+            data_manager = getattr(widget, 'data_manager', _MISSING)
+            if data_manager is not _MISSING:
+                self.logger.debug("Found data_manager at widget level %d", attempts)
+                return data_manager
             
             # Try different parent references
-            if hasattr(widget, 'master'):
-                widget = widget.master
-            elif hasattr(widget, 'parent'):
-                widget = widget.parent
-            elif hasattr(widget, 'winfo_parent'):
-                try:
-                    parent_name = widget.winfo_parent()
-                    if parent_name:
-                        widget = widget._root().nametowidget(parent_name)
-                    else:
-                        break
-                except:
+            next_widget = getattr(widget, 'master', _MISSING)
+            if next_widget is _MISSING:
+                next_widget = getattr(widget, 'parent', _MISSING)
+            if next_widget is not _MISSING:
+                widget = next_widget
+                continue
+            
+            winfo_parent = getattr(widget, 'winfo_parent', None)
+            if winfo_parent is None:
+                break
+            try:
+                parent_name = winfo_parent()
+                if parent_name:
+                    widget = widget._root().nametowidget(parent_name)
+                else:
                     break
-            else:
+            except:
                 break
         
         # Method 2: Try to find the root window and search from there
         try:
-            root = self.parent
-            while hasattr(root, 'master') and root.master:
-                root = root.master
+            # One Tk call instead of walking .master; Method 3 still covers
+            # the Tk root when the panel lives in a separate Toplevel
+            try:
+                root = self.parent.winfo_toplevel()
+            except Exception:
+                root = self.parent
             
             # Check if root has data_manager
-            if hasattr(root, 'data_manager'):
-                print("✅ Found data_manager in root window")
-                return root.data_manager
+            data_manager = getattr(root, 'data_manager', _MISSING)
+            if data_manager is not _MISSING:
+                self.logger.debug("Found data_manager in root window")
+                return data_manager
             
-            # Search all children of root for data_manager
+            # Search all children of root for data_manager, breadth first
             def find_in_children(widget):
-                if hasattr(widget, 'data_manager'):
-                    return widget.data_manager
-                
-                # Check all children
+                queue = deque([widget])
                 try:
-                    for child in widget.winfo_children():
-                        result = find_in_children(child)
-                        if result:
-                            return result
-                except:
+                    while queue:
+                        widget = queue.popleft()
+                        data_manager = getattr(widget, 'data_manager', _MISSING)
+                        if data_manager is not _MISSING and data_manager:
+                            return data_manager
+                        
+                        # Queue all children; Toplevel windows carry app state,
+                        # so check them before the plain Frames/Labels still queued
+                        winfo_children = getattr(widget, 'winfo_children', None)
+                        if winfo_children is not None:
+                            for child in winfo_children():
+                                if isinstance(child, tk.Toplevel):
+                                    queue.appendleft(child)
+                                else:
+                                    queue.append(child)
+                except Exception:
                     pass
                 return None
             
             result = find_in_children(root)
             if result:
-                print("✅ Found data_manager in widget children")
+                self.logger.debug("Found data_manager in widget children")
                 return result
             
         except Exception as e:
-            print(f"Error in enhanced data manager search: {e}")
+            self.logger.error("Error in enhanced data manager search: %s", e)
         
         # Method 3: Try global references or app registry (if available)
         try:
-            import tkinter as tk
             root_windows = tk._default_root
             if root_windows and hasattr(root_windows, 'data_manager'):
-                print("✅ Found data_manager in default root")
+                self.logger.debug("Found data_manager in default root")
                 return root_windows.data_manager
         except:
             pass
         
-        print("❌ Could not find data_manager anywhere")
-        print("Available attributes in self:", [attr for attr in dir(self) if 'data' in attr.lower()])
+        self.logger.warning("Could not find data_manager anywhere")
+        if self._debug_data_manager and self.logger.isEnabledFor(logging.DEBUG):
+            # Instance attributes only; dir() would sort every class and MRO member
+            self.logger.debug("Available attributes in self: %s", [attr for attr in vars(self) if 'data' in attr.lower()])
         return None
 
 
@@ -2277,12 +2854,9 @@ class SettingsPanel:
         """Format size in bytes to human readable format"""
         if size_bytes < 1024:
             return f"{size_bytes} B"
-        elif size_bytes < 1024 * 1024:
-            return f"{size_bytes / 1024:.1f} KB"
-        elif size_bytes < 1024 * 1024 * 1024:
-            return f"{size_bytes / (1024 * 1024):.1f} MB"
-        else:
-            return f"{size_bytes / (1024 * 1024 * 1024):.1f} GB"
+        # Each unit is 2**10 of the previous one, so the bit length picks it
+        index = min((int(size_bytes).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+        return f"{size_bytes / (1 << (index * 10)):.1f} {_SIZE_UNITS[index]}"
 
 
 # Add these methods to your existing settings_panel.py class
@@ -2296,10 +2870,6 @@ class SettingsPanel:
             results (dict): Backup results from comprehensive backup
         """
         try:
-            import datetime  # Add missing import
-            import tkinter as tk
-            from tkinter import ttk
-            
             # Create results window
             results_window = tk.Toplevel(self.parent)
             results_window.title("Backup Results")
@@ -2324,8 +2894,13 @@ class SettingsPanel:
             scrollbar = ttk.Scrollbar(results_frame, orient=tk.VERTICAL, command=text_widget.yview)
             text_widget.configure(yscrollcommand=scrollbar.set)
             
-            # Format results text
-            results_text = f"""BACKUP COMPLETED SUCCESSFULLY
+            # Format results text - collect the pieces and join them once
+            if results.get('reports_uploaded', 0) > 0:
+                reports_status = "✓ Today's reports backed up"
+            else:
+                reports_status = "ℹ No daily reports found for today"
+            
+            parts = [f"""BACKUP COMPLETED SUCCESSFULLY
     {'=' * 50}
 
     📊 RECORDS & IMAGES:
@@ -2334,28 +2909,30 @@ class SettingsPanel:
 
     📁 DAILY REPORTS:
     Reports Uploaded: {results.get('reports_uploaded', 0)}/{results.get('total_reports', 0)}
-    Status: {'✓ Today\'s reports backed up' if results.get('reports_uploaded', 0) > 0 else 'ℹ No daily reports found for today'}
+    Status: {reports_status}
 
     🔄 INCREMENTAL BACKUP:
     Only new and changed files were uploaded
     Unchanged files were skipped for efficiency
 
     ⏰ BACKUP TIME:
-    {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+    {_DateTime.now().strftime(_TS_FMT)}
 
     CLOUD STRUCTURE:
     Records: Agency/Site/Ticket/timestamp.json
     Images: Agency/Site/Ticket/images/
     Reports: daily_reports/YYYY-MM-DD/
-    """
+    """]
 
             # Add errors if any
-            if results.get('errors'):
-                results_text += f"\n⚠️ WARNINGS/ERRORS:\n"
-                for i, error in enumerate(results.get('errors', []), 1):
-                    results_text += f"   {i}. {error}\n"
+            errors = results.get('errors')
+            if errors:
+                parts.append("\n⚠️ WARNINGS/ERRORS:\n")
+                for i, error in enumerate(errors, 1):
+                    parts.append(f"   {i}. {error}\n")
             
-            results_text += f"\n{'=' * 50}\n✅ Backup completed successfully!"
+            parts.append(f"\n{'=' * 50}\n✅ Backup completed successfully!")
+            results_text = "".join(parts)
             
             # Insert text
             text_widget.insert(tk.END, results_text)
@@ -2390,48 +2967,28 @@ class SettingsPanel:
             text_widget: Text widget to update
         """
         try:
-            import datetime  # Add missing import
-            
-            # Re-enable text widget for updating
-            text_widget.config(state=tk.NORMAL)
-            text_widget.delete(1.0, tk.END)
+            status_text = ""
             
             # Get updated summary
             data_manager = self.find_data_manager()
             if data_manager:
-                if hasattr(data_manager, 'get_enhanced_cloud_upload_summary'):
-                    summary = data_manager.get_enhanced_cloud_upload_summary()
-                else:
-                    summary = data_manager.get_cloud_upload_summary()
+                get_enh = getattr(data_manager, 'get_enhanced_cloud_upload_summary', None)
+                summary = get_enh() if get_enh is not None else data_manager.get_cloud_upload_summary()
                 
                 # Update the display with refreshed data
-                status_text = f"""ENHANCED CLOUD STORAGE STATUS (Refreshed)
-    {'=' * 60}
-
-    Context: {summary.get('context', 'Unknown')}
-    Total Files: {summary.get('total_files', 0)}
-    JSON Records: {summary.get('json_files', 0)}
-    Image Files: {summary.get('image_files', 0)}
-    Daily Reports: {summary.get('daily_report_files', 0)}
-    Total Size: {summary.get('total_size', 'Unknown')}
-
-    Last Updated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-    Status: Refreshed successfully ✓
-    """
-                text_widget.insert(tk.END, status_text)
+                status_text = _ENHANCED_REFRESH_TEMPLATE.substitute(
+                    ChainMap(summary, _SUMMARY_DEFAULTS),
+                    time=_DateTime.now().strftime(_TS_FMT))
             
-            # Make read-only again
-            text_widget.config(state=tk.DISABLED)
+            self._replace_text(text_widget, status_text)
             
         except Exception as e:
-            text_widget.insert(tk.END, f"Error refreshing: {str(e)}")
-            text_widget.config(state=tk.DISABLED)
+            self._replace_text(text_widget, f"Error refreshing: {str(e)}")
 
     def view_cloud_files_enhanced(self, cloud_storage, prefix):
         """Show enhanced view of cloud files with categorization"""
         try:
-            files = cloud_storage.list_files(prefix)
+            files = self._cached_list(cloud_storage, prefix)
             
             if not files:
                 messagebox.showinfo("Cloud Files", "No files found in cloud storage for this agency/site.")
@@ -2446,11 +3003,18 @@ class SettingsPanel:
             files_notebook = ttk.Notebook(files_window)
             files_notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
             
-            # Categorize files
-            json_files = [f for f in files if f.endswith('.json')]
-            image_files = [f for f in files if any(f.lower().endswith(ext) for ext in ['.jpg', '.jpeg', '.png', '.gif', '.bmp'])]
-            pdf_files = [f for f in files if f.lower().endswith('.pdf')]
-            other_files = [f for f in files if f not in json_files + image_files + pdf_files]
+            # Categorize files in a single pass
+            json_files, image_files, pdf_files, other_files = [], [], [], []
+            for f in files:
+                f_lower = f.lower()
+                if f_lower.endswith('.json'):
+                    json_files.append(f)
+                elif f_lower.endswith(_IMG_EXT):
+                    image_files.append(f)
+                elif f_lower.endswith('.pdf'):
+                    pdf_files.append(f)
+                else:
+                    other_files.append(f)
             
             # Create tabs for each category
             categories = [
@@ -2475,11 +3039,9 @@ class SettingsPanel:
                 scrollbar_cat = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=listbox.yview)
                 listbox.configure(yscrollcommand=scrollbar_cat.set)
                 
-                # Add files to listbox
-                for file in sorted(category_files):
-                    # Show only filename, not full path
-                    display_name = file.replace(prefix, "")
-                    listbox.insert(tk.END, display_name)
+                # Add files to listbox in one call, showing only the part after the prefix
+                display_names = [file.removeprefix(prefix) for file in sorted(category_files)]
+                listbox.insert(tk.END, *display_names)
                 
                 # Pack widgets
                 listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
@@ -2501,20 +3063,11 @@ class SettingsPanel:
     def refresh_cloud_status(self, text_widget, data_manager):
         """Refresh the cloud status display with current information"""
         try:
-            # Re-enable text widget for updating
-            text_widget.config(state=tk.NORMAL)
-            text_widget.delete(1.0, tk.END)
-            
-            # Get updated cloud storage connection
-            from cloud_storage import CloudStorageService
-            cloud_storage = CloudStorageService(
-                config.CLOUD_BUCKET_NAME,
-                config.CLOUD_CREDENTIALS_PATH
-            )
-            
-            if not cloud_storage.is_connected():
-                text_widget.insert(tk.END, "❌ ERROR: Not connected to cloud storage\n\nPlease check:\n• Internet connection\n• Cloud credentials\n• Bucket permissions")
-                text_widget.config(state=tk.DISABLED)
+            # Get the shared cloud storage connection
+            cloud_storage = self._get_cloud()
+            
+            if not cloud_storage:
+                self._replace_text(text_widget, "❌ ERROR: Not connected to cloud storage\n\nPlease check:\n• Internet connection\n• Cloud credentials\n• Bucket permissions")
                 return
             
             # Get current context
@@ -2528,38 +3081,25 @@ class SettingsPanel:
             summary = cloud_storage.get_upload_summary(prefix)
             
             # Update the display
-            status_text = f"""CLOUD STORAGE STATUS (REFRESHED)
-{'=' * 50}
-
-🔄 Last Refreshed: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-📍 Context: {agency_name} - {site_name}
-📊 Total Files: {summary.get('total_files', 0)}
-├── JSON Records: {summary.get('json_files', 0)}
-├── Images: {summary.get('image_files', 0)}
-└── PDF Reports: {summary.get('pdf_files', 0)}
-
-💾 Storage Size: {summary.get('total_size', 'Unknown')}
-⏰ Last Upload: {summary.get('last_upload', 'Never')}
-
-✅ Cloud connection is working properly!
-
-🔄 Auto-refresh available - click refresh button for latest data.
-"""
-                            
-            text_widget.insert(tk.END, status_text)
+            status_text = _CLOUD_REFRESH_TEMPLATE.substitute(
+                ChainMap(summary, _SUMMARY_DEFAULTS),
+                time=_DateTime.now().strftime(_TS_FMT),
+                agency_name=agency_name,
+                site_name=site_name)
             
-            # Make read-only again
-            text_widget.config(state=tk.DISABLED)
+            self._replace_text(text_widget, status_text)
             
         except Exception as e:
+            self._reset_cloud()
             error_text = f"❌ ERROR REFRESHING STATUS\n\nError details:\n{str(e)}\n\nTroubleshooting:\n• Check internet connection\n• Verify cloud credentials\n• Ensure bucket exists and is accessible"
-            text_widget.insert(tk.END, error_text)
-            text_widget.config(state=tk.DISABLED)
+            self._replace_text(text_widget, error_text)
 
             
     def create_camera_settings(self, parent):
         """Create camera configuration settings with RTSP support and scrollable frame"""
+        colors = config.COLORS
+        btn_text = colors["button_text"]
+        
         # Create main container frame
         main_container = ttk.Frame(parent)
         main_container.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
@@ -2573,10 +3113,10 @@ class SettingsPanel:
         scrollbar = ttk.Scrollbar(main_container, orient="vertical", command=canvas.yview)
         scrollable_frame = ttk.Frame(canvas)
         
-        # Configure scrolling
+        # Configure scrolling (debounced, see _schedule_scrollregion_update)
         scrollable_frame.bind(
             "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+            lambda e: self._schedule_scrollregion_update(canvas)
         )
         
         # Create window in canvas
@@ -2587,19 +3127,9 @@ class SettingsPanel:
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
         
-        # Bind mousewheel to canvas for scroll functionality
-        def _on_mousewheel(event):
-            canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        
-        def _bind_mousewheel(event):
-            canvas.bind_all("<MouseWheel>", _on_mousewheel)
-        
-        def _unbind_mousewheel(event):
-            canvas.unbind_all("<MouseWheel>")
-        
         # Bind mouse wheel events
-        canvas.bind('<Enter>', _bind_mousewheel)
-        canvas.bind('<Leave>', _unbind_mousewheel)
+        canvas.bind('<Enter>', self._bind_mousewheel)
+        canvas.bind('<Leave>', self._unbind_mousewheel)
         
         # Now create the camera settings content in the scrollable frame
         # Camera settings frame (now inside scrollable_frame instead of parent)
@@ -2625,26 +3155,26 @@ class SettingsPanel:
         btn_frame.pack(fill=tk.X, pady=10)
         
         # Apply button
-        apply_btn = HoverButton(btn_frame, text="Apply Settings", bg=config.COLORS["primary"], 
-                            fg=config.COLORS["button_text"], padx=10, pady=3,
+        apply_btn = HoverButton(btn_frame, text="Apply Settings", bg=colors["primary"], 
+                            fg=btn_text, padx=10, pady=3,
                             command=self.apply_camera_settings)
         apply_btn.pack(side=tk.LEFT, padx=5)
         
         # Save settings button
-        save_cam_btn = HoverButton(btn_frame, text="Save Settings", bg=config.COLORS["secondary"], 
-                                fg=config.COLORS["button_text"], padx=10, pady=3,
+        save_cam_btn = HoverButton(btn_frame, text="Save Settings", bg=colors["secondary"], 
+                                fg=btn_text, padx=10, pady=3,
                                 command=self.save_camera_settings)
         save_cam_btn.pack(side=tk.LEFT, padx=5)
         
         # Test connection button
-        test_btn = HoverButton(btn_frame, text="Test Connections", bg=config.COLORS["button_alt"], 
-                            fg=config.COLORS["button_text"], padx=10, pady=3,
+        test_btn = HoverButton(btn_frame, text="Test Connections", bg=colors["button_alt"], 
+                            fg=btn_text, padx=10, pady=3,
                             command=self.test_camera_connections)
         test_btn.pack(side=tk.LEFT, padx=5)
         
         # Status message (also in scrollable frame)
         ttk.Label(cam_frame, textvariable=self.cam_status_var, 
-                foreground=config.COLORS["primary"]).pack(pady=5)
+                foreground=colors["primary"]).pack(pady=5)
         
         # Update scroll region after all widgets are added
         scrollable_frame.update_idletasks()
@@ -2658,59 +3188,17 @@ class SettingsPanel:
             parent: Parent widget
             position: "front" or "back"
         """
-        # Create variables for this camera
-        if position == "front":
-            self.front_camera_type_var = tk.StringVar(value="USB")
-            self.front_usb_index_var = tk.IntVar(value=0)
-            self.front_rtsp_username_var = tk.StringVar()
-            self.front_rtsp_password_var = tk.StringVar()
-            self.front_rtsp_ip_var = tk.StringVar()
-            self.front_rtsp_port_var = tk.StringVar(value="554")
-            self.front_rtsp_endpoint_var = tk.StringVar(value="/stream1")
-            self.front_http_username_var = tk.StringVar()
-            self.front_http_password_var = tk.StringVar()
-            self.front_http_ip_var = tk.StringVar()
-            self.front_http_port_var = tk.StringVar(value="80")
-            self.front_http_endpoint_var = tk.StringVar(value="/mjpeg")
-            
-            camera_type_var = self.front_camera_type_var
-            usb_index_var = self.front_usb_index_var
-            rtsp_username_var = self.front_rtsp_username_var
-            rtsp_password_var = self.front_rtsp_password_var
-            rtsp_ip_var = self.front_rtsp_ip_var
-            rtsp_port_var = self.front_rtsp_port_var
-            rtsp_endpoint_var = self.front_rtsp_endpoint_var
-            http_username_var = self.front_http_username_var
-            http_password_var = self.front_http_password_var
-            http_ip_var = self.front_http_ip_var
-            http_port_var = self.front_http_port_var
-            http_endpoint_var = self.front_http_endpoint_var
-        else:
-            self.back_camera_type_var = tk.StringVar(value="USB")
-            self.back_usb_index_var = tk.IntVar(value=1)
-            self.back_rtsp_username_var = tk.StringVar()
-            self.back_rtsp_password_var = tk.StringVar()
-            self.back_rtsp_ip_var = tk.StringVar()
-            self.back_rtsp_port_var = tk.StringVar(value="554")
-            self.back_rtsp_endpoint_var = tk.StringVar(value="/stream1")
-            self.back_http_username_var = tk.StringVar()
-            self.back_http_password_var = tk.StringVar()
-            self.back_http_ip_var = tk.StringVar()
-            self.back_http_port_var = tk.StringVar(value="80")
-            self.back_http_endpoint_var = tk.StringVar(value="/mjpeg")
-            
-            camera_type_var = self.back_camera_type_var
-            usb_index_var = self.back_usb_index_var
-            rtsp_username_var = self.back_rtsp_username_var
-            rtsp_password_var = self.back_rtsp_password_var
-            rtsp_ip_var = self.back_rtsp_ip_var
-            rtsp_port_var = self.back_rtsp_port_var
-            rtsp_endpoint_var = self.back_rtsp_endpoint_var
-            http_username_var = self.back_http_username_var
-            http_password_var = self.back_http_password_var
-            http_ip_var = self.back_http_ip_var
-            http_port_var = self.back_http_port_var
-            http_endpoint_var = self.back_http_endpoint_var
+        # Create variables for this camera (self.<position>_<name>)
+        cam_vars = {}
+        for name, var_class, default in _CAM_VAR_SPECS:
+            if name == "usb_index_var":
+                default = _CAM_USB_DEFAULT_INDEX[position]
+            var = var_class(value=default)
+            setattr(self, f"{position}_{name}", var)
+            cam_vars[name] = var
+        
+        camera_type_var = cam_vars["camera_type_var"]
+        usb_index_var = cam_vars["usb_index_var"]
         
         # Camera type selection
         type_frame = ttk.LabelFrame(parent, text="Camera Type")
@@ -2727,165 +3215,171 @@ class SettingsPanel:
         usb_frame.pack(fill=tk.X, padx=5, pady=5)
         
         ttk.Label(usb_frame, text="Camera Index:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=2)
-        ttk.Combobox(usb_frame, textvariable=usb_index_var, values=[0, 1, 2, 3], 
-                    state="readonly", width=10).grid(row=0, column=1, sticky=tk.W, padx=5, pady=2)
+        usb_index_combo = ttk.Combobox(usb_frame, textvariable=usb_index_var, values=[0, 1, 2, 3], 
+                    state="readonly", width=10)
+        usb_index_combo.grid(row=0, column=1, sticky=tk.W, padx=5, pady=2)
+        self._camera_inputs[(position, "USB")] = [(usb_index_combo, "readonly")]
         
         # Store reference to USB frame for enabling/disabling
-        if position == "front":
-            self.front_usb_frame = usb_frame
-        else:
-            self.back_usb_frame = usb_frame
-        
-        # RTSP Camera Settings
-        rtsp_frame = ttk.LabelFrame(parent, text="RTSP Camera Settings")
-        rtsp_frame.pack(fill=tk.X, padx=5, pady=5)
-        
-        # Configure grid weights
-        rtsp_frame.columnconfigure(1, weight=1)
-        
-        # RTSP settings fields
-        ttk.Label(rtsp_frame, text="Username:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(rtsp_frame, textvariable=rtsp_username_var, width=20).grid(row=0, column=1, sticky=tk.EW, padx=5, pady=2)
-        
-        ttk.Label(rtsp_frame, text="Password:").grid(row=1, column=0, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(rtsp_frame, textvariable=rtsp_password_var, show="*", width=20).grid(row=1, column=1, sticky=tk.EW, padx=5, pady=2)
-        
-        ttk.Label(rtsp_frame, text="IP Address:").grid(row=2, column=0, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(rtsp_frame, textvariable=rtsp_ip_var, width=20).grid(row=2, column=1, sticky=tk.EW, padx=5, pady=2)
-        
-        ttk.Label(rtsp_frame, text="Port:").grid(row=3, column=0, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(rtsp_frame, textvariable=rtsp_port_var, width=20).grid(row=3, column=1, sticky=tk.EW, padx=5, pady=2)
-        
-        ttk.Label(rtsp_frame, text="Endpoint:").grid(row=4, column=0, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(rtsp_frame, textvariable=rtsp_endpoint_var, width=20).grid(row=4, column=1, sticky=tk.EW, padx=5, pady=2)
+        setattr(self, f"{position}_usb_frame", usb_frame)
+        
+        # The RTSP and HTTP frames are built the first time their type is
+        # selected, see on_camera_type_change(); their preview vars are needed
+        # earlier by update_rtsp_preview() and update_http_preview()
+        for kind in ("rtsp", "http"):
+            preview_var = tk.StringVar()
+            setattr(self, f"{position}_{kind}_preview_var", preview_var)
+            setattr(self, f"{position}_{kind}_frame", None)
+            self._url_var_map[(position, kind)] = _UrlPreviewVars(
+                *(cam_vars[f"{kind}_{field}_var"] for field in _URL_FIELDS),
+                preview_var, camera_type_var)
+        self._camera_frame_builders[position] = {
+            "RTSP": functools.partial(self._build_ip_camera_frame, parent, position, "rtsp"),
+            "HTTP": functools.partial(self._build_ip_camera_frame, parent, position, "http"),
+        }
         
-        # RTSP URL Preview
-        ttk.Label(rtsp_frame, text="Preview URL:").grid(row=5, column=0, sticky=tk.W, padx=5, pady=2)
+        # Initialize the frame states
+        self.on_camera_type_change(position)
+
+    def _build_ip_camera_frame(self, parent, position, kind):
+        """Build the RTSP or HTTP settings frame of a camera tab
         
-        if position == "front":
-            self.front_rtsp_preview_var = tk.StringVar()
-            rtsp_preview_label = ttk.Label(rtsp_frame, textvariable=self.front_rtsp_preview_var, 
-                                    foreground="blue", font=("Segoe UI", 8))
-            self.front_rtsp_preview_label = rtsp_preview_label
-            # Bind events to update preview
-            for var in [rtsp_username_var, rtsp_password_var, rtsp_ip_var, rtsp_port_var, rtsp_endpoint_var]:
-                var.trace_add("write", lambda *args: self.update_rtsp_preview("front"))
-        else:
-            self.back_rtsp_preview_var = tk.StringVar()
-            rtsp_preview_label = ttk.Label(rtsp_frame, textvariable=self.back_rtsp_preview_var, 
-                                    foreground="blue", font=("Segoe UI", 8))
-            self.back_rtsp_preview_label = rtsp_preview_label
-            # Bind events to update preview
-            for var in [rtsp_username_var, rtsp_password_var, rtsp_ip_var, rtsp_port_var, rtsp_endpoint_var]:
-                var.trace_add("write", lambda *args: self.update_rtsp_preview("back"))
-        
-        rtsp_preview_label.grid(row=5, column=1, sticky=tk.EW, padx=5, pady=2)
-        
-        # Store reference to RTSP frame for enabling/disabling
-        if position == "front":
-            self.front_rtsp_frame = rtsp_frame
-        else:
-            self.back_rtsp_frame = rtsp_frame
+        Args:
+            parent: Camera tab frame
+            position: "front" or "back"
+            kind: "rtsp" or "http"
+        """
+        title, preview_color = _IP_CAMERA_FRAMES[kind]
+        url_vars = self._url_var_map[(position, kind)]
+        field_vars = url_vars[:len(_URL_FIELDS)]
         
-        # HTTP Camera Settings
-        http_frame = ttk.LabelFrame(parent, text="HTTP Camera Settings")
-        http_frame.pack(fill=tk.X, padx=5, pady=5)
+        # Keep the USB, RTSP, HTTP order whichever frame is built first
+        after = getattr(self, f"{position}_rtsp_frame") if kind == "http" else None
+        frame = ttk.LabelFrame(parent, text=title)
+        frame.pack(fill=tk.X, padx=5, pady=5,
+                   after=after or getattr(self, f"{position}_usb_frame"))
         
         # Configure grid weights
-        http_frame.columnconfigure(1, weight=1)
-        
-        # HTTP settings fields
-        ttk.Label(http_frame, text="Username:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(http_frame, textvariable=http_username_var, width=20).grid(row=0, column=1, sticky=tk.EW, padx=5, pady=2)
-        
-        ttk.Label(http_frame, text="Password:").grid(row=1, column=0, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(http_frame, textvariable=http_password_var, show="*", width=20).grid(row=1, column=1, sticky=tk.EW, padx=5, pady=2)
-        
-        ttk.Label(http_frame, text="IP Address:").grid(row=2, column=0, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(http_frame, textvariable=http_ip_var, width=20).grid(row=2, column=1, sticky=tk.EW, padx=5, pady=2)
-        
-        ttk.Label(http_frame, text="Port:").grid(row=3, column=0, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(http_frame, textvariable=http_port_var, width=20).grid(row=3, column=1, sticky=tk.EW, padx=5, pady=2)
+        frame.columnconfigure(1, weight=1)
+        
+        # Settings fields
+        inputs = self._camera_inputs[(position, kind.upper())] = []
+        for row, (label, var) in enumerate(zip(
+                ("Username:", "Password:", "IP Address:", "Port:", "Endpoint:"), field_vars)):
+            ttk.Label(frame, text=label).grid(row=row, column=0, sticky=tk.W, padx=5, pady=2)
+            entry = ttk.Entry(frame, textvariable=var, width=20)
+            if row == 1:
+                entry.configure(show="*")
+            entry.grid(row=row, column=1, sticky=tk.EW, padx=5, pady=2)
+            inputs.append((entry, "normal"))
+        
+        # URL Preview
+        ttk.Label(frame, text="Preview URL:").grid(row=5, column=0, sticky=tk.W, padx=5, pady=2)
+        preview_label = ttk.Label(frame, textvariable=url_vars.preview,
+                                  foreground=preview_color, font=("Segoe UI", 8))
+        preview_label.grid(row=5, column=1, sticky=tk.EW, padx=5, pady=2)
+        setattr(self, f"{position}_{kind}_preview_label", preview_label)
+        
+        # Bind events to update preview
+        for var in field_vars:
+            var.trace_add("write", lambda *args: self._schedule_preview_update(kind, position))
+        
+        # Store reference to the frame for enabling/disabling
+        setattr(self, f"{position}_{kind}_frame", frame)
+
+    def _schedule_preview_update(self, kind, position):
+        """Rebuild a URL preview once a burst of field writes settles
+        
+        Each write restarts a short timer, so typing into the connection
+        fields or loading all of them at once triggers a single rebuild.
         
-        ttk.Label(http_frame, text="Endpoint:").grid(row=4, column=0, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(http_frame, textvariable=http_endpoint_var, width=20).grid(row=4, column=1, sticky=tk.EW, padx=5, pady=2)
-        
-        # HTTP URL Preview
-        ttk.Label(http_frame, text="Preview URL:").grid(row=5, column=0, sticky=tk.W, padx=5, pady=2)
-        
-        if position == "front":
-            self.front_http_preview_var = tk.StringVar()
-            http_preview_label = ttk.Label(http_frame, textvariable=self.front_http_preview_var, 
-                                    foreground="green", font=("Segoe UI", 8))
-            self.front_http_preview_label = http_preview_label
-            # Bind events to update preview
-            for var in [http_username_var, http_password_var, http_ip_var, http_port_var, http_endpoint_var]:
-                var.trace_add("write", lambda *args: self.update_http_preview("front"))
-        else:
-            self.back_http_preview_var = tk.StringVar()
-            http_preview_label = ttk.Label(http_frame, textvariable=self.back_http_preview_var, 
-                                    foreground="green", font=("Segoe UI", 8))
-            self.back_http_preview_label = http_preview_label
-            # Bind events to update preview
-            for var in [http_username_var, http_password_var, http_ip_var, http_port_var, http_endpoint_var]:
-                var.trace_add("write", lambda *args: self.update_http_preview("back"))
-        
-        http_preview_label.grid(row=5, column=1, sticky=tk.EW, padx=5, pady=2)
-        
-        # Store reference to HTTP frame for enabling/disabling
-        if position == "front":
-            self.front_http_frame = http_frame
-        else:
-            self.back_http_frame = http_frame
-        
-        # Initialize the frame states
-        self.on_camera_type_change(position)
+        Args:
+            kind: "rtsp" or "http"
+            position: "front" or "back"
+        """
+        key = (kind, position)
+        pending = self._preview_after_ids.get(key)
+        if pending is not None:
+            self.parent.after_cancel(pending)
+        self._preview_after_ids[key] = self.parent.after(
+            _PREVIEW_DEBOUNCE_MS, self._run_preview_update, kind, position)
+
+    def _run_preview_update(self, kind, position):
+        """Run a preview rebuild queued by _schedule_preview_update"""
+        self._preview_after_ids.pop((kind, position), None)
+        self._update_url_preview(position, kind)
+
+    def _camera_tab_visible(self):
+        """Return True if the Cameras tab is the selected settings tab"""
+        if self._camera_tab is None:
+            return True
+        return self.settings_notebook.select() == str(self._camera_tab)
 
-    def update_http_preview(self, position):
-        """Update HTTP URL preview
+    def _on_settings_tab_changed(self, event=None):
+        """Bring URL previews skipped while the Cameras tab was hidden up to date"""
+        if not self._stale_previews or not self._camera_tab_visible():
+            return
+        stale, self._stale_previews = self._stale_previews, set()
+        for kind, position in stale:
+            self._update_url_preview(position, kind)
+
+    def _update_url_preview(self, position, kind):
+        """Update the RTSP or HTTP URL preview of a camera
         
         Args:
             position: "front" or "back"
+            kind: "rtsp" or "http"
         """
+        camera_type, scheme = _URL_PREVIEW_SCHEMES[kind]
+        
+        # Nobody can see the preview; rebuild it when the tab is selected
+        if not self._camera_tab_visible():
+            self._stale_previews.add((kind, position))
+            return
+        
         try:
-            if position == "front":
-                if self.front_camera_type_var.get() != "HTTP":
-                    self.front_http_preview_var.set("")
-                    return
-                    
-                username = self.front_http_username_var.get()
-                password = self.front_http_password_var.get()
-                ip = self.front_http_ip_var.get()
-                port = self.front_http_port_var.get()
-                endpoint = self.front_http_endpoint_var.get()
-                preview_var = self.front_http_preview_var
-            else:
-                if self.back_camera_type_var.get() != "HTTP":
-                    self.back_http_preview_var.set("")
-                    return
-                    
-                username = self.back_http_username_var.get()
-                password = self.back_http_password_var.get()
-                ip = self.back_http_ip_var.get()
-                port = self.back_http_port_var.get()
-                endpoint = self.back_http_endpoint_var.get()
-                preview_var = self.back_http_preview_var
+            url_vars = self._url_var_map.get((position, kind))
+            if url_vars is None:
+                return
+            preview_var = url_vars.preview
+            
+            if url_vars.camera_type.get() != camera_type:
+                preview_var.set("")
+                self._preview_keys.pop((kind, position), None)
+                return
+            
+            username = url_vars.username.get()
+            password = url_vars.password.get()
+            ip = url_vars.ip.get()
+            port = url_vars.port.get()
+            endpoint = url_vars.endpoint.get()
+            
+            # Nothing to redraw if the fields are the same as last time
+            key = (username, password, ip, port, endpoint)
+            if self._preview_keys.get((kind, position)) == key:
+                return
+            self._preview_keys[(kind, position)] = key
             
             if not ip:
                 preview_var.set("Please enter IP address")
                 return
             
             # Build preview URL
-            if username and password:
-                url = f"http://{username}:***@{ip}:{port}{endpoint}"
-            else:
-                url = f"http://{ip}:{port}{endpoint}"
+            auth = (username, ":***@") if username and password else ()
+            url = "".join((scheme, *auth, ip, ":", port, endpoint))
             
             preview_var.set(url)
             
         except Exception as e:
-            print(f"Error updating HTTP preview: {e}")
+            self.logger.error("Error updating %s preview: %s", camera_type, e)
 
+    def update_http_preview(self, position):
+        """Update HTTP URL preview
+        
+        Args:
+            position: "front" or "back"
+        """
+        self._update_url_preview(position, "http")
 
     def update_rtsp_preview(self, position):
         """Update RTSP URL preview
@@ -2893,83 +3387,68 @@ class SettingsPanel:
         Args:
             position: "front" or "back"
         """
-        try:
-            if position == "front":
-                if self.front_camera_type_var.get() != "RTSP":
-                    self.front_rtsp_preview_var.set("")
-                    return
-                    
-                username = self.front_rtsp_username_var.get()
-                password = self.front_rtsp_password_var.get()
-                ip = self.front_rtsp_ip_var.get()
-                port = self.front_rtsp_port_var.get()
-                endpoint = self.front_rtsp_endpoint_var.get()
-                preview_var = self.front_rtsp_preview_var
-            else:
-                if self.back_camera_type_var.get() != "RTSP":
-                    self.back_rtsp_preview_var.set("")
-                    return
-                    
-                username = self.back_rtsp_username_var.get()
-                password = self.back_rtsp_password_var.get()
-                ip = self.back_rtsp_ip_var.get()
-                port = self.back_rtsp_port_var.get()
-                endpoint = self.back_rtsp_endpoint_var.get()
-                preview_var = self.back_rtsp_preview_var
-            
-            if not ip:
-                preview_var.set("Please enter IP address")
-                return
-            
-            # Build preview URL
-            if username and password:
-                url = f"rtsp://{username}:***@{ip}:{port}{endpoint}"
-            else:
-                url = f"rtsp://{ip}:{port}{endpoint}"
-            
-            preview_var.set(url)
-            
-        except Exception as e:
-            print(f"Error updating RTSP preview: {e}")
+        self._update_url_preview(position, "rtsp")
 
 
     def test_camera_connections(self):
         """Test both camera connections with HTTP support"""
         try:
             import cv2
-            import threading
-            import urllib.request
+            import urllib3
+            
+            # Shared connection pool with separate connect and read limits, so
+            # an unreachable camera fails fast instead of waiting on the OS
+            if self._http_probe is None:
+                self._http_probe = urllib3.PoolManager(
+                    timeout=urllib3.Timeout(connect=2.0, read=3.0), retries=False)
+            http_probe = self._http_probe
+            
+            def set_status(message):
+                # Tk variables must only be touched from the Tk thread
+                self.parent.after(0, self.cam_status_var.set, message)
             
             def test_camera(position, camera_type, connection_info):
                 try:
                     if camera_type == "USB":
                         cap = cv2.VideoCapture(connection_info)
                     elif camera_type == "RTSP":
-                        cap = cv2.VideoCapture(connection_info)
-                        cap.set(cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, 5000)
+                        # Timeouts must be passed at open time; setting them on
+                        # an already opened capture does not bound the connect
+                        cap = cv2.VideoCapture(connection_info, cv2.CAP_FFMPEG,
+                                               [cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, 3000,
+                                                cv2.CAP_PROP_READ_TIMEOUT_MSEC, 3000])
                     else:  # HTTP
-                        # Test HTTP connection
-                        with urllib.request.urlopen(connection_info, timeout=5) as response:
-                            if response.getcode() == 200:
-                                self.cam_status_var.set(f"{position.title()} HTTP camera: Connection successful")
-                                return
+                        # Test HTTP connection; the stream body is never read
+                        response = http_probe.request("GET", connection_info, preload_content=False)
+                        try:
+                            if response.status == 200:
+                                set_status(f"{position.title()} HTTP camera: Connection successful")
                             else:
-                                self.cam_status_var.set(f"{position.title()} HTTP camera: HTTP {response.getcode()}")
-                                return
+                                set_status(f"{position.title()} HTTP camera: HTTP {response.status}")
+                        finally:
+                            # Close rather than release: an MJPEG body never ends,
+                            # so the socket cannot go back to the pool
+                            response.close()
+                        return
                     
                     if camera_type in ["USB", "RTSP"]:
                         if cap.isOpened():
-                            ret, frame = cap.read()
-                            cap.release()
+                            # Grab in the background and wait for a bounded time
+                            # instead of blocking on a single cap.read()
+                            probe = _CameraProbe(cap)
+                            probe.start()
+                            ret = probe.wait_for_frame(2.0)
+                            probe.stop()
                             if ret:
-                                self.cam_status_var.set(f"{position.title()} camera: Connection successful")
+                                set_status(f"{position.title()} camera: Connection successful")
                             else:
-                                self.cam_status_var.set(f"{position.title()} camera: Connected but no video")
+                                set_status(f"{position.title()} camera: Connected but no video")
                         else:
-                            self.cam_status_var.set(f"{position.title()} camera: Connection failed")
+                            cap.release()
+                            set_status(f"{position.title()} camera: Connection failed")
                             
                 except Exception as e:
-                    self.cam_status_var.set(f"{position.title()} camera error: {str(e)}")
+                    set_status(f"{position.title()} camera error: {str(e)}")
             
             # Test front camera
             if self.front_camera_type_var.get() == "USB":
@@ -3002,11 +3481,15 @@ class SettingsPanel:
             self.cam_status_var.set("Testing camera connections...")
             
             # Test cameras in separate threads
-            front_thread = threading.Thread(target=test_camera, args=("front", self.front_camera_type_var.get(), front_info))
-            back_thread = threading.Thread(target=test_camera, args=("back", self.back_camera_type_var.get(), back_info))
-            
-            front_thread.start()
-            back_thread.start()
+            # Drop probes from earlier clicks that have not started yet
+            for future in self._pending_probes:
+                future.cancel()
+            if self._probe_pool is None:
+                self._probe_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="cam-probe")
+            self._pending_probes = [
+                self._probe_pool.submit(test_camera, "front", self.front_camera_type_var.get(), front_info),
+                self._probe_pool.submit(test_camera, "back", self.back_camera_type_var.get(), back_info),
+            ]
             
         except Exception as e:
             self.cam_status_var.set(f"Test error: {str(e)}")
@@ -3018,50 +3501,18 @@ class SettingsPanel:
         Args:
             position: "front" or "back"
         """
-        if position == "front":
-            camera_type = self.front_camera_type_var.get()
-            usb_frame = self.front_usb_frame
-            rtsp_frame = self.front_rtsp_frame
-            http_frame = self.front_http_frame
-        else:
-            camera_type = self.back_camera_type_var.get()
-            usb_frame = self.back_usb_frame
-            rtsp_frame = self.back_rtsp_frame
-            http_frame = self.back_http_frame
-        
-        # Enable/disable frames based on camera type
-        if camera_type == "USB":
-            # Enable USB frame, disable RTSP and HTTP frames
-            for child in usb_frame.winfo_children():
-                child.configure(state="normal")
-            for child in rtsp_frame.winfo_children():
-                if isinstance(child, (ttk.Entry, ttk.Combobox)):
-                    child.configure(state="disabled")
-            for child in http_frame.winfo_children():
-                if isinstance(child, (ttk.Entry, ttk.Combobox)):
-                    child.configure(state="disabled")
-        elif camera_type == "RTSP":
-            # Enable RTSP frame, disable USB and HTTP frames
-            for child in rtsp_frame.winfo_children():
-                if isinstance(child, (ttk.Entry, ttk.Combobox)):
-                    child.configure(state="normal")
-            for child in usb_frame.winfo_children():
-                if isinstance(child, (ttk.Entry, ttk.Combobox)):
-                    child.configure(state="disabled")
-            for child in http_frame.winfo_children():
-                if isinstance(child, (ttk.Entry, ttk.Combobox)):
-                    child.configure(state="disabled")
-        else:  # HTTP
-            # Enable HTTP frame, disable USB and RTSP frames
-            for child in http_frame.winfo_children():
-                if isinstance(child, (ttk.Entry, ttk.Combobox)):
-                    child.configure(state="normal")
-            for child in usb_frame.winfo_children():
-                if isinstance(child, (ttk.Entry, ttk.Combobox)):
-                    child.configure(state="disabled")
-            for child in rtsp_frame.winfo_children():
-                if isinstance(child, (ttk.Entry, ttk.Combobox)):
-                    child.configure(state="disabled")
+        camera_type = getattr(self, f"{position}_camera_type_var").get()
+        
+        # Build the RTSP/HTTP frame the first time its type is selected
+        builder = self._camera_frame_builders.get(position, {}).pop(camera_type, None)
+        if builder is not None:
+            builder()
+        
+        # Enable the selected type's inputs and disable the others
+        for input_type in ("USB", "RTSP", "HTTP"):
+            selected = input_type == camera_type
+            for widget, enabled_state in self._camera_inputs.get((position, input_type), ()):
+                widget.configure(state=enabled_state if selected else "disabled")
         
         # Update previews
         self.update_rtsp_preview(position)
@@ -3107,6 +3558,7 @@ class SettingsPanel:
         self.users_tree.column("username", width=100)
         self.users_tree.column("name", width=150)
         self.users_tree.column("role", width=80)
+        self._configure_row_tags(self.users_tree)
             
             # Add scrollbar
         scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.users_tree.yview)
@@ -3209,6 +3661,14 @@ class SettingsPanel:
     
     def create_site_management(self, parent):
         """Create site management tab with 2x2 grid layout"""
+        colors = config.COLORS
+        btn_text = colors["button_text"]
+        # Add/Delete buttons share everything but text and command
+        make_add_button = functools.partial(HoverButton, text="Add", bg=colors["primary"],
+                                            fg=btn_text, padx=5, pady=2)
+        make_delete_button = functools.partial(HoverButton, text="Delete", bg=colors["error"],
+                                               fg=btn_text, padx=5, pady=2)
+        
         # Create main frame to hold all sections
         main_frame = ttk.Frame(parent, style="TFrame")
         main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -3219,212 +3679,88 @@ class SettingsPanel:
         main_frame.rowconfigure(0, weight=1)
         main_frame.rowconfigure(1, weight=1)
         
-        # ========== TOP LEFT: Site Names Section ==========
-        site_frame = ttk.LabelFrame(main_frame, text="Site Names")
-        site_frame.grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
-        
-        # Site list and entry
-        site_list_frame = ttk.Frame(site_frame)
-        site_list_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        
-        # Site listbox
-        columns = ("site",)
-        self.site_tree = ttk.Treeview(site_list_frame, columns=columns, show="headings", height=5)
-        self.site_tree.heading("site", text="Site Name")
-        self.site_tree.column("site", width=150)  # Reduced width
-        
-        # Add scrollbar
-        site_scrollbar = ttk.Scrollbar(site_list_frame, orient=tk.VERTICAL, command=self.site_tree.yview)
-        self.site_tree.configure(yscroll=site_scrollbar.set)
-        
-        # Pack widgets
-        site_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.site_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        
-        # Site controls
-        site_controls = ttk.Frame(site_frame)
-        site_controls.pack(fill=tk.X, padx=5, pady=5)
-        
-        # New site entry
-        ttk.Label(site_controls, text="New Site:").pack(side=tk.LEFT, padx=(0, 5))
-        ttk.Entry(site_controls, textvariable=self.site_name_var, width=15).pack(side=tk.LEFT, padx=5)
-        
-        # Add and Delete buttons
-        add_site_btn = HoverButton(site_controls,
-                                text="Add",
-                                bg=config.COLORS["primary"],
-                                fg=config.COLORS["button_text"],
-                                padx=5, pady=2,
-                                command=self.add_site)
-        add_site_btn.pack(side=tk.LEFT, padx=2)
-        
-        delete_site_btn = HoverButton(site_controls,
-                                    text="Delete",
-                                    bg=config.COLORS["error"],
-                                    fg=config.COLORS["button_text"],
-                                    padx=5, pady=2,
-                                    command=self.delete_site)
-        delete_site_btn.pack(side=tk.LEFT, padx=2)
-        
-        # ========== TOP RIGHT: Site Incharges Section ==========
-        incharge_frame = ttk.LabelFrame(main_frame, text="Site Incharges")
-        incharge_frame.grid(row=0, column=1, sticky="nsew", padx=5, pady=5)
-        
-        # Incharge list and entry
-        incharge_list_frame = ttk.Frame(incharge_frame)
-        incharge_list_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        
-        # Incharge listbox
-        columns = ("incharge",)
-        self.incharge_tree = ttk.Treeview(incharge_list_frame, columns=columns, show="headings", height=5)
-        self.incharge_tree.heading("incharge", text="Incharge Name")
-        self.incharge_tree.column("incharge", width=150)  # Reduced width
-        
-        # Add scrollbar
-        incharge_scrollbar = ttk.Scrollbar(incharge_list_frame, orient=tk.VERTICAL, command=self.incharge_tree.yview)
-        self.incharge_tree.configure(yscroll=incharge_scrollbar.set)
-        
-        # Pack widgets
-        incharge_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.incharge_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        
-        # Incharge controls
-        incharge_controls = ttk.Frame(incharge_frame)
-        incharge_controls.pack(fill=tk.X, padx=5, pady=5)
-        
-        # New incharge entry
-        ttk.Label(incharge_controls, text="New Incharge:").pack(side=tk.LEFT, padx=(0, 5))
-        ttk.Entry(incharge_controls, textvariable=self.incharge_name_var, width=15).pack(side=tk.LEFT, padx=5)
-        
-        # Add and Delete buttons
-        add_incharge_btn = HoverButton(incharge_controls,
-                                    text="Add",
-                                    bg=config.COLORS["primary"],
-                                    fg=config.COLORS["button_text"],
-                                    padx=5, pady=2,
-                                    command=self.add_incharge)
-        add_incharge_btn.pack(side=tk.LEFT, padx=2)
-        
-        delete_incharge_btn = HoverButton(incharge_controls,
-                                        text="Delete",
-                                        bg=config.COLORS["error"],
-                                        fg=config.COLORS["button_text"],
-                                        padx=5, pady=2,
-                                        command=self.delete_incharge)
-        delete_incharge_btn.pack(side=tk.LEFT, padx=2)
-        
-        # ========== BOTTOM LEFT: Transfer Parties Section ==========
-        tp_frame = ttk.LabelFrame(main_frame, text="Transfer Parties")
-        tp_frame.grid(row=1, column=0, sticky="nsew", padx=5, pady=5)
-        
-        # Transfer Party list and entry
-        tp_list_frame = ttk.Frame(tp_frame)
-        tp_list_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        
-        # Transfer Party listbox
-        columns = ("transfer_party",)
-        self.tp_tree = ttk.Treeview(tp_list_frame, columns=columns, show="headings", height=5)
-        self.tp_tree.heading("transfer_party", text="Transfer Party Name")
-        self.tp_tree.column("transfer_party", width=150)
-        
-        # Add scrollbar
-        tp_scrollbar = ttk.Scrollbar(tp_list_frame, orient=tk.VERTICAL, command=self.tp_tree.yview)
-        self.tp_tree.configure(yscroll=tp_scrollbar.set)
-        
-        # Pack widgets
-        tp_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.tp_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        # One list + add + delete section per entry in _SITE_SECTIONS
+        for section in _SITE_SECTIONS:
+            self._build_list_section(main_frame, *section,
+                                     make_add_button=make_add_button,
+                                     make_delete_button=make_delete_button)
         
-        # Transfer Party controls
-        tp_controls = ttk.Frame(tp_frame)
-        tp_controls.pack(fill=tk.X, padx=5, pady=5)
+        # Save Settings button at the bottom
+        save_sites_frame = ttk.Frame(main_frame)
+        save_sites_frame.grid(row=2, column=0, columnspan=2, sticky="e", padx=5, pady=10)
         
-        # New Transfer Party entry
-        ttk.Label(tp_controls, text="New Transfer Party:").pack(side=tk.LEFT, padx=(0, 5))
-        ttk.Entry(tp_controls, textvariable=self.transfer_party_var, width=15).pack(side=tk.LEFT, padx=5)
+        save_sites_btn = HoverButton(save_sites_frame,
+                                text="Save Settings",
+                                bg=colors["secondary"],
+                                fg=btn_text,
+                                padx=8, pady=3,
+                                command=self.save_sites_settings)
+        save_sites_btn.pack(side=tk.RIGHT, padx=5)
         
-        # Add and Delete buttons
-        add_tp_btn = HoverButton(tp_controls,
-                            text="Add",
-                            bg=config.COLORS["primary"],
-                            fg=config.COLORS["button_text"],
-                            padx=5, pady=2,
-                            command=self.add_transfer_party)
-        add_tp_btn.pack(side=tk.LEFT, padx=2)
-        
-        delete_tp_btn = HoverButton(tp_controls,
-                                text="Delete",
-                                bg=config.COLORS["error"],
-                                fg=config.COLORS["button_text"],
-                                padx=5, pady=2,
-                                command=self.delete_transfer_party)
-        delete_tp_btn.pack(side=tk.LEFT, padx=2)
+        # Load sites, incharges, transfer parties and agencies
+        self.load_sites()
+    
+    def _build_list_section(self, main_frame, title, column, heading, entry_label,
+                            tree_attr, var_attr, add_method, delete_method, row, col,
+                            make_add_button, make_delete_button):
+        """Build one list + add + delete section of the site management tab
         
-        # ========== BOTTOM RIGHT: Agency Names Section ==========
-        agency_frame = ttk.LabelFrame(main_frame, text="Agency Names")
-        agency_frame.grid(row=1, column=1, sticky="nsew", padx=5, pady=5)
+        Args:
+            main_frame: Frame holding the 2x2 grid of sections
+            title: Section title
+            column: Treeview column id
+            heading: Treeview column heading
+            entry_label: Label in front of the new-name entry
+            tree_attr: Attribute name the Treeview is stored under
+            var_attr: Attribute name of the new-name StringVar
+            add_method: Name of the method bound to the Add button
+            delete_method: Name of the method bound to the Delete button
+            row, col: Grid cell of the section
+            make_add_button: HoverButton factory taking (parent, command=...)
+            make_delete_button: HoverButton factory taking (parent, command=...)
+        """
+        section_frame = ttk.LabelFrame(main_frame, text=title)
+        section_frame.grid(row=row, column=col, sticky="nsew", padx=5, pady=5)
         
-        # Agency list and entry
-        agency_list_frame = ttk.Frame(agency_frame)
-        agency_list_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        # List and entry
+        list_frame = ttk.Frame(section_frame)
+        list_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
-        # Agency listbox
-        columns = ("agency",)
-        self.agency_tree = ttk.Treeview(agency_list_frame, columns=columns, show="headings", height=5)
-        self.agency_tree.heading("agency", text="Agency Name")
-        self.agency_tree.column("agency", width=150)
+        # Listbox
+        tree = ttk.Treeview(list_frame, columns=(column,), show="headings", height=5)
+        tree.heading(column, text=heading)
+        tree.column(column, width=150)
+        self._configure_row_tags(tree)
+        setattr(self, tree_attr, tree)
         
         # Add scrollbar
-        agency_scrollbar = ttk.Scrollbar(agency_list_frame, orient=tk.VERTICAL, command=self.agency_tree.yview)
-        self.agency_tree.configure(yscroll=agency_scrollbar.set)
+        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=tree.yview)
+        tree.configure(yscroll=scrollbar.set)
         
         # Pack widgets
-        agency_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.agency_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
-        # Agency controls
-        agency_controls = ttk.Frame(agency_frame)
-        agency_controls.pack(fill=tk.X, padx=5, pady=5)
+        # Controls
+        controls = ttk.Frame(section_frame)
+        controls.pack(fill=tk.X, padx=5, pady=5)
         
-        # New Agency entry
-        ttk.Label(agency_controls, text="New Agency:").pack(side=tk.LEFT, padx=(0, 5))
-        ttk.Entry(agency_controls, textvariable=self.agency_name_var, width=15).pack(side=tk.LEFT, padx=5)
+        # New name entry
+        ttk.Label(controls, text=entry_label).pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Entry(controls, textvariable=getattr(self, var_attr), width=15).pack(side=tk.LEFT, padx=5)
         
         # Add and Delete buttons
-        add_agency_btn = HoverButton(agency_controls,
-                                text="Add",
-                                bg=config.COLORS["primary"],
-                                fg=config.COLORS["button_text"],
-                                padx=5, pady=2,
-                                command=self.add_agency)
-        add_agency_btn.pack(side=tk.LEFT, padx=2)
-        
-        delete_agency_btn = HoverButton(agency_controls,
-                                    text="Delete",
-                                    bg=config.COLORS["error"],
-                                    fg=config.COLORS["button_text"],
-                                    padx=5, pady=2,
-                                    command=self.delete_agency)
-        delete_agency_btn.pack(side=tk.LEFT, padx=2)
-        
-        # Save Settings button at the bottom
-        save_sites_frame = ttk.Frame(main_frame)
-        save_sites_frame.grid(row=2, column=0, columnspan=2, sticky="e", padx=5, pady=10)
-        
-        save_sites_btn = HoverButton(save_sites_frame,
-                                text="Save Settings",
-                                bg=config.COLORS["secondary"],
-                                fg=config.COLORS["button_text"],
-                                padx=8, pady=3,
-                                command=self.save_sites_settings)
-        save_sites_btn.pack(side=tk.RIGHT, padx=5)
-        
-        # Load sites, incharges, transfer parties and agencies
-        self.load_sites()
+        make_add_button(controls, command=getattr(self, add_method)).pack(side=tk.LEFT, padx=2)
+        make_delete_button(controls, command=getattr(self, delete_method)).pack(side=tk.LEFT, padx=2)
     
     def refresh_com_ports(self):
         """Refresh available COM ports"""
-        ports = self.weighbridge.get_available_ports()
+        # Rapid clicks on Refresh reuse the last scan instead of re-enumerating
+        timestamp, ports = self._port_scan_cache
+        if ports is None or time.monotonic() - timestamp >= _PORT_SCAN_TTL:
+            ports = self.weighbridge.get_available_ports()
+            self._port_scan_cache = (time.monotonic(), ports)
+        self._available_port_set = set(ports)
         self.com_port_combo['values'] = ports
         if ports:
             # Try to keep the current selected port
@@ -3442,16 +3778,13 @@ class SettingsPanel:
             return
             
         # Check if agency already exists
-        for item in self.agency_tree.get_children():
-            if self.agency_tree.item(item, 'values')[0] == agency_name:
-                messagebox.showerror("Error", "Agency name already exists")
-                return
+        if agency_name in self._agency_names:
+            messagebox.showerror("Error", "Agency name already exists")
+            return
                 
-        # Add to treeview
-        self.agency_tree.insert("", tk.END, values=(agency_name,))
-        
-        # Apply alternating row colors
-        self._apply_row_colors(self.agency_tree)
+        # Add to treeview with the next alternating row color
+        self._insert_striped_row(self.agency_tree, (agency_name,))
+        self._agency_names.add(agency_name)
         
         # Clear entry
         self.agency_name_var.set("")
@@ -3465,10 +3798,11 @@ class SettingsPanel:
             
         # Delete selected agency
         for item in selected_items:
+            self._agency_names.discard(str(self.agency_tree.item(item, 'values')[0]))
             self.agency_tree.delete(item)
             
-        # Apply alternating row colors
-        self._apply_row_colors(self.agency_tree)
+        # Re-apply alternating row colors once the deletes have settled
+        self._schedule_row_colors(self.agency_tree)
 
     def add_transfer_party(self):
         """Add a new transfer party"""
@@ -3478,16 +3812,13 @@ class SettingsPanel:
             return
             
         # Check if transfer party already exists
-        for item in self.tp_tree.get_children():
-            if self.tp_tree.item(item, 'values')[0] == tp_name:
-                messagebox.showerror("Error", "Transfer party name already exists")
-                return
+        if tp_name in self._tp_names:
+            messagebox.showerror("Error", "Transfer party name already exists")
+            return
                 
-        # Add to treeview
-        self.tp_tree.insert("", tk.END, values=(tp_name,))
-        
-        # Apply alternating row colors
-        self._apply_row_colors(self.tp_tree)
+        # Add to treeview with the next alternating row color
+        self._insert_striped_row(self.tp_tree, (tp_name,))
+        self._tp_names.add(tp_name)
         
         # Clear entry
         self.transfer_party_var.set("")
@@ -3501,10 +3832,11 @@ class SettingsPanel:
             
         # Delete selected transfer party
         for item in selected_items:
+            self._tp_names.discard(str(self.tp_tree.item(item, 'values')[0]))
             self.tp_tree.delete(item)
             
-        # Apply alternating row colors
-        self._apply_row_colors(self.tp_tree)
+        # Re-apply alternating row colors once the deletes have settled
+        self._schedule_row_colors(self.tp_tree)
 
     # Update to settings_panel.py to handle weighbridge connection errors better
 
@@ -3515,6 +3847,12 @@ class SettingsPanel:
             messagebox.showerror("Error", "Please select a COM port")
             return
         
+        # Port went away since the last refresh - don't wait on serial open
+        if com_port not in self._available_port_set:
+            messagebox.showerror("Error", f"{com_port} is no longer available.\n\n"
+                                 "Reconnect the device and click Refresh.")
+            return
+        
         try:
             # Get connection parameters
             baud_rate = self.baud_rate_var.get()
@@ -3524,22 +3862,22 @@ class SettingsPanel:
             
             # OPTIMIZATION: Ensure regex pattern is applied before connecting
             regex_pattern = self.regex_pattern_var.get().strip()
-            if regex_pattern and hasattr(self, 'weighbridge') and self.weighbridge:
+            if regex_pattern and self.weighbridge:
                 pattern_applied = self.weighbridge.update_regex_pattern(regex_pattern)
                 if pattern_applied:
-                    print(f"✅ Applied regex pattern before connection: {regex_pattern}")
+                    self.logger.info("✅ Applied regex pattern before connection: %s", regex_pattern)
             
             # Connect to weighbridge (settings_storage will be used for additional regex loading)
             if self.weighbridge.connect(com_port, baud_rate, data_bits, parity, stop_bits, self.settings_storage):
                 # Update UI
                 self.wb_status_var.set("Status: Connected")
-                self.weight_label.config(foreground="green")
+                self._set_weight_label_color("green")
                 self.connect_btn.config(state=tk.DISABLED)
                 self.disconnect_btn.config(state=tk.NORMAL)
                 
                 # OPTIMIZATION: Show current regex pattern in success message
                 current_pattern = self.weighbridge.get_current_regex_pattern()
-                print(f"✅ Connected with optimized regex processing: {current_pattern}")
+                self.logger.info("✅ Connected with optimized regex processing: %s", current_pattern)
                 messagebox.showinfo("Success", f"Weighbridge connected successfully!\n\nOptimizations active:\n• Cached regex pattern: {current_pattern}\n• Non-blocking serial processing\n• 5ms response time")
             else:
                 raise Exception("Failed to establish connection")
@@ -3585,7 +3923,7 @@ class SettingsPanel:
                     
             # Update the status text to show error
             self.wb_status_var.set(f"Status: Connection Failed")
-            self.weight_label.config(foreground="red")
+            self._set_weight_label_color("red")
 
 
     def test_regex_simple(self):
@@ -3598,35 +3936,28 @@ class SettingsPanel:
             
             # Test pattern compilation
             try:
-                import re
-                compiled_pattern = re.compile(pattern)
+                compiled_pattern = _compile_wb_pattern(pattern)
             except re.error as e:
                 messagebox.showerror("Invalid Pattern", f"Regex error: {str(e)}")
                 return
             
-            # Simple test samples - ADD YOUR WEIGHBRIDGE DATA FORMATS HERE
-            test_samples = [
-                "1234.5",           # Simple number
-                "Weight: 1500 kg",  # With label
-                ":2500",            # Colon format
-                "3000.75",          # Decimal
-                "No numbers here"   # Invalid
-            ]
+            # Simple test samples - add weighbridge data formats to _SIMPLE_TEST_SAMPLES
+            test_samples = _SIMPLE_TEST_SAMPLES
             
-            results = []
-            success_count = 0
+            def _probe(sample, match):
+                """Result line for one sample and whether a weight was extracted"""
+                if not match:
+                    return f"❌ '{sample}' → No match", False
+                try:
+                    return f"✅ '{sample}' → {float(match.group(1))}", True
+                except Exception:
+                    return f"⚠️ '{sample}' → Found but invalid", False
             
-            for sample in test_samples:
-                match = compiled_pattern.search(sample)
-                if match:
-                    try:
-                        weight = float(match.group(1))
-                        results.append(f"✅ '{sample}' → {weight}")
-                        success_count += 1
-                    except:
-                        results.append(f"⚠️ '{sample}' → Found but invalid")
-                else:
-                    results.append(f"❌ '{sample}' → No match")
+            # map() drives the searches from C; samples stay separate so anchors still apply per line
+            tagged = [_probe(sample, match) for sample, match
+                      in zip(test_samples, map(compiled_pattern.search, test_samples))]
+            results = [line for line, _ in tagged]
+            success_count = sum(ok for _, ok in tagged)
             
             result_text = f"Pattern: {pattern}\n\nResults:\n" + "\n".join(results)
             result_text += f"\n\nSuccess: {success_count}/{len(test_samples)} samples"
@@ -3694,28 +4025,17 @@ class SettingsPanel:
             
             # Test pattern compilation
             try:
-                import re
-                compiled_pattern = re.compile(pattern)
+                compiled_pattern = _compile_wb_pattern(pattern)
             except re.error as e:
                 messagebox.showerror("Invalid Pattern", f"Regex compilation error:\n{str(e)}")
                 return
             
             # Sample data for testing
-            sample_data = [
-                "Weight: 1234.5 kg",
-                "1500",
-                "2345.67",
-                ":1800",
-                "Net Weight = 2500.0",
-                "Gross: 3000",
-                "1234Wt:",
-                "Invalid data xyz"
-            ]
+            sample_data = _FULL_TEST_SAMPLES
             
             # Test pattern with sample data
             results = []
-            for data in sample_data:
-                match = compiled_pattern.search(data)
+            for data, match in zip(sample_data, map(compiled_pattern.search, sample_data)):
                 if match:
                     try:
                         weight = float(match.group(1))
@@ -3748,37 +4068,103 @@ class SettingsPanel:
         if self.weighbridge.disconnect():
             # Update UI
             self.wb_status_var.set("Status: Disconnected")
-            self.weight_label.config(foreground="red")
+            self._set_weight_label_color("red")
             self.connect_btn.config(state=tk.NORMAL)
             self.disconnect_btn.config(state=tk.DISABLED)
             self.current_weight_var.set("0 kg")
+            self._last_weight_text = None
 
     
-    def load_users(self):
-        """Load users into the tree view"""
-        # Clear existing items
-        for item in self.users_tree.get_children():
-            self.users_tree.delete(item)
-            
+    def _get_users_cached(self):
+        """Get the users dict, re-reading users.json only when it has changed
+        
+        Returns:
+            dict: User data keyed by username - a copy callers may modify
+        """
         try:
-            # Get users from storage
-            users = self.settings_storage.get_users()
-            
-            # Add to treeview
-            for username, user_data in users.items():
-                role = user_data.get('role', 'user')
-                name = user_data.get('name', '')
-                
-                self.users_tree.insert("", tk.END, values=(
-                    username,
-                    name,
-                    role
-                ))
-                
-            # Apply alternating row colors
-            self._apply_row_colors(self.users_tree)
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load users: {str(e)}")
+            stat = os.stat(self.settings_storage.users_file)
+        except OSError:
+            return self.settings_storage.get_users()
+        
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if self._users_cache[0] != signature:
+            self._users_cache = (signature, self.settings_storage.get_users())
+        return dict(self._users_cache[1])
+
+    def _load_in_background(self, load, on_loaded, error_text):
+        """Run load() in a daemon thread and pass its result to on_loaded on the Tk thread
+        
+        Workers never call into Tk: results go through _load_results, which
+        the Tk thread polls with after(). This also works before mainloop
+        has started - the poll simply runs once it does.
+        
+        Args:
+            load: Callable run in the worker thread
+            on_loaded: Callable taking load()'s result, run on the Tk thread
+            error_text: Message prefix shown if load() raises
+        """
+        def _worker():
+            try:
+                self._load_results.put((on_loaded, (load(),)))
+            except Exception as e:
+                self._load_results.put((messagebox.showerror, ("Error", f"{error_text}: {str(e)}")))
+        
+        self._pending_loads += 1
+        threading.Thread(target=_worker, daemon=True).start()
+        if self._load_poll_id is None:
+            self._load_poll_id = self.parent.after(_LOAD_POLL_MS, self._poll_load_results)
+
+    def _poll_load_results(self):
+        """Apply finished background loads - runs on the Tk thread"""
+        self._load_poll_id = None
+        while True:
+            try:
+                callback, args = self._load_results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending_loads -= 1
+            try:
+                callback(*args)
+            except Exception as e:
+                self.logger.error("Error applying background load: %s", e)
+        
+        if self._pending_loads > 0:
+            self._load_poll_id = self.parent.after(_LOAD_POLL_MS, self._poll_load_results)
+
+    def load_users(self):
+        """Load users into the tree view - users.json is read in a background thread"""
+        def _read_rows():
+            users = self._get_users_cached()
+            return [(username, user_data.get('name', ''), user_data.get('role', 'user'))
+                    for username, user_data in users.items()]
+        
+        self._load_in_background(_read_rows, self._populate_users_tree, "Failed to load users")
+
+    def _populate_users_tree(self, rows):
+        """Sync the users treeview with the stored users - runs on the Tk thread
+        
+        Rows are keyed by username (their item id): users no longer stored
+        are removed, existing rows are updated in place and new users are
+        inserted at their stored position. Each row gets its stripe tag in the
+        same item()/insert() call, so no separate re-striping pass is needed.
+        
+        Args:
+            rows: (username, name, role) tuples
+        """
+        tree = self.users_tree
+        stored = {values[0] for values in rows}
+        listed = set(tree.get_children())
+        stale = listed - stored
+        with self._detached_yscroll(tree):
+            if stale:
+                tree.delete(*stale)
+            for index, values in enumerate(rows):
+                tag = ("oddrow" if index & 1 else "evenrow",)
+                username = values[0]
+                if username in listed:
+                    tree.item(username, values=values, tags=tag)
+                else:
+                    tree.insert("", index, iid=username, values=values, tags=tag)
     
     def on_user_select(self, event):
         """Handle user selection in the treeview"""
@@ -3792,10 +4178,10 @@ class SettingsPanel:
         
         try:
             # Get user details
-            users = self.settings_storage.get_users()
+            users = self._get_users_cached()
             
-            if username in users:
-                user_data = users[username]
+            user_data = users.get(username)
+            if user_data is not None:
                 
                 # Set form fields
                 self.username_var.set(username)
@@ -3870,10 +4256,11 @@ class SettingsPanel:
         
         try:
             # Get existing users
-            users = self.settings_storage.get_users()
+            users = self._get_users_cached()
+            existing = users.get(username)
             
             # Check if username exists (for new user)
-            if not self.edit_mode and username in users:
+            if not self.edit_mode and existing is not None:
                 messagebox.showerror("Error", "Username already exists")
                 return
                 
@@ -3886,15 +4273,16 @@ class SettingsPanel:
             # Set password if provided
             if password:
                 user_data["password"] = self.settings_storage.hash_password(password)
-            elif self.edit_mode and username in users:
+            elif self.edit_mode and existing is not None:
                 # Keep existing password
-                user_data["password"] = users[username]["password"]
+                user_data["password"] = existing["password"]
             
             # Save user
             users[username] = user_data
             
             # Save to storage
             if self.settings_storage.save_users(users):
+                self._users_cache = (None, None)  # users.json was just rewritten
                 # Refresh user list
                 self.load_users()
                 
@@ -3934,13 +4322,14 @@ class SettingsPanel:
         # Prevent deleting the last admin user
         try:
             # Get users
-            users = self.settings_storage.get_users()
+            users = self._get_users_cached()
             
             # Count admin users
-            admin_count = sum(1 for u, data in users.items() if data.get('role', '') == 'admin')
+            admin_count = sum(1 for data in users.values() if data.get('role', '') == 'admin')
+            target_role = users.get(username, {}).get('role', '')
             
             # Check if attempting to delete the last admin
-            if users.get(username, {}).get('role', '') == 'admin' and admin_count <= 1:
+            if target_role == 'admin' and admin_count <= 1:
                 messagebox.showerror("Error", "Cannot delete the last admin user")
                 return
                 
@@ -3955,6 +4344,7 @@ class SettingsPanel:
                 
                 # Save to storage
                 if self.settings_storage.save_users(users):
+                    self._users_cache = (None, None)  # users.json was just rewritten
                     # Refresh user list
                     self.load_users()
                     
@@ -3998,16 +4388,13 @@ class SettingsPanel:
             return
             
         # Check if site already exists
-        for item in self.site_tree.get_children():
-            if self.site_tree.item(item, 'values')[0] == site_name:
-                messagebox.showerror("Error", "Site name already exists")
-                return
+        if site_name in self._site_names:
+            messagebox.showerror("Error", "Site name already exists")
+            return
                 
-        # Add to treeview
-        self.site_tree.insert("", tk.END, values=(site_name,))
-        
-        # Apply alternating row colors
-        self._apply_row_colors(self.site_tree)
+        # Add to treeview with the next alternating row color
+        self._insert_striped_row(self.site_tree, (site_name,))
+        self._site_names.add(site_name)
         
         # Clear entry
         self.site_name_var.set("")
@@ -4026,10 +4413,11 @@ class SettingsPanel:
             
         # Delete selected site
         for item in selected_items:
+            self._site_names.discard(str(self.site_tree.item(item, 'values')[0]))
             self.site_tree.delete(item)
             
-        # Apply alternating row colors
-        self._apply_row_colors(self.site_tree)
+        # Re-apply alternating row colors once the deletes have settled
+        self._schedule_row_colors(self.site_tree)
     
     def add_incharge(self):
         """Add a new incharge"""
@@ -4039,16 +4427,13 @@ class SettingsPanel:
             return
             
         # Check if incharge already exists
-        for item in self.incharge_tree.get_children():
-            if self.incharge_tree.item(item, 'values')[0] == incharge_name:
-                messagebox.showerror("Error", "Incharge name already exists")
-                return
+        if incharge_name in self._incharge_names:
+            messagebox.showerror("Error", "Incharge name already exists")
+            return
                 
-        # Add to treeview
-        self.incharge_tree.insert("", tk.END, values=(incharge_name,))
-        
-        # Apply alternating row colors
-        self._apply_row_colors(self.incharge_tree)
+        # Add to treeview with the next alternating row color
+        self._insert_striped_row(self.incharge_tree, (incharge_name,))
+        self._incharge_names.add(incharge_name)
         
         # Clear entry
         self.incharge_name_var.set("")
@@ -4062,56 +4447,50 @@ class SettingsPanel:
             
         # Delete selected incharge
         for item in selected_items:
+            self._incharge_names.discard(str(self.incharge_tree.item(item, 'values')[0]))
             self.incharge_tree.delete(item)
             
-        # Apply alternating row colors
-        self._apply_row_colors(self.incharge_tree)
+        # Re-apply alternating row colors once the deletes have settled
+        self._schedule_row_colors(self.incharge_tree)
     
     def load_sites(self):
-        """Load sites, incharges, transfer parties and agencies into treeviews"""
-        # Clear existing items
-        for item in self.site_tree.get_children():
-            self.site_tree.delete(item)
-            
-        for item in self.incharge_tree.get_children():
-            self.incharge_tree.delete(item)
-            
-        for item in self.tp_tree.get_children():
-            self.tp_tree.delete(item)
-            
-        for item in self.agency_tree.get_children():
-            self.agency_tree.delete(item)
-            
+        """Load sites, incharges, transfer parties and agencies into treeviews
+        
+        The sites file is read in a background thread; the treeviews are
+        filled back on the Tk thread.
+        """
+        self._load_in_background(self.settings_storage.get_sites, self._populate_site_trees,
+                                 "Failed to load sites")
+
+    def _populate_site_trees(self, sites_data):
+        """Merge stored names into the four site management treeviews - runs on the Tk thread
+        
+        Names already listed (including ones added since the load started)
+        are kept; stored names not yet listed are appended.
+        
+        Args:
+            sites_data (dict): Sites file contents from settings_storage.get_sites()
+        """
         try:
-            # Get sites data
-            sites_data = self.settings_storage.get_sites()
-            
-            # Add sites to treeview
-            for site in sites_data.get('sites', []):
-                self.site_tree.insert("", tk.END, values=(site,))
-                
-            # Add incharges to treeview
-            for incharge in sites_data.get('incharges', []):
-                self.incharge_tree.insert("", tk.END, values=(incharge,))
-                
-            # Add transfer parties to treeview
-            for tp in sites_data.get('transfer_parties', ['Advitia Labs']):
-                self.tp_tree.insert("", tk.END, values=(tp,))
-                
-            # Add agencies to treeview
-            for agency in sites_data.get('agencies', []):
-                self.agency_tree.insert("", tk.END, values=(agency,))
-                
-            # Apply alternating row colors
-            self._apply_row_colors(self.site_tree)
-            self._apply_row_colors(self.incharge_tree)
-            self._apply_row_colors(self.tp_tree)
-            self._apply_row_colors(self.agency_tree)
+            for tree, names, stored in (
+                    (self.site_tree, self._site_names, sites_data.get('sites', [])),
+                    (self.incharge_tree, self._incharge_names, sites_data.get('incharges', [])),
+                    (self.tp_tree, self._tp_names, sites_data.get('transfer_parties', ['Advitia Labs'])),
+                    (self.agency_tree, self._agency_names, sites_data.get('agencies', []))):
+                new_names = [name for name in dict.fromkeys(stored) if name not in names]
+                self._append_tree_rows(tree, [(name,) for name in new_names])
+                names.update(new_names)
+            self._sites_loaded = True
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load sites: {str(e)}")
 
     def save_sites_settings(self):
         """Save sites, incharges, transfer parties and agencies to storage"""
+        # Saving before the stored lists arrived would overwrite them with empty ones
+        if not self._sites_loaded:
+            messagebox.showerror("Error", "Sites are still loading - please try again")
+            return
+        
         try:
             # Get all sites
             sites = []
@@ -4149,14 +4528,66 @@ class SettingsPanel:
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save sites settings: {str(e)}")
 
+    @contextlib.contextmanager
+    def _detached_yscroll(self, tree):
+        """Detach a treeview's scrollbar updates while many rows change"""
+        yscroll = tree.cget("yscrollcommand")
+        tree.configure(yscrollcommand="")
+        try:
+            yield
+        finally:
+            tree.configure(yscrollcommand=yscroll)
+
+    def _append_tree_rows(self, tree, rows):
+        """Append rows to a treeview, each tagged with its stripe as it is inserted
+        
+        Args:
+            tree: Treeview to append to
+            rows: Sequence of row value tuples
+        """
+        if not rows:
+            return
+        with self._detached_yscroll(tree):
+            start = len(tree.get_children())
+            for index, values in enumerate(rows, start):
+                tree.insert("", tk.END, values=values,
+                            tags=("oddrow" if index & 1 else "evenrow",))
+
+    def _insert_striped_row(self, tree, values):
+        """Append a row tagged with the next alternating row color
+        
+        Args:
+            tree: Treeview to append to
+            values: Row values
+        """
+        tag = "oddrow" if len(tree.get_children()) & 1 else "evenrow"
+        tree.insert("", tk.END, values=values, tags=(tag,))
+
+    def _schedule_row_colors(self, tree):
+        """Re-stripe a treeview once per idle cycle after rows were removed"""
+        key = str(tree)
+        if key in self._row_color_pending:
+            return
+        
+        def restripe():
+            self._row_color_pending.pop(key, None)
+            self._apply_row_colors(tree)
+        
+        self._row_color_pending[key] = tree.after_idle(restripe)
+
     def _apply_row_colors(self, tree):
         """Apply alternating row colors to treeview"""
-        for i, item in enumerate(tree.get_children()):
-            if i % 2 == 0:
-                tree.item(item, tags=("evenrow",))
-            else:
-                tree.item(item, tags=("oddrow",))
+        # One Tcl foreach per tag instead of a tree.item() round-trip per row
+        children = tree.get_children()
+        for rows, tag in ((children[0::2], "evenrow"), (children[1::2], "oddrow")):
+            tree.tk.call("foreach", "item", rows, f"{tree} item $item -tags {tag}")
+
+    def _configure_row_tags(self, tree):
+        """Set the colors of the alternating row tags on a treeview
         
+        Called once when the treeview is created; rows only switch tags
+        after that.
+        """
         tree.tag_configure("evenrow", background=config.COLORS["table_row_even"])
         tree.tag_configure("oddrow", background=config.COLORS["table_row_odd"])
     
\ No newline at end of file
@@ -1,6 +1,9 @@
 import os
 import json
 import hashlib
+import datetime
+import tempfile
+import shutil
 import config
 
 class SettingsStorage:
@@ -11,7 +14,36 @@ class SettingsStorage:
         self.settings_file = os.path.join(config.DATA_FOLDER, 'app_settings.json')
         self.users_file = os.path.join(config.DATA_FOLDER, 'users.json')
         self.sites_file = os.path.join(config.DATA_FOLDER, 'sites.json')
+        # Presence of this file means settings are locked by the administrator
+        self.lock_file = self.settings_file + '.locked'
         self.initialize_files()
+
+    def _write_json_file(self, file_path, data):
+        """Atomically write JSON data to file, skipping the write if unchanged
+        
+        Args:
+            file_path: Path of the JSON file to write
+            data: JSON-serializable data
+            
+        Returns:
+            bool: True if the file was written, False if it was already up to date
+        """
+        new_bytes = json.dumps(data, indent=4).encode('utf-8')
+        
+        # Skip the write entirely when the file already holds identical bytes
+        try:
+            with open(file_path, 'rb') as f:
+                if f.read() == new_bytes:
+                    return False
+        except OSError:
+            pass
+        
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        temp_path = file_path + ".tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(new_bytes)
+        os.replace(temp_path, file_path)
+        return True
         
     def initialize_files(self):
         """Initialize settings files if they don't exist"""
@@ -58,9 +90,7 @@ class SettingsStorage:
                     "last_reset_date": ""
                 }
             }
-            os.makedirs(os.path.dirname(self.settings_file), exist_ok=True)
-            with open(self.settings_file, 'w') as f:
-                json.dump(default_settings, f, indent=4)
+            self._write_json_file(self.settings_file, default_settings)
         else:
             # Update existing settings file to include HTTP and ticket settings if missing
             try:
@@ -127,10 +157,15 @@ class SettingsStorage:
                     }
                     updated = True
                 
+                # Migrate legacy "locked" key to the sidecar lock file
+                if "locked" in settings:
+                    if settings.pop("locked"):
+                        open(self.lock_file, 'wb').close()
+                    updated = True
+                
                 if updated:
                     settings["cameras"] = cameras
-                    with open(self.settings_file, 'w') as f:
-                        json.dump(settings, f, indent=4)
+                    self._write_json_file(self.settings_file, settings)
                         
             except Exception as e:
                 print(f"Error updating settings file: {e}")
@@ -144,9 +179,7 @@ class SettingsStorage:
                     "name": "Administrator"
                 }
             }
-            os.makedirs(os.path.dirname(self.users_file), exist_ok=True)
-            with open(self.users_file, 'w') as f:
-                json.dump(default_users, f, indent=4)
+            self._write_json_file(self.users_file, default_users)
         
         # Create sites file with default site, incharge, and transfer party
         if not os.path.exists(self.sites_file):
@@ -156,9 +189,7 @@ class SettingsStorage:
                 "transfer_parties": ["Advitia Labs"],
                 "agencies": ["Default Agency"]  # Added default agency
             }
-            os.makedirs(os.path.dirname(self.sites_file), exist_ok=True)
-            with open(self.sites_file, 'w') as f:
-                json.dump(default_sites, f, indent=4)
+            self._write_json_file(self.sites_file, default_sites)
         else:
             # Update existing sites file to include agencies if missing
             try:
@@ -171,11 +202,38 @@ class SettingsStorage:
                 if 'agencies' not in sites_data:
                     sites_data['agencies'] = ["Default Agency"]
                     
-                with open(self.sites_file, 'w') as f:
-                    json.dump(sites_data, f, indent=4)
+                self._write_json_file(self.sites_file, sites_data)
             except Exception as e:
                 print(f"Error updating sites file: {e}")
 
+    def are_settings_locked(self):
+        """Check if settings are locked
+        
+        Returns:
+            bool: True if locked, False otherwise
+        """
+        return os.path.exists(self.lock_file)
+    
+    def set_settings_locked(self, locked):
+        """Lock or unlock settings by creating or removing the lock file
+        
+        Args:
+            locked: True to lock settings, False to unlock
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            if locked:
+                os.makedirs(os.path.dirname(self.lock_file), exist_ok=True)
+                open(self.lock_file, 'wb').close()
+            elif os.path.exists(self.lock_file):
+                os.remove(self.lock_file)
+            return True
+        except Exception as e:
+            print(f"Error updating settings lock: {e}")
+            return False
+
     def get_ticket_counter(self):
         """Get the current ticket counter
         
@@ -221,8 +279,7 @@ class SettingsStorage:
             all_settings["ticket_settings"]["current_ticket_number"] = counter_value
             
             # Write back to file
-            with open(self.settings_file, 'w') as f:
-                json.dump(all_settings, f, indent=4)
+            self._write_json_file(self.settings_file, all_settings)
                 
             return True
             
@@ -275,8 +332,7 @@ class SettingsStorage:
             all_settings["ticket_settings"] = ticket_settings
             
             # Write back to file
-            with open(self.settings_file, 'w') as f:
-                json.dump(all_settings, f, indent=4)
+            self._write_json_file(self.settings_file, all_settings)
                 
             print(f"Ticket settings saved: {ticket_settings}")
             return True
@@ -295,8 +351,6 @@ class SettingsStorage:
             bool: True if successful, False otherwise
         """
         try:
-            import datetime
-            
             ticket_settings = self.get_ticket_settings()
             ticket_settings["current_ticket_number"] = start_number
             ticket_settings["last_reset_date"] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -327,8 +381,7 @@ class SettingsStorage:
             
             all_settings["video_recording"] = settings
             
-            with open(self.settings_file, 'w') as f:
-                json.dump(all_settings, f, indent=4)
+            self._write_json_file(self.settings_file, all_settings)
             return True
         except:
             return False
@@ -392,12 +445,8 @@ class SettingsStorage:
             # Update weighbridge section
             all_settings["weighbridge"] = settings
             
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(self.settings_file), exist_ok=True)
-            
-            # Write back to file
-            with open(self.settings_file, 'w') as f:
-                json.dump(all_settings, f, indent=4)
+            # Write back to file (directory is created if needed)
+            self._write_json_file(self.settings_file, all_settings)
                 
             print("Weighbridge settings saved successfully")
             return True
@@ -471,12 +520,8 @@ class SettingsStorage:
             # Update cameras section
             all_settings["cameras"] = settings
             
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(self.settings_file), exist_ok=True)
-            
-            # Write back to file
-            with open(self.settings_file, 'w') as f:
-                json.dump(all_settings, f, indent=4)
+            # Write back to file (directory is created if needed)
+            self._write_json_file(self.settings_file, all_settings)
                 
             print("Camera settings saved successfully")
             return True
@@ -600,8 +645,7 @@ class SettingsStorage:
             bool: True if successful, False otherwise
         """
         try:
-            with open(self.users_file, 'w') as f:
-                json.dump(users, f, indent=4)
+            self._write_json_file(self.users_file, users)
             return True
         except Exception as e:
             print(f"Error saving users: {e}")
@@ -616,10 +660,6 @@ class SettingsStorage:
         Returns:
             bool: True if successful, False otherwise
         """
-        import tempfile
-        import shutil
-        import os
-        
         try:
             # Validate input data
             if not isinstance(sites_data, dict):
@@ -663,7 +703,7 @@ class SettingsStorage:
                 
                 # Write to temporary file
                 with os.fdopen(temp_fd, 'w') as f:
-                    json.dump(sites_data, f, indent=4)
+                    f.write(json.dumps(sites_data, indent=4))
                     f.flush()  # Ensure data is written to disk
                     os.fsync(f.fileno())  # Force write to disk
                 
@@ -672,14 +712,8 @@ class SettingsStorage:
                     verified_data = json.load(f)
                     
                 # If verification passes, atomically replace the original file
-                if os.name == 'nt':  # Windows
-                    # On Windows, remove target first
-                    if os.path.exists(self.sites_file):
-                        os.remove(self.sites_file)
-                    shutil.move(temp_file, self.sites_file)
-                else:  # Unix/Linux
-                    # On Unix, rename is atomic
-                    os.rename(temp_file, self.sites_file)
+                # (os.replace overwrites the target atomically on Windows and Unix)
+                os.replace(temp_file, self.sites_file)
                 
                 temp_file = None  # Successfully moved, don't clean up
                 
@@ -723,9 +757,7 @@ class SettingsStorage:
                         "agencies": ["Default Agency"]
                     }
                     
-                    os.makedirs(os.path.dirname(self.sites_file), exist_ok=True)
-                    with open(self.sites_file, 'w') as f:
-                        json.dump(default_sites, f, indent=4)
+                    self._write_json_file(self.sites_file, default_sites)
                         
                     print("Created default sites file as fallback")
                     return True
@@ -964,8 +996,6 @@ class SettingsStorage:
             bool: True if successful, False otherwise
         """
         try:
-            import datetime
-            
             if not backup_filename:
                 timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
                 backup_filename = f"settings_backup_{timestamp}.json"
@@ -983,7 +1013,7 @@ class SettingsStorage:
             
             # Save backup
             with open(backup_path, 'w') as f:
-                json.dump(all_settings, f, indent=4)
+                f.write(json.dumps(all_settings, indent=4))
                 
             print(f"Settings backup created: {backup_path}")
             return True
@@ -1043,7 +1073,7 @@ class SettingsStorage:
         """
         try:
             # Remove existing settings files
-            files_to_remove = [self.settings_file, self.users_file, self.sites_file]
+            files_to_remove = [self.settings_file, self.lock_file, self.users_file, self.sites_file]
             
             for file_path in files_to_remove:
                 if os.path.exists(file_path):
@@ -1070,8 +1100,6 @@ class SettingsStorage:
             bool: True if successful, False otherwise
         """
         try:
-            import datetime
-            
             # Collect all settings
             export_data = {
                 "weighbridge": self.get_weighbridge_settings(),
@@ -1087,7 +1115,7 @@ class SettingsStorage:
             
             # Save export
             with open(export_path, 'w') as f:
-                json.dump(export_data, f, indent=4)
+                f.write(json.dumps(export_data, indent=4))
                 
             print(f"Settings exported to: {export_path}")
             return True
@@ -0,0 +1,187 @@
+"""
+Tests for the local backup tracking file used by CloudStorageService.
+"""
+
+import builtins
+import json
+import logging
+import os
+import threading
+
+import pytest
+
+pytest.importorskip("google.cloud.storage")
+
+from cloud_storage import CloudStorageService
+
+
+class FakeBlob:
+    """Records uploads made through the bucket."""
+
+    def __init__(self, bucket, name):
+        self.bucket = bucket
+        self.name = name
+
+    def upload_from_string(self, data, content_type=None):
+        self.bucket.uploads.append(self.name)
+
+
+class FakeBucket:
+    """Minimal stand-in for a storage bucket."""
+
+    name = "test-bucket"
+
+    def __init__(self):
+        self.uploads = []
+
+    def blob(self, name):
+        return FakeBlob(self, name)
+
+
+@pytest.fixture
+def service(tmp_path):
+    """CloudStorageService wired to a fake bucket and a temp tracking file."""
+    svc = CloudStorageService.__new__(CloudStorageService)
+    svc._tracking_lock = threading.Lock()
+    svc.client = object()
+    svc.bucket = FakeBucket()
+    svc.backup_tracking_file = str(tmp_path / "backup_tracking.json")
+    return svc
+
+
+@pytest.fixture
+def manager(service):
+    """DataManager that uploads through the fake-bucket service."""
+    data_management = pytest.importorskip("data_management")
+    dm = data_management.DataManager.__new__(data_management.DataManager)
+    dm.cloud_storage = service
+    dm.logger = logging.getLogger("test_backup_tracking")
+    return dm
+
+
+RECORD = {"ticket_no": "T0001", "vehicle_no": "AP01AB1234", "gross_weight": "12000"}
+
+
+def read_tracking(service):
+    with open(service.backup_tracking_file) as f:
+        return json.load(f)
+
+
+def test_duplicate_record_is_skipped(service):
+    assert service.save_json_record(RECORD, "T0001.json", "Agency", "Site")
+    assert service.save_json_record(dict(RECORD), "T0001.json", "Agency", "Site")
+
+    assert len(service.bucket.uploads) == 1
+    key, content_hash = service.json_record_tracking(RECORD, "T0001.json", "Agency", "Site")
+    assert read_tracking(service)["json_backups_backed_up"][key]["content_hash"] == content_hash
+
+
+def test_changed_record_is_uploaded_again(service):
+    service.save_json_record(RECORD, "T0001.json", "Agency", "Site")
+    service.save_json_record(dict(RECORD, gross_weight="12500"), "T0001.json", "Agency", "Site")
+
+    assert len(service.bucket.uploads) == 2
+
+
+def test_reset_forces_reupload(service):
+    service.save_json_record(RECORD, "T0001.json", "Agency", "Site")
+
+    assert service.reset_backup_tracking(confirm=True)
+    assert read_tracking(service)["json_backups_backed_up"] == {}
+
+    service.save_json_record(RECORD, "T0001.json", "Agency", "Site")
+    assert len(service.bucket.uploads) == 2
+
+
+def test_reset_requires_confirm(service):
+    service.save_json_record(RECORD, "T0001.json", "Agency", "Site")
+
+    assert not service.reset_backup_tracking()
+    assert read_tracking(service)["json_backups_backed_up"]
+
+
+def test_batched_tracking_is_not_written(service):
+    tracking = service.get_backup_tracking_data()
+
+    assert service.save_json_record(RECORD, "T0001.json", "Agency", "Site", tracking_data=tracking)
+    assert not os.path.exists(service.backup_tracking_file)
+
+    # The shared dict still catches duplicates within the run
+    assert service.save_json_record(RECORD, "T0001.json", "Agency", "Site", tracking_data=tracking)
+    assert len(service.bucket.uploads) == 1
+    assert len(tracking["json_backups_backed_up"]) == 1
+
+
+def test_merge_keeps_other_categories(service):
+    service.save_backup_tracking_data({
+        "images_backed_up": {"a.jpg": {"hash": "1"}},
+        "json_backups_backed_up": {"old": {"content_hash": "x"}},
+        "last_backup_date": "2025-01-01T00:00:00",
+    })
+
+    service.save_backup_tracking_data({
+        "json_backups_backed_up": {"new": {"content_hash": "y"}},
+        "last_backup_date": "2025-01-02T00:00:00",
+    }, merge=True)
+
+    tracking = read_tracking(service)
+    assert tracking["images_backed_up"] == {"a.jpg": {"hash": "1"}}
+    assert set(tracking["json_backups_backed_up"]) == {"old", "new"}
+    assert tracking["last_backup_date"] == "2025-01-02T00:00:00"
+
+
+def test_save_without_merge_replaces_file(service):
+    service.save_backup_tracking_data({"images_backed_up": {"a.jpg": {"hash": "1"}}})
+    service.save_backup_tracking_data({"json_backups_backed_up": {}})
+
+    assert "images_backed_up" not in read_tracking(service)
+
+
+def test_save_leaves_no_temp_file(service):
+    service.save_backup_tracking_data(service.get_backup_tracking_data())
+
+    assert os.path.exists(service.backup_tracking_file)
+    assert not os.path.exists(service.backup_tracking_file + ".tmp")
+
+
+def test_unchanged_backup_is_not_opened(manager, service, tmp_path, monkeypatch):
+    import data_management
+
+    json_path = tmp_path / "T0001.json"
+    json_path.write_text(json.dumps(RECORD), encoding="utf-8")
+
+    first = manager.upload_json_stream([str(json_path)])
+    assert first["uploaded"] == 1
+
+    opened = []
+
+    def spy_open(file, *args, **kwargs):
+        opened.append(os.fspath(file))
+        return builtins.open(file, *args, **kwargs)
+
+    monkeypatch.setattr(data_management, "open", spy_open, raising=False)
+    second = manager.upload_json_stream([str(json_path)])
+
+    assert second["skipped"] == 1
+    assert second["uploaded"] == 0
+    assert str(json_path) not in opened
+    assert len(service.bucket.uploads) == 1
+
+    # Touching the file makes it a candidate again; the content hash still dedups it
+    os.utime(json_path, ns=(0, 0))
+    third = manager.upload_json_stream([str(json_path)])
+    assert str(json_path) in opened
+    assert third["skipped"] == 0
+    assert len(service.bucket.uploads) == 1
+
+
+def test_reset_clears_local_file_tracking(manager, service, tmp_path):
+    json_path = tmp_path / "T0001.json"
+    json_path.write_text(json.dumps(RECORD), encoding="utf-8")
+    manager.upload_json_stream([str(json_path)])
+
+    service.reset_backup_tracking(confirm=True)
+    result = manager.upload_json_stream([str(json_path)])
+
+    assert result["uploaded"] == 1
+    assert len(service.bucket.uploads) == 2
@@ -16,8 +16,62 @@ try:
 except ImportError:
     LOGGING_AVAILABLE = False
 
+# Optional linear-time regex engine for weight patterns - falls back to re
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
 import config
 
+
+def _compile_engine_pattern(pattern_string):
+    """Compile with re2 when installed, falling back to re for syntax it rejects"""
+    if RE2_AVAILABLE:
+        try:
+            return re2.compile(pattern_string)
+        except re2.error:
+            pass
+    return re.compile(pattern_string)
+
+
+# Patterns recommended in the settings help dialog, compiled once at import
+_COMMON_PATTERNS = {
+    pattern_string: _compile_engine_pattern(pattern_string)
+    for pattern_string in (
+        r'(\d+\.?\d*)',
+        r'(\d+)',
+        r'(\d+\.?\d*)\s*kg',
+        r':(\d+)',
+        r'Weight:\s*(\d+\.?\d*)',
+        r'(\d{2,5})[^0-9]+.*?Wt:\s*$',
+    )
+}
+
+
+def compile_weight_pattern(pattern_string):
+    """Compile a weight regex, preferring re2 when it is installed
+    
+    re2 matches in linear time, so a pathological serial line cannot stall
+    the reader. Syntax re2 rejects (lookarounds, backreferences) is compiled
+    with re instead. The common patterns from the help dialog are returned
+    precompiled.
+    
+    Args:
+        pattern_string: Regex pattern string
+        
+    Returns:
+        Compiled pattern object with search() and group() support
+        
+    Raises:
+        re.error: If the pattern is invalid
+    """
+    pattern = _COMMON_PATTERNS.get(pattern_string)
+    if pattern is None:
+        pattern = _compile_engine_pattern(pattern_string)
+    return pattern
+
 class WeighbridgeManager:
     """Optimized weighbridge manager with regex processing moved out of main serial loop"""
     
@@ -51,7 +105,7 @@ class WeighbridgeManager:
         self.reconnect_delay = 1.0
         
         # OPTIMIZED: Initialize regex pattern variables - will be loaded from settings
-        self.weight_pattern = re.compile(r'(\d+\.?\d*)')  # Start with default
+        self.weight_pattern = compile_weight_pattern(r'(\d+\.?\d*)')  # Start with default
         self.regex_pattern_string = r'(\d+\.?\d*)'
         self.custom_regex_pattern = None
         self.use_custom_pattern = False
@@ -75,7 +129,7 @@ class WeighbridgeManager:
                     self._current_pattern_key = pattern_string
                 else:
                     # Compile new pattern and cache it
-                    self.weight_pattern = re.compile(self.regex_pattern_string)
+                    self.weight_pattern = compile_weight_pattern(self.regex_pattern_string)
                     self._pattern_cache[pattern_string] = self.weight_pattern
                     self._current_pattern_key = pattern_string
                     
@@ -92,7 +146,7 @@ class WeighbridgeManager:
                 # Use default pattern
                 self.regex_pattern_string = r'(\d+\.?\d*)'
                 if self.regex_pattern_string not in self._pattern_cache:
-                    self._pattern_cache[self.regex_pattern_string] = re.compile(self.regex_pattern_string)
+                    self._pattern_cache[self.regex_pattern_string] = compile_weight_pattern(self.regex_pattern_string)
                 self.weight_pattern = self._pattern_cache[self.regex_pattern_string]
                 self._current_pattern_key = self.regex_pattern_string
                 self.use_custom_pattern = False
@@ -103,7 +157,7 @@ class WeighbridgeManager:
             # Fallback to default pattern on error
             self.regex_pattern_string = r'(\d+\.?\d*)'
             if self.regex_pattern_string not in self._pattern_cache:
-                self._pattern_cache[self.regex_pattern_string] = re.compile(self.regex_pattern_string)
+                self._pattern_cache[self.regex_pattern_string] = compile_weight_pattern(self.regex_pattern_string)
             self.weight_pattern = self._pattern_cache[self.regex_pattern_string]
             self._current_pattern_key = self.regex_pattern_string
             self.use_custom_pattern = False